@@ -0,0 +1,61 @@
+"""Benchmark the vectorized volume parser against the per-cell _parse_volume_value apply.
+
+Run from the repo root:
+    PYTHONPATH=src python benchmarks/bench_volume_parser.py
+    PYTHONPATH=src python benchmarks/bench_volume_parser.py --sizes 10000 100000 1000000 10000000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from scrape_data.clean_data import _parse_volume_column, _parse_volume_value
+
+
+def synthetic_volumes(n: int, seed: int = 0) -> pd.Series:
+    """Mix of suffixed, comma-grouped, plain and missing cells, shaped like scraped Volume columns."""
+    rng = np.random.default_rng(seed)
+    numbers = rng.uniform(0, 999, n).round(3).astype(str)
+    suffixes = rng.choice(np.array(["", "K", "M", "B"]), n)
+    cells = np.char.add(numbers, suffixes).astype(object)
+    cells[rng.random(n) < 0.05] = "--"
+    cells[rng.random(n) < 0.05] = None
+    commas = rng.random(n) < 0.1
+    cells[commas] = [f"{v:,}" for v in rng.integers(1_000, 10_000_000, int(commas.sum()))]
+    return pd.Series(cells, dtype=object)
+
+
+def _per_cell(series: pd.Series) -> pd.Series:
+    """The previous implementation: one Python call per cell through Series.apply."""
+    return pd.Series(series.astype(str).apply(_parse_volume_value), dtype="Int64")
+
+
+def _best_of(fn, series: pd.Series, repeat: int) -> tuple[float, pd.Series]:
+    best = float("inf")
+    out = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn(series)
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def main(sizes: list[int], repeat: int) -> None:
+    print(f"{'cells':>12} {'per-cell (s)':>14} {'vectorized (s)':>15} {'speedup':>9}")
+    for n in sizes:
+        series = synthetic_volumes(n)
+        t_old, old = _best_of(_per_cell, series, repeat)
+        t_new, new = _best_of(_parse_volume_column, series, repeat)
+        assert old.equals(new), "vectorized parser disagrees with _parse_volume_value"
+        print(f"{n:>12,} {t_old:>14.4f} {t_new:>15.4f} {t_old / t_new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark volume column parsing.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.sizes, args.repeat)
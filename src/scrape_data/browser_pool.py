@@ -0,0 +1,179 @@
+"""Long-lived Playwright Chromium browser that hands out pages from a small pool of recycled contexts."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import pathlib
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Optional
+from collections.abc import AsyncIterator
+
+from playwright.async_api import async_playwright
+
+from scrape_data.config import settings
+from scrape_data.utils.resource_blocker import ResourceBlocker
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PooledContext:
+    """A browser context plus the number of pages it has served so far."""
+    context: Any
+    uses: int = 0
+
+
+class BrowserPool:
+    """
+    Async context manager owning one Chromium instance for many dynamic scrapes.
+
+    - Chromium is launched once on `__aenter__` and closed on `__aexit__`.
+    - `page()` yields a fresh page from an idle context (or a new one, up to `max_contexts`).
+    - A context is closed and replaced after `max_uses_per_context` pages, or as soon as
+      a page using it raises, so a broken context is never handed out again.
+    - Every context gets `blocker` installed (a default ResourceBlocker when
+      settings.BLOCK_RESOURCES is on); pass `block_resources=False` to load pages unfiltered.
+    - When `storage_state_path` exists, new contexts start from that saved storage state
+      (consent cookies/localStorage); `save_storage_state()` writes it after a consent click.
+    """
+
+    def __init__(
+        self,
+        *,
+        headless: bool = True,
+        slow_mo_ms: int = 0,
+        max_contexts: int = settings.BROWSER_POOL_SIZE,
+        max_uses_per_context: int = settings.BROWSER_CONTEXT_MAX_USES,
+        block_resources: bool = settings.BLOCK_RESOURCES,
+        blocker: Optional[ResourceBlocker] = None,
+        storage_state_path: Optional[str] = (
+            settings.STORAGE_STATE_PATH if settings.PERSIST_CONSENT_STATE else None
+        ),
+    ) -> None:
+        self.headless = headless
+        self.slow_mo_ms = slow_mo_ms
+        self.max_uses_per_context = max(1, max_uses_per_context)
+        self._slots = asyncio.Semaphore(max(1, max_contexts))
+        self._idle: list[_PooledContext] = []
+        self._playwright: Any = None
+        self._browser: Any = None
+        self._launch_lock = asyncio.Lock()
+        self.blocker: Optional[ResourceBlocker] = None
+        if block_resources:
+            self.blocker = blocker or ResourceBlocker()
+        self.storage_state_path = pathlib.Path(storage_state_path) if storage_state_path else None
+
+    async def __aenter__(self) -> BrowserPool:
+        await self._ensure_browser()
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.close()
+
+    async def _ensure_browser(self) -> Any:
+        """Launch Chromium if it is not running (first use, or after a crash/disconnect)."""
+        async with self._launch_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+            if self._browser is not None:
+                logger.warning("BrowserPool: browser disconnected; relaunching")
+                self._idle.clear()
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(
+                headless=self.headless, slow_mo=self.slow_mo_ms
+            )
+            logger.info("BrowserPool: launched Chromium (headless=%s)", self.headless)
+            return self._browser
+
+    async def _new_context(self) -> _PooledContext:
+        browser = await self._ensure_browser()
+        options: dict[str, Any] = {"user_agent": settings.USER_AGENT, "java_script_enabled": True}
+        if self.has_consent_state:
+            options["storage_state"] = str(self.storage_state_path)
+        context = await browser.new_context(**options)
+        for script in settings.BYPASS_SCRIPTS:
+            await context.add_init_script(script)
+        if self.blocker is not None:
+            await self.blocker.attach(context)
+        return _PooledContext(context=context)
+
+    async def _acquire(self) -> _PooledContext:
+        await self._slots.acquire()
+        try:
+            if self._idle:
+                return self._idle.pop()
+            return await self._new_context()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def _release(self, pooled: _PooledContext, *, discard: bool) -> None:
+        try:
+            pooled.uses += 1
+            if discard or pooled.uses >= self.max_uses_per_context:
+                await _close_quietly(pooled.context)
+            else:
+                self._idle.append(pooled)
+        finally:
+            self._slots.release()
+
+    @property
+    def has_consent_state(self) -> bool:
+        """True when a saved storage state is loaded into new contexts."""
+        return self.storage_state_path is not None and self.storage_state_path.is_file()
+
+    async def save_storage_state(self, context: Any) -> None:
+        """Persist `context` cookies/localStorage so later contexts (and runs) start with consent given."""
+        if self.storage_state_path is None:
+            return
+        self.storage_state_path.parent.mkdir(parents=True, exist_ok=True)
+        await context.storage_state(path=str(self.storage_state_path))
+        logger.info("BrowserPool: saved storage state to %s", self.storage_state_path)
+
+    @asynccontextmanager
+    async def context(self) -> AsyncIterator[Any]:
+        """Yield a pooled browser context; it is recycled (or retired) when the block exits."""
+        pooled = await self._acquire()
+        failed = False
+        try:
+            yield pooled.context
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            await self._release(pooled, discard=failed)
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        """Yield a new page from a pooled context and close the page afterwards."""
+        async with self.context() as context:
+            page = await context.new_page()
+            try:
+                yield page
+            finally:
+                await _close_quietly(page)
+
+    async def close(self) -> None:
+        """Close idle contexts, the browser and the Playwright driver."""
+        if self.blocker is not None:
+            logger.info("BrowserPool: request interception %s", self.blocker.summary())
+        while self._idle:
+            await _close_quietly(self._idle.pop().context)
+        if self._browser is not None:
+            await _close_quietly(self._browser)
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+async def _close_quietly(obj: Optional[Any]) -> None:
+    """Close a Playwright page/context/browser, logging instead of raising."""
+    if obj is None:
+        return
+    try:
+        await obj.close()
+    except Exception as e:
+        logger.debug("BrowserPool: close failed: %s", e)
@@ -0,0 +1,171 @@
+"""Row-level change data capture: diff each cleaned snapshot against the previous one by key."""
+from __future__ import annotations
+
+import json
+import logging
+import pathlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional, Union
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from .cleaned_table import CleanedTable, python_columns
+from .jsonl_writer import write_jsonl
+
+logger = logging.getLogger(__name__)
+
+OP_INSERT = "insert"
+OP_UPDATE = "update"
+OP_DELETE = "delete"
+# Files kept next to the base output path: the delta stream and the last snapshot it was diffed against
+DELTA_SUFFIX = ".delta.jsonl"
+STATE_SUFFIX = ".cdc_state.jsonl"
+
+
+@dataclass
+class ChangeSet:
+    """
+    Rows that changed between two snapshots of a keyed table.
+
+    Args:
+        key: Column identifying a row (e.g. 'Symbol').
+        inserted: Rows whose key is new, with their current values.
+        updated: Rows whose key exists in both snapshots with at least one differing value (current values).
+        deleted: Rows whose key disappeared, with their previous values.
+        changed: For each updated row (same order as `updated`), the columns that differ.
+    """
+    key: str
+    inserted: pd.DataFrame
+    updated: pd.DataFrame
+    deleted: pd.DataFrame
+    changed: list[list[str]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.inserted) + len(self.updated) + len(self.deleted)
+
+    def counts(self) -> dict[str, int]:
+        return {OP_INSERT: len(self.inserted), OP_UPDATE: len(self.updated), OP_DELETE: len(self.deleted)}
+
+    def records(self, at: Optional[str] = None) -> Iterator[dict[str, Any]]:
+        """Delta records: {'op', 'at', <row columns>} plus 'changed' (column names) for updates."""
+        at = at or datetime.now(timezone.utc).isoformat(timespec="microseconds")
+        for op, frame in ((OP_INSERT, self.inserted), (OP_UPDATE, self.updated), (OP_DELETE, self.deleted)):
+            columns = list(frame.columns)
+            for i, row in enumerate(zip(*python_columns(frame), strict=True)):
+                record = {"op": op, "at": at, **dict(zip(columns, row, strict=True))}
+                if op == OP_UPDATE:
+                    record["changed"] = self.changed[i]
+                yield record
+
+
+Table = Union[CleanedTable, pd.DataFrame, list[dict[str, Any]]]
+
+
+def _frame(table: Table) -> pd.DataFrame:
+    if isinstance(table, CleanedTable):
+        return table.frame
+    if isinstance(table, pd.DataFrame):
+        return table
+    return pd.DataFrame.from_records(table)
+
+
+def _keyed(frame: pd.DataFrame, key: str) -> pd.DataFrame:
+    """Drop rows without a key and keep the last of duplicate keys (positional index)."""
+    frame = frame[frame[key].notna().to_numpy()]
+    duplicated = frame[key].duplicated(keep="last").to_numpy()
+    if duplicated.any():
+        logger.warning("cdc: %d duplicate %s values; keeping the last row of each", int(duplicated.sum()), key)
+        frame = frame[~duplicated]
+    return frame.reset_index(drop=True)
+
+
+def _differs(previous: pd.Series, current: pd.Series) -> np.ndarray:
+    """True where two aligned columns differ; missing vs missing counts as equal."""
+    try:
+        previous = previous.astype(current.dtype)
+    except (TypeError, ValueError):
+        previous, current = previous.astype(object), current.astype(object)
+    both_missing = previous.isna().to_numpy() & current.isna().to_numpy()
+    equal = (previous == current).fillna(False).to_numpy(dtype=bool)
+    return ~(equal | both_missing)
+
+
+def diff_snapshots(
+    previous: Optional[Table],
+    current: Table,
+    key: str = "Symbol",
+) -> ChangeSet:
+    """
+    Compare two snapshots keyed by `key` with whole-column operations (no per-row Python loop):
+    keys only in `current` are inserted, keys only in `previous` deleted, and shared keys with any
+    differing column updated. With no (or an empty) previous snapshot every current row is an insert.
+    """
+    cur = _keyed(_frame(current), key)
+    previous_frame = None if previous is None else _frame(previous)
+    if previous_frame is None or key not in previous_frame.columns:
+        return ChangeSet(key, inserted=cur, updated=cur.iloc[:0], deleted=cur.iloc[:0])
+    prev = _keyed(previous_frame, key)
+
+    # hash join on the key: position of each current row in the previous snapshot, -1 if new
+    position = pd.Index(prev[key]).get_indexer(cur[key])
+    matched = position >= 0
+    gone = np.ones(len(prev), dtype=bool)
+    gone[position[matched]] = False
+    inserted = cur[~matched]
+    deleted = prev[gone]
+
+    common = cur[matched].reset_index(drop=True)
+    before = prev.take(position[matched]).reset_index(drop=True)
+    columns = [c for c in cur.columns if c != key]
+    if columns:
+        diff = np.column_stack([
+            _differs(before[c], common[c]) if c in before.columns else np.ones(len(common), dtype=bool)
+            for c in columns
+        ])
+    else:
+        diff = np.zeros((len(common), 0), dtype=bool)
+    rows = diff.any(axis=1)
+    names = np.array(columns, dtype=object)
+    changed = [names[mask].tolist() for mask in diff[rows]]
+    return ChangeSet(
+        key=key,
+        inserted=inserted.reset_index(drop=True),
+        updated=common[rows].reset_index(drop=True),
+        deleted=deleted.reset_index(drop=True),
+        changed=changed,
+    )
+
+
+def load_state(path: str) -> Optional[pd.DataFrame]:
+    """Read the snapshot saved by save_state, or None if there is none yet."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return pd.DataFrame.from_records([json.loads(line) for line in f if line.strip()])
+    except FileNotFoundError:
+        return None
+
+
+def save_state(table: Table, path: str) -> None:
+    tmp = f"{path}.tmp"
+    write_jsonl(CleanedTable(_frame(table)), tmp)
+    pathlib.Path(tmp).replace(path)
+
+
+def capture_changes(
+    table: Table,
+    base_file_path: str,
+    key: str = "Symbol",
+) -> ChangeSet:
+    """
+    Diff `table` against the snapshot kept at <base_file_path>.cdc_state.jsonl, append the inserted/
+    updated/deleted rows to the <base_file_path>.delta.jsonl stream, and make `table` the new state.
+    """
+    state_path = f"{base_file_path}{STATE_SUFFIX}"
+    changes = diff_snapshots(load_state(state_path), table, key)
+    if len(changes):
+        write_jsonl(changes.records(), f"{base_file_path}{DELTA_SUFFIX}", append=True)
+    save_state(table, state_path)
+    logger.info("cdc: %s changes for %s: %s", len(changes), base_file_path, changes.counts())
+    return changes
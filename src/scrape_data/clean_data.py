@@ -1,32 +1,80 @@
 """Clean and prepare HTML table data fetched from web scraping for Pydantic validation."""
 from __future__ import annotations
 
-import io
 import logging
-from typing import Any, Dict, Optional, Type
+from typing import Any, Callable, Dict, Mapping, Optional, Type, Union
+import numpy as np
 import pandas as pd  # type: ignore
+from pydantic import BaseModel  # type: ignore
 from .config import settings
-from . import scrape_web_data  # local import to avoid circular at module import time
+from .table_extractor import TableLocator, extract_table_frame
+from .cleaning_plan import PARSER_FLOAT, PARSER_INT, PARSER_VOLUME, CleaningPlan, compile_plan, row_model
+from .validation import materialize, validate_frame
+from .cleaned_table import CleanedTable
+from . import static_models, dynamic_models
+from .runner import run
 
 logger = logging.getLogger(__name__)
 
 
+_PERCENT_SUFFIX = {"%": 1}
+_VOLUME_MULTIPLIERS = {"K": 1_000, "M": 1_000_000, "B": 1_000_000_000}
+# what float() accepts of a cleaned cell, minus the nan/inf spellings
+_NUMBER_PATTERN = r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?"
+
+
+def _parse_numeric_values(series: pd.Series, suffixes: Mapping[str, float]) -> np.ndarray:
+    """
+    Numeric normalizer on pandas string methods: strips whitespace and thousands separators,
+    splits off one trailing suffix (case-insensitive, scaled by its multiplier) and converts the
+    rest. Returns float64 values with NaN for missing/unparseable cells.
+
+    Cells are checked against _NUMBER_PATTERN and cast in one go: pd.to_numeric(errors="coerce")
+    gives the same values but drops to a per-cell path as soon as one cell (a '--' placeholder)
+    does not parse, which is slower than _parse_volume_value applied per cell (see
+    benchmarks/bench_volume_parser.py).
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(dtype="float64", na_value=np.nan)
+    text = series.astype("string").str.replace(",", "", regex=False).str.strip()
+    last = text.str[-1].str.upper()
+    multipliers = np.ones(len(text))
+    suffixed = np.zeros(len(text), dtype=bool)
+    for suffix, factor in suffixes.items():
+        hit = (last == suffix.upper()).to_numpy(dtype=bool, na_value=False)
+        multipliers[hit] = factor
+        suffixed |= hit
+    text = text.where(~suffixed, text.str[:-1].str.rstrip())
+    numbers = text.where(text.str.fullmatch(_NUMBER_PATTERN).fillna(False)).astype("Float64")
+    return numbers.to_numpy(dtype="float64", na_value=np.nan) * multipliers
+
+
+def _int64_series(values: np.ndarray, index: pd.Index) -> pd.Series:
+    """Nullable Int64 series from float64 values; NaN, non-integral and out-of-range values become NA."""
+    missing = ~(np.abs(values) < 2.0**63) | (values != np.trunc(values))
+    data = np.where(missing, 0, values).astype(np.int64)
+    return pd.Series(pd.arrays.IntegerArray(data, missing), index=index)
+
+
 def _parse_int_nullable(series: pd.Series) -> pd.Series:
-    """Remove commas, coerce to numeric, return pandas nullable Int64 dtype."""
-    s = series.astype(str).replace({"": pd.NA, "nan": pd.NA, "None": pd.NA})
-    s = s.str.replace(",", "", regex=False).str.strip()
-    return pd.to_numeric(s, errors="coerce").astype("Int64")
+    """
+    Parse '1,234', '+5' etc. column-wise, return pandas nullable Int64 dtype. A '%' suffix is not
+    accepted ('12%' is a ratio, not the count an int field holds) and becomes missing.
+    """
+    return _int64_series(_parse_numeric_values(series, {}), series.index)
 
 
 def _parse_float_nullable(series: pd.Series) -> pd.Series:
-    """Remove commas, coerce to float (NaN allowed)."""
-    s = series.astype(str).replace({"": pd.NA, "nan": pd.NA, "None": pd.NA})
-    s = s.str.replace(",", "", regex=False).str.strip()
-    return pd.to_numeric(s, errors="coerce")
+    """Parse '1,234.5', '+3.2', '-0.5%' etc. column-wise into float64 (NaN allowed)."""
+    values = _parse_numeric_values(series, _PERCENT_SUFFIX)
+    return pd.Series(values, index=series.index)
 
 
 def _parse_volume_value(v: Any) -> Optional[int]:
-    """Convert '1.2M', '3.4B', '123,456' into integer counts, or None if not parseable."""
+    """
+    Convert '1.2M', '3.4B', '123,456' into integer counts, or None if not parseable.
+    Scalar reference for _parse_volume_column (used by the benchmark and for single values).
+    """
     if v is None:
         return None
     s = str(v).strip()
@@ -47,112 +95,226 @@ def _parse_volume_value(v: Any) -> Optional[int]:
 
 
 def _parse_volume_column(series: pd.Series) -> pd.Series:
-    """Apply volume parsing and return nullable Int64 series."""
-    parsed = series.astype(str).apply(_parse_volume_value)
-    return pd.Series(parsed, dtype="Int64")
+    """
+    Vectorized volume parsing ('1.2M', '3.4B', '123,456') into a nullable Int64 series.
+    Gives the same results as applying _parse_volume_value per cell, including exponents
+    and spaced suffixes ('1e5', '5.5 M'). Values outside the Int64 range (e.g. '1e30')
+    become missing rather than overflowing.
+    """
+    values = _parse_numeric_values(series, _VOLUME_MULTIPLIERS)
+    return _int64_series(np.trunc(values), series.index)
+
+
+# Vectorized column parser for each parser kind a cleaning plan can assign
+_PARSERS: dict[str, Callable[[pd.Series], pd.Series]] = {
+    PARSER_INT: _parse_int_nullable,
+    PARSER_FLOAT: _parse_float_nullable,
+    PARSER_VOLUME: _parse_volume_column,
+}
 
 
-def _validate_with_model(records: list[dict[str, Any]], model: Type) -> Optional[Any]:
+def _apply_plan(df: pd.DataFrame, plan: CleaningPlan) -> pd.DataFrame:
+    """Drop the columns the plan does not keep, then run each planned column parser."""
+    return _parse_columns(plan.project(df), plan)
+
+
+def _parse_columns(df: pd.DataFrame, plan: CleaningPlan) -> pd.DataFrame:
+    for column, kind in plan.parsers:
+        if column in df.columns:
+            df[column] = _PARSERS[kind](df[column])
+    return df
+
+
+def restore_table(records: list[dict[str, Any]], mode: str, model: Optional[Type[BaseModel]] = None) -> CleanedTable:
     """
-    Validate records with a provided Pydantic model type (a table model expecting e.g. a list).
-    If validation fails, logs and returns None.
+    Rebuild a cleaned table from plain records (e.g. cached as JSON) with the dtypes cleaning
+    gives it: the plan's parsers of `model` (the mode's default model if None) run again, so
+    nullable Int64 columns do not come back as float64.
     """
-    try:
-        instance = model(**{list(model.__fields__.keys())[0]: records})  # type: ignore[attr-defined]
-        return instance
-    except Exception:
-        validated = []
-        errors = []
-        for idx, rec in enumerate(records):
-            try:
-                item = model(**rec)
-                validated.append(item)
-            except Exception as exc:
-                errors.append((idx, exc))
-        if errors:
-            logger.error("Validation errors: %s", errors[:5])
+    model_cls = model or (static_models.CountryData if mode == "static" else dynamic_models.IndexData)
+    return CleanedTable(_parse_columns(pd.DataFrame.from_records(records), compile_plan(model_cls)))
+
+
+OUTPUTS = ("records", "frame")
+
+
+def _as_output(df: pd.DataFrame, output: str) -> Union[list[dict[str, Any]], CleanedTable]:
+    """Return the cleaned frame as records (one dict per row) or wrapped in a CleanedTable."""
+    if output == "frame":
+        return CleanedTable(df)
+    return df.to_dict(orient="records")
+
+
+def _check_output(output: str) -> None:
+    if output not in OUTPUTS:
+        raise ValueError(f"Invalid output: {output}. Choose one of {OUTPUTS}.")
+
+
+def _validate_with_model(
+    records: Union[pd.DataFrame, CleanedTable, list[dict[str, Any]]],
+    model: Type,
+    drop_invalid: bool = False,
+) -> Optional[Any]:
+    """
+    Validate a cleaned table against `model` (a row model, or a table model wrapping a list of rows)
+    with one columnar pass, then build instances for the passing rows via construct().
+    Failing rows are logged in bulk. If any row fails, returns None unless drop_invalid=True,
+    in which case only the passing rows are kept.
+    Returns a table model instance for table models, else a list of row instances.
+    """
+    if isinstance(records, CleanedTable):
+        df = records.frame
+    elif isinstance(records, pd.DataFrame):
+        df = records
+    else:
+        df = pd.DataFrame.from_records(records)
+    report = validate_frame(df, model)
+    if not report.ok:
+        logger.error(
+            "Validation failed for %d of %d rows: %s",
+            len(report.invalid_rows), len(df), report.summary(),
+        )
+        if not drop_invalid:
             return None
-        return validated
+    rows = materialize(df, report.model, None if report.ok else report.valid)
+    if report.model is model:
+        return rows
+    table_field = next(iter(model.__fields__.values()))  # type: ignore[attr-defined]
+    return model.construct(**{table_field.name: rows})
+
 
+def _static_required(model: Type[BaseModel]) -> list[str]:
+    return settings.REQUIRED_COLUMNS_STATIC if row_model(model) is static_models.CountryData else []
 
-def clean_static_data(static_raw_html: Optional[str], validate: bool = False, model: Optional[Type] = None) -> Optional[list[dict[str, Any]]]:
+
+def static_locator(model: Optional[Type[BaseModel]] = None, locator: Optional[TableLocator] = None) -> TableLocator:
+    """
+    The table clean_static_data reads for `model`: `locator` when given, else the one whose header
+    has REQUIRED_COLUMNS_STATIC (CountryData) or all of the model's aliases (any other model).
+    """
+    if locator is not None:
+        return locator
+    model_cls = model or static_models.CountryData
+    required = _static_required(model_cls)
+    return TableLocator(headers=tuple(required or compile_plan(model_cls, tuple(required)).keep))
+
+
+def clean_static_data(
+    static_raw_html: Optional[str],
+    validate: bool = False,
+    model: Optional[Type[BaseModel]] = None,
+    drop_invalid: bool = False,
+    output: str = "records",
+    locator: Optional[TableLocator] = None,
+) -> Optional[Union[list[dict[str, Any]], CleanedTable]]:
     """
     Parse and clean the raw static HTML for population data.
-    Returns list[dict] (records) or None on failure.
-    If validate=True and model provided, attempts pydantic validation and returns model instance (or None on validation failure).
+    Columns are kept and parsed per the cleaning plan of `model` (CountryData by default).
+    `locator` picks the table (default: the one whose header has REQUIRED_COLUMNS_STATIC for
+    CountryData, or all of the model's aliases for any other model).
+    Returns list[dict] (records), or a columnar CleanedTable with output="frame"; None on failure.
+    If validate=True and model provided, validates column-wise and returns model instance(s), or None on
+    validation failure (drop_invalid=True keeps the passing rows instead).
     """
+    _check_output(output)
     if not static_raw_html:
         logger.error("clean_static_data: empty html input")
         return None
 
     try:
-        tables = pd.read_html(io.StringIO(static_raw_html))
-        if not tables:
-            logger.error("clean_static_data: no tables found in HTML")
+        model_cls = model or static_models.CountryData
+        plan = compile_plan(model_cls, tuple(_static_required(model_cls)))
+        locator = static_locator(model_cls, locator)
+        df = extract_table_frame(static_raw_html, locator, columns=list(plan.keep))
+        if df is None:
+            logger.error("clean_static_data: no table matched %s", locator)
             return None
-
-        df = tables[0]
-
-        required = settings.REQUIRED_COLUMNS_STATIC
-        if not all(col in df.columns for col in required):
-            logger.error("clean_static_data: missing required columns. expected=%s found=%s", required, list(df.columns))
-            return None
-        if "Population 2025" in df.columns:
-            df["Population 2025"] = _parse_int_nullable(df["Population 2025"])
-
-        records = df.to_dict(orient="records")
-        logger.info("clean_static_data: cleaned %d records", len(records))
+        df = _apply_plan(df, plan)
 
         if validate and model:
-            validated = _validate_with_model(records, model)
+            validated = _validate_with_model(df, model, drop_invalid=drop_invalid)
             if validated is None:
                 logger.error("clean_static_data: validation failed")
                 return None
             return validated  # type: ignore[return-value]
 
-        return records
+        logger.info("clean_static_data: cleaned %d records", len(df))
+        return _as_output(df, output)
 
     except Exception as exc:
         logger.exception("clean_static_data: exception during cleaning: %s", exc)
         return None
 
 
-def clean_dynamic_data(dynamic_raw_html: Optional[str], validate: bool = False, model: Optional[Type] = None) -> Optional[list[dict[str, Any]]]:
+DynamicRaw = Union[str, dict[str, list[Any]], list[dict[str, Any]]]
+
+
+def _frame_from_arrays(arrays: dict[str, list[Any]]) -> pd.DataFrame:
+    """Build a DataFrame from {'headers': [...], 'rows': [[...], ...]}, padding/truncating ragged rows."""
+    headers = list(arrays.get("headers") or [])
+    n = len(headers)
+    rows = [list(r[:n]) + [None] * (n - len(r)) for r in arrays.get("rows") or []]
+    return pd.DataFrame(rows, columns=headers)
+
+
+def _dynamic_frame(
+    dynamic_raw: DynamicRaw, plan: CleaningPlan, locator: Optional[TableLocator] = None
+) -> Optional[pd.DataFrame]:
+    """
+    Build the raw dynamic DataFrame from table HTML, in-page header/row arrays, or feed records.
+    HTML is read with lxml from the table matched by `locator` (the first table if None),
+    keeping only the columns of the cleaning plan.
     """
-    Parse and clean the raw dynamic HTML (e.g. Yahoo indices).
-    Returns list[dict] (records) or None on failure.
-    If validate=True and model provided, returns validated model or None on validation failure.
+    if isinstance(dynamic_raw, dict):
+        return _frame_from_arrays(dynamic_raw)
+    if isinstance(dynamic_raw, list):
+        return pd.DataFrame.from_records(dynamic_raw)
+    return extract_table_frame(dynamic_raw, locator, columns=list(plan.keep))
+
+
+def clean_dynamic_data(
+    dynamic_raw_html: Optional[DynamicRaw],
+    validate: bool = False,
+    model: Optional[Type[BaseModel]] = None,
+    drop_invalid: bool = False,
+    output: str = "records",
+    locator: Optional[TableLocator] = None,
+) -> Optional[Union[list[dict[str, Any]], CleanedTable]]:
     """
+    Parse and clean the raw dynamic content (e.g. Yahoo indices).
+    Accepts the rendered table HTML, the {'headers', 'rows'} arrays from in-page JS extraction,
+    or IndexData-shaped records from the network feed (the last two skip HTML parsing entirely).
+    Columns are kept and parsed per the cleaning plan of `model` (IndexData by default);
+    `locator` picks the table when the HTML holds more than one.
+    Returns list[dict] (records), or a columnar CleanedTable with output="frame"; None on failure.
+    If validate=True and model provided, returns validated model or None on validation failure
+    (drop_invalid=True keeps the passing rows instead).
+    """
+    _check_output(output)
     if not dynamic_raw_html:
         logger.error("clean_dynamic_data: empty html input")
         return None
 
     try:
-        tables = pd.read_html(io.StringIO(dynamic_raw_html))
-        if not tables:
+        plan = compile_plan(model or dynamic_models.IndexData)
+        df = _dynamic_frame(dynamic_raw_html, plan, locator)
+        if df is None:
             logger.error("clean_dynamic_data: no tables found")
             return None
 
-        df = tables[0]
-        df.replace({"--": pd.NA, "N/A": pd.NA, "": pd.NA}, inplace=True)
-        if "Volume" in df.columns:
-            df["Volume"] = _parse_volume_column(df["Volume"])
-        if "Last Price" in df.columns:
-            df["Last Price"] = _parse_float_nullable(df["Last Price"])
-        if "Change" in df.columns:
-            df["Change"] = _parse_float_nullable(df["Change"].astype(str).str.replace("+", "", regex=False))
-
-        records = df.to_dict(orient="records")
-        logger.info("clean_dynamic_data: cleaned %d records", len(records))
+        df = plan.project(df)
+        df = df.replace({"--": pd.NA, "N/A": pd.NA, "": pd.NA})
+        df = _apply_plan(df, plan)
 
         if validate and model:
-            validated = _validate_with_model(records, model)
+            validated = _validate_with_model(df, model, drop_invalid=drop_invalid)
             if validated is None:
                 logger.error("clean_dynamic_data: validation failed")
                 return None
             return validated  # type: ignore[return-value]
 
-        return records
+        logger.info("clean_dynamic_data: cleaned %d records", len(df))
+        return _as_output(df, output)
 
     except Exception as exc:
         logger.exception("clean_dynamic_data: exception during cleaning: %s", exc)
@@ -162,39 +324,23 @@ def main(mode: str, url: Optional[str] = None, validate: bool = False, model: Op
     """
     Run fetch + clean pipeline for given mode ('static'|'dynamic').
     Returns 0 on success, 1 on failure.
-    Note: this function uses the scrape_web_data async helpers and runs them synchronously via asyncio.run,
-    which is appropriate for CLI convenience but avoid calling main() from inside an active event loop.
+    The fetch runs on the single event loop owned by runner.run; from async code, use
+    `async with Runner() as runner: await runner.fetch(mode, url)` and call the clean_* functions.
     """
-   
-
     try:
         if mode not in ("static", "dynamic"):
             logger.error("main: invalid mode '%s'", mode)
             return 1
 
-        if mode == "static":
-            target_url = url or settings.URL_STATIC
-            html = asyncio_run_safe(scrape_web_data.fetch_static_data(target_url))
-            if not html:
-                logger.error("main: failed to fetch static html from %s", target_url)
-                return 1
-            result = clean_static_data(html, validate=validate, model=model)
-            return 0 if result else 1
-        # mode == "dynamic"
-        target_url = url or settings.URL_DYNAMIC
-        html = asyncio_run_safe(
-            scrape_web_data.fetch_dynamic_table_content(
-                url=target_url,
-                selector=settings.TABLE_HEADER_SELECTOR_DYNAMIC,
-                timeout_ms=settings.PLAYWRIGHT_TIMEOUT_MS,
-                headless=settings.HEADLESS,
-                slow_mo_ms=settings.SLOW_MO_MS,
-            )
-        )
+        target_url = url or (settings.URL_STATIC if mode == "static" else settings.URL_DYNAMIC)
+        html = run(lambda runner: runner.fetch(mode, target_url))
         if not html:
-            logger.error("main: failed to fetch dynamic html from %s", target_url)
+            logger.error("main: failed to fetch %s html from %s", mode, target_url)
             return 1
-        result = clean_dynamic_data(html, validate=validate, model=model)
+        if mode == "static":
+            result = clean_static_data(html, validate=validate, model=model)
+        else:
+            result = clean_dynamic_data(html, validate=validate, model=model)
         return 0 if result else 1
 
     except Exception:
@@ -202,26 +348,6 @@ def main(mode: str, url: Optional[str] = None, validate: bool = False, model: Op
         return 1
 
 
-def asyncio_run_safe(coro):
-    """Run coroutine synchronously, but surface a helpful error if loop already running."""
-    import asyncio
-
-    try:
-        return asyncio.run(coro)
-    except RuntimeError:
-        try:
-            loop = asyncio.get_event_loop()
-            if loop and loop.is_running():
-                import nest_asyncio
-
-                nest_asyncio.apply(loop)
-                return loop.run_until_complete(coro)
-        except Exception:
-            logger.exception("asyncio_run_safe: fallback failed")
-            raise
-        raise
-
-
 if __name__ == "__main__":
     import argparse
 
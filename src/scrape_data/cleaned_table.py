@@ -0,0 +1,88 @@
+"""Columnar result of the clean_* functions, with a lazy row-dict view for record-oriented callers."""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any, Iterator, Optional, Union, overload
+
+import pandas as pd  # type: ignore
+
+
+def json_default(value: Any) -> Any:
+    """json.dump(s) default: missing values as null, pandas/numpy scalars as Python values."""
+    if value is pd.NA or value is pd.NaT:
+        return None
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def python_columns(frame: pd.DataFrame, columns: Optional[list[str]] = None) -> list[list[Any]]:
+    """Columns of `frame` as lists of plain Python values, with every missing value as None."""
+    columns = list(frame.columns) if columns is None else columns
+    return [frame[c].astype(object).where(frame[c].notna(), None).tolist() for c in columns]
+
+
+class CleanedTable(Sequence):
+    """
+    A cleaned table kept as one DataFrame (one array per column, no per-row dicts).
+
+    It still behaves like the list of records clean_* used to return: len(), indexing,
+    slicing and iteration yield row dicts built on demand, with missing values as None.
+    Use `.frame` for columnar consumers (savers, validators) and to_records() for a real list.
+    """
+
+    def __init__(self, frame: pd.DataFrame) -> None:
+        self.frame = frame
+        self._values: Optional[list[list[Any]]] = None
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self.frame.columns)
+
+    def _column_values(self) -> list[list[Any]]:
+        if self._values is None:
+            self._values = python_columns(self.frame)
+        return self._values
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @overload
+    def __getitem__(self, index: int) -> dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[dict[str, Any]]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[dict[str, Any], list[dict[str, Any]]]:
+        columns = self.columns
+        values = self._column_values()
+        if isinstance(index, slice):
+            rows = zip(*(v[index] for v in values), strict=True)
+            return [dict(zip(columns, row, strict=True)) for row in rows]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("CleanedTable index out of range")
+        return {c: v[index] for c, v in zip(columns, values, strict=True)}
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        columns = self.columns
+        if not columns:
+            yield from ({} for _ in range(len(self)))
+            return
+        for row in zip(*self._column_values(), strict=True):
+            yield dict(zip(columns, row, strict=True))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CleanedTable):
+            return self.frame.equals(other.frame)
+        if isinstance(other, list):
+            return self.to_records() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"CleanedTable(rows={len(self)}, columns={self.columns})"
+
+    def to_records(self) -> list[dict[str, Any]]:
+        """Materialize the rows as a list of dicts."""
+        return list(self)
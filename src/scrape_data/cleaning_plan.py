@@ -0,0 +1,106 @@
+"""Compile per-model cleaning plans from the field aliases and types of the Pydantic models."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from functools import cache
+from typing import Optional, Type
+
+import pandas as pd  # type: ignore
+from pydantic import BaseModel  # type: ignore
+from pydantic.fields import SHAPE_SINGLETON  # type: ignore
+
+from .dynamic_models import IndexData
+
+logger = logging.getLogger(__name__)
+
+# Parser kinds a plan can assign; clean_data maps each one to its vectorized column parser.
+# A column registered in FIELD_PARSERS gets that parser, otherwise its field type decides.
+PARSER_INT = "int"
+PARSER_FLOAT = "float"
+PARSER_VOLUME = "volume"
+PARSER_KINDS = (PARSER_INT, PARSER_FLOAT, PARSER_VOLUME)
+
+# Row model -> {field alias: parser kind} for columns the field type alone does not describe.
+# Kept here rather than in Field(...) extras, which would leak into the models' JSON schema.
+FIELD_PARSERS: dict[Type[BaseModel], dict[str, str]] = {
+    IndexData: {"Volume": PARSER_VOLUME},
+}
+
+
+@dataclass(frozen=True)
+class CleaningPlan:
+    """
+    What cleaning a table for one row model involves.
+
+    Args:
+        model: The row model the plan was compiled from.
+        keep: Column names to keep (required columns first, then the model's aliases);
+            anything else is dropped before parsing.
+        parsers: (column, parser kind) pairs for the columns that need numeric parsing.
+    """
+    model: Type[BaseModel]
+    keep: tuple[str, ...]
+    parsers: tuple[tuple[str, str], ...]
+
+    def project(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Drop the columns the plan does not keep (no copy when nothing is dropped)."""
+        keep = set(self.keep)
+        if all(c in keep for c in df.columns):
+            return df
+        return df[[c for c in df.columns if c in keep]]
+
+
+def row_model(model: Type[BaseModel]) -> Type[BaseModel]:
+    """
+    Resolve a table model (a single list-of-rows field, e.g. PopulationTable.countries) to its
+    row model; row models are returned unchanged.
+    """
+    fields = list(model.__fields__.values())  # type: ignore[attr-defined]
+    if len(fields) == 1:
+        inner = fields[0].type_
+        if fields[0].shape != SHAPE_SINGLETON and isinstance(inner, type) and issubclass(inner, BaseModel):
+            return inner
+    return model
+
+
+def register_parsers(model: Type[BaseModel], parsers: dict[str, str]) -> None:
+    """Give the columns (field aliases) of `model` an explicit parser kind, e.g. {"Shares": "volume"}."""
+    for alias, kind in parsers.items():
+        if kind not in PARSER_KINDS:
+            raise ValueError(f"Unknown parser {kind!r} for column {alias!r} of {model.__name__}")
+    model = row_model(model)
+    FIELD_PARSERS[model] = {**FIELD_PARSERS.get(model, {}), **parsers}
+    compile_plan.cache_clear()
+
+
+def _parser_kind(field: object) -> Optional[str]:
+    field_type = field.type_  # type: ignore[attr-defined]
+    if not isinstance(field_type, type) or issubclass(field_type, bool):
+        return None
+    if issubclass(field_type, int):
+        return PARSER_INT
+    if issubclass(field_type, float):
+        return PARSER_FLOAT
+    return None
+
+
+@cache
+def compile_plan(model: type[BaseModel], required: tuple[str, ...] = ()) -> CleaningPlan:
+    """
+    Build (once per model class and required columns) the cleaning plan for `model`.
+    Table models are resolved to their row model first.
+    """
+    model = row_model(model)
+    explicit = FIELD_PARSERS.get(model, {})
+    keep = list(required)
+    parsers = []
+    for field in model.__fields__.values():  # type: ignore[attr-defined]
+        if field.alias not in keep:
+            keep.append(field.alias)
+        kind = explicit.get(field.alias) or _parser_kind(field)
+        if kind is not None:
+            parsers.append((field.alias, kind))
+    plan = CleaningPlan(model=model, keep=tuple(keep), parsers=tuple(parsers))
+    logger.debug("compile_plan: %s -> %s", model.__name__, plan)
+    return plan
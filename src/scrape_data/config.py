@@ -1,3 +1,5 @@
+from typing import Any, Optional
+
 from pydantic import BaseSettings
 
 
@@ -5,6 +7,33 @@ class Settings(BaseSettings):
     STATUS_FORCELIST: list[int] = [429, 500, 502, 503, 504]
     MAX_RETRIES: int = 3
 
+    # Shared async HTTP client (static pages): connection pool size, per-host cap, timeouts
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 8
+    HTTP_TIMEOUT_S: float = 15.0
+    HTTP_KEEPALIVE_S: float = 30.0
+
+    # Conditional-GET cache for static pages (ETag / Last-Modified), LRU-evicted past the size cap
+    HTTP_CACHE_ENABLED: bool = True
+    HTTP_CACHE_DIR: str = ".cache/http"
+    HTTP_CACHE_MAX_BYTES: int = 50 * 1024 * 1024
+
+    # Codec for parquet/feather snapshots: "zstd", "snappy" (parquet only), "lz4", "gzip" (parquet only) or "none"
+    OUTPUT_COMPRESSION: str = "zstd"
+    # Codec for jsonl output: "none", "gzip" or "zstd" (needs the zstandard package)
+    JSONL_COMPRESSION: str = "none"
+
+    # Skip clean/save/visualize when the fetched table or cleaned records hash like the last saved run;
+    # recent hashes are kept per output file in a manifest inside the output directory
+    DEDUP_ENABLED: bool = True
+    DEDUP_MANIFEST_NAME: str = ".scrape_manifest.json"
+    DEDUP_HISTORY: int = 20
+
+    # Change data capture for dynamic runs: diff each snapshot against the previous one by CDC_KEY and
+    # append inserted/updated/deleted rows to <output>.delta.jsonl
+    CDC_ENABLED: bool = False
+    CDC_KEY: str = "Symbol"
+
     USER_AGENT: str = (
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
         "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -20,15 +49,85 @@ class Settings(BaseSettings):
     URL_STATIC: str = "https://www.worldometers.info/world-population/population-by-country/"
     REQUIRED_COLUMNS_STATIC: list[str] = ["Country (or dependency)", "Population 2025"]
 
+    # --- Target registry (--mode all / --targets) ---
+    # Extra targets as dicts (name, url, mode, model, locator, sink, ...) and/or a TOML file of
+    # [[targets]] tables; "static" and "dynamic" above are always registered. Runs are capped at
+    # TARGET_CONCURRENCY targets in flight
+    TARGETS: list[dict[str, Any]] = []
+    TARGETS_FILE: Optional[str] = None
+    TARGET_CONCURRENCY: int = 4
+    # Staged executor for registry runs (--staged): TARGET_CONCURRENCY async fetch workers feed a
+    # process pool of CLEAN_WORKERS cleaners (0 = one per CPU) and one writer, through queues holding
+    # at most STAGE_QUEUE_SIZE artifacts each
+    STAGED_ENABLED: bool = False
+    CLEAN_WORKERS: int = 0
+    STAGE_QUEUE_SIZE: int = 8
+    # Scheduler daemon (scrape-data serve): each target runs every SCHEDULE_INTERVAL_S seconds (or its
+    # own `interval`), shifted by up to +/-SCHEDULE_JITTER of the interval; on SIGTERM/SIGINT in-flight
+    # runs get SHUTDOWN_GRACE_S to finish before they are cancelled
+    SCHEDULE_INTERVAL_S: float = 900.0
+    SCHEDULE_JITTER: float = 0.1
+    SHUTDOWN_GRACE_S: float = 30.0
+    # Read API (scrape-data api): the latest cleaned snapshot per target is kept in memory for
+    # API_TTL_S seconds and served as JSON, CSV or Arrow; bodies of at least API_GZIP_MIN_BYTES are gzipped
+    API_HOST: str = "127.0.0.1"
+    API_PORT: int = 8080
+    API_TTL_S: float = 300.0
+    API_GZIP_MIN_BYTES: int = 1024
+
     # --- Dynamic Data (Yahoo Finance Indices) Configuration ---
     URL_DYNAMIC: str = "https://finance.yahoo.com/world-indices"
     TABLE_HEADER_SELECTOR_DYNAMIC: str = 'th[data-testid-header="companyshortname.raw"]'
+    TABLE_SELECTOR_DYNAMIC: str = "div.tableContainer table"
     PLAYWRIGHT_TIMEOUT_MS: int = 90_000
+    # "dom" scrapes the rendered table HTML; "js" returns headers + row texts from one page.evaluate;
+    # "network" reads the JSON quote feed behind the table (DOM fallback)
+    DYNAMIC_EXTRACT_MODE: str = "dom"
+    DYNAMIC_FEED_URL_PATTERNS: list[str] = ["/v7/finance/quote", "/v1/finance/screener"]
+    DYNAMIC_FEED_TIMEOUT_MS: int = 15_000
+    # the quote endpoint also feeds the ticker strip: keep listening this long after each matching
+    # response, then use the largest feed (the table's)
+    DYNAMIC_FEED_SETTLE_MS: int = 500
 
     # Playwright runtime options
     HEADLESS: bool = True
     SLOW_MO_MS: int = 0
 
+    # Browser pool: max concurrent contexts, and pages served per context before it is recycled
+    BROWSER_POOL_SIZE: int = 2
+    BROWSER_CONTEXT_MAX_USES: int = 20
+
+    # Request interception for dynamic pages: abort these resource types and URL substrings
+    BLOCK_RESOURCES: bool = True
+    BLOCKED_RESOURCE_TYPES: list[str] = ["image", "media", "font"]
+    BLOCKED_URL_PATTERNS: list[str] = [
+        "doubleclick.net",
+        "googlesyndication.com",
+        "googletagservices.com",
+        "googletagmanager.com",
+        "google-analytics.com",
+        "adservice.google.",
+        "amazon-adsystem.com",
+        "scorecardresearch.com",
+        "criteo.com",
+        "taboola.com",
+        "outbrain.com",
+        "pubmatic.com",
+        "rubiconproject.com",
+        "adnxs.com",
+        "casalemedia.com",
+        "moatads.com",
+        "connect.facebook.net",
+        "analytics.yahoo.com",
+        "ads.yahoo.com",
+    ]
+
+    # Consent handling: how long to wait for any cookie button, and where accepted
+    # cookies/localStorage (Playwright storage_state) are kept so warm runs skip the banner
+    COOKIE_WAIT_TIMEOUT_MS: int = 2_000
+    PERSIST_CONSENT_STATE: bool = True
+    STORAGE_STATE_PATH: str = ".cache/playwright_storage_state.json"
+
     # Cookie dialog candidate button selectors
     COOKIE_BUTTON_SELECTORS: list[str] = [
         "button:has-text('Accept all')",
@@ -0,0 +1,118 @@
+"""Content hashes of fetched tables and cleaned records, with a manifest of recent runs per output file."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import time
+from typing import Any, Optional, Union
+
+import pandas as pd  # type: ignore
+
+from .cleaned_table import CleanedTable, json_default
+from .config import settings
+from .table_extractor import TableLocator, extract_table_fragment
+
+logger = logging.getLogger(__name__)
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def fragment_digest(
+    mode: str, raw: Any, locator: Optional[TableLocator] = None, fragment: Optional[str] = None
+) -> Optional[str]:
+    """
+    Hash of the part of the fetched content that cleaning actually reads.
+    Static pages hash only the table matched by `locator` (the REQUIRED_COLUMNS_STATIC table if None),
+    not ads, timestamps or other tables around it; pass that table as `fragment` when it was
+    already extracted to skip parsing the page again. Dynamic content is already the table HTML or
+    structured rows. None when there is nothing to hash.
+    """
+    if fragment:
+        return _sha256(fragment.encode("utf-8"))
+    if not raw:
+        return None
+    if isinstance(raw, str):
+        if mode == "static":
+            locator = locator or TableLocator(headers=tuple(settings.REQUIRED_COLUMNS_STATIC))
+            raw = extract_table_fragment(raw, locator) or raw
+        return _sha256(raw.encode("utf-8"))
+    return _sha256(json.dumps(raw, sort_keys=True, ensure_ascii=False, default=json_default).encode("utf-8"))
+
+
+def records_digest(records: Union[CleanedTable, pd.DataFrame, list[dict[str, Any]]]) -> str:
+    """Hash of the cleaned table: column names plus pandas' vectorized per-row value hashes."""
+    if isinstance(records, CleanedTable):
+        frame = records.frame
+    elif isinstance(records, pd.DataFrame):
+        frame = records
+    else:
+        frame = pd.DataFrame.from_records(records)
+    digest = hashlib.sha256("\x1f".join(map(str, frame.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class RunManifest:
+    """
+    Recent content hashes per output file, kept in a small JSON file in the output directory.
+
+    Layout (`<output dir>/DEDUP_MANIFEST_NAME`):
+        {"<output file>": [{"fragment": ..., "records": ..., "at": ...}, ...newest last]}
+
+    Only the newest entry decides whether a run is unchanged, so the output file on disk always
+    matches it; older entries are kept (up to `history`) for inspection.
+    """
+
+    def __init__(self, path: str, history: int = settings.DEDUP_HISTORY) -> None:
+        self.path = pathlib.Path(path)
+        self.history = history
+        self._entries: dict[str, list[dict[str, Any]]] = self._load()
+
+    @classmethod
+    def for_output(cls, output_path: str) -> "RunManifest":
+        """The manifest living next to `output_path`."""
+        return cls(str(pathlib.Path(output_path).parent / settings.DEDUP_MANIFEST_NAME))
+
+    def _load(self) -> dict[str, list[dict[str, Any]]]:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning("RunManifest: unreadable manifest %s (%s); starting empty", self.path, e)
+            return {}
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._entries, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def latest(self, output_path: str) -> Optional[dict[str, Any]]:
+        """Newest entry for `output_path`, provided that file still exists."""
+        entries = self._entries.get(output_path)
+        if not entries or not os.path.exists(output_path):
+            return None
+        return entries[-1]
+
+    def unchanged(self, output_path: str, *, fragment: Optional[str] = None, records: Optional[str] = None) -> bool:
+        """True when the given fragment or records hash equals the newest one saved to `output_path`."""
+        entry = self.latest(output_path)
+        if entry is None:
+            return False
+        return bool(
+            (fragment is not None and entry.get("fragment") == fragment)
+            or (records is not None and entry.get("records") == records)
+        )
+
+    def record(self, output_path: str, *, fragment: Optional[str], records: str) -> None:
+        """Append the hashes of a run just saved to `output_path`, trimming to the last `history` entries."""
+        entries = self._entries.setdefault(output_path, [])
+        entries.append({"fragment": fragment, "records": records, "at": time.time()})
+        del entries[:-self.history]
+        self._save()
@@ -0,0 +1,167 @@
+"""On-disk conditional-GET cache (ETag / Last-Modified) for static pages, with size-capped LRU eviction."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import time
+from collections.abc import Sequence
+from typing import Any, Optional
+
+from scrape_data.cleaned_table import json_default
+from scrape_data.config import settings
+
+logger = logging.getLogger(__name__)
+
+_INDEX_FILE = "index.json"
+
+
+class HttpCache:
+    """
+    Cache of response bodies plus their validators, one entry per URL.
+
+    Layout under `directory`:
+        index.json           url, etag, last_modified, size and last access time per entry
+        <key>.body           raw decoded response body
+        <key>.cleaned.json   optional cleaned records derived from that body
+        <key>.<variant>.cleaned.json
+                             cleaned records of another table/model read from the same body
+
+    When the total size exceeds `max_bytes`, least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        directory: str = settings.HTTP_CACHE_DIR,
+        max_bytes: int = settings.HTTP_CACHE_MAX_BYTES,
+    ) -> None:
+        self.directory = pathlib.Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._index: dict[str, dict[str, Any]] = self._load_index()
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _load_index(self) -> dict[str, dict[str, Any]]:
+        path = self.directory / _INDEX_FILE
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning("HttpCache: unreadable index %s (%s); starting empty", path, e)
+            return {}
+
+    def _save_index(self) -> None:
+        path = self.directory / _INDEX_FILE
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._index), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _body_path(self, key: str) -> pathlib.Path:
+        return self.directory / f"{key}.body"
+
+    def _cleaned_path(self, key: str, variant: str = "") -> pathlib.Path:
+        suffix = f".{hashlib.sha256(variant.encode('utf-8')).hexdigest()[:16]}" if variant else ""
+        return self.directory / f"{key}{suffix}.cleaned.json"
+
+    def _touch(self, key: str) -> None:
+        self._index[key]["accessed"] = time.time_ns()
+        self._save_index()
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(e.get("size", 0) for e in self._index.values())
+
+    def validators(self, url: str) -> dict[str, str]:
+        """Conditional request headers for `url` (empty if nothing is cached)."""
+        entry = self._index.get(self.key(url))
+        if not entry or not self._body_path(self.key(url)).exists():
+            return {}
+        headers: dict[str, str] = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def load_body(self, url: str) -> Optional[str]:
+        """Return the cached body for `url` and mark it as recently used, or None."""
+        key = self.key(url)
+        if key not in self._index:
+            return None
+        try:
+            body = self._body_path(key).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            self._drop(key)
+            self._save_index()
+            return None
+        self._touch(key)
+        return body
+
+    def store(self, url: str, body: str, *, etag: Optional[str], last_modified: Optional[str]) -> None:
+        """Cache `body` with its validators; any previously cleaned records for `url` are discarded."""
+        key = self.key(url)
+        self._drop(key)
+        data = body.encode("utf-8")
+        self._body_path(key).write_bytes(data)
+        self._index[key] = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "size": len(data),
+            "accessed": time.time_ns(),
+        }
+        self._evict(keep=key)
+        self._save_index()
+
+    def store_cleaned(self, url: str, records: Sequence[dict[str, Any]], variant: str = "") -> None:
+        """
+        Keep the cleaned records (a list or CleanedTable) derived from the cached body so a 304 can skip
+        cleaning. `variant` tells apart records read from the same page with another locator or model.
+        """
+        key = self.key(url)
+        if key not in self._index:
+            return
+        data = json.dumps(list(records), ensure_ascii=False, default=json_default).encode("utf-8")
+        self._cleaned_path(key, variant).write_bytes(data)
+        entry = self._index[key]
+        sizes = entry.setdefault("cleaned_sizes", {})
+        entry["size"] = entry.get("size", 0) - sizes.get(variant, 0) + len(data)
+        sizes[variant] = len(data)
+        self._evict(keep=key)
+        self._save_index()
+
+    def load_cleaned(self, url: str, variant: str = "") -> Optional[list[dict[str, Any]]]:
+        """Return the cleaned records stored for `url` (and `variant`), or None."""
+        key = self.key(url)
+        if key not in self._index:
+            return None
+        try:
+            records = json.loads(self._cleaned_path(key, variant).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        self._touch(key)
+        return records
+
+    def _drop(self, key: str) -> None:
+        self._index.pop(key, None)
+        self._body_path(key).unlink(missing_ok=True)
+        for path in self.directory.glob(f"{key}*.cleaned.json"):
+            path.unlink(missing_ok=True)
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        total = self.total_bytes
+        for key, entry in sorted(self._index.items(), key=lambda kv: kv[1].get("accessed", 0)):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= entry.get("size", 0)
+            logger.info("HttpCache: evicting %s", entry.get("url"))
+            self._drop(key)
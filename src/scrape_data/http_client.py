@@ -0,0 +1,110 @@
+"""Shared keep-alive async HTTP client used by all static page fetches."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import aiohttp
+
+from scrape_data.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HttpStatusError(aiohttp.ClientError):
+    """Raised for error/retryable HTTP statuses so `retry_async` can react to them."""
+
+    def __init__(self, url: str, status: int) -> None:
+        super().__init__(f"HTTP {status} for {url}")
+        self.url = url
+        self.status = status
+
+
+@dataclass
+class HttpResponse:
+    """
+    A fully read response.
+
+    Args:
+        url: Final URL after redirects.
+        status: HTTP status code.
+        headers: Response headers (case-insensitive mapping).
+        body: Decoded (gzip/deflate/br already removed) response body bytes.
+        encoding: Charset taken from Content-Type, if any.
+    """
+    url: str
+    status: int
+    headers: Any = field(default_factory=dict)
+    body: bytes = b""
+    encoding: Optional[str] = None
+
+    def text(self) -> str:
+        """Decode the body with the response charset, falling back to UTF-8."""
+        return self.body.decode(self.encoding or "utf-8", errors="replace")
+
+
+class HttpClient:
+    """
+    Async context manager around one aiohttp ClientSession.
+
+    - A single TCP connector pools keep-alive connections, so sockets and TLS sessions
+      are reused across requests and hosts are capped at `limit_per_host` connections.
+    - gzip/deflate (and br when Brotli is installed) responses are decoded transparently.
+    - All requests carry settings.USER_AGENT unless overridden per call.
+    """
+
+    def __init__(
+        self,
+        *,
+        limit: int = settings.HTTP_MAX_CONNECTIONS,
+        limit_per_host: int = settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+        timeout_s: float = settings.HTTP_TIMEOUT_S,
+        keepalive_s: float = settings.HTTP_KEEPALIVE_S,
+    ) -> None:
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout_s = timeout_s
+        self.keepalive_s = keepalive_s
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> HttpClient:
+        self._open()
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.close()
+
+    def _open(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_s,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout_s),
+                headers={"User-Agent": settings.USER_AGENT},
+                auto_decompress=True,
+            )
+        return self._session
+
+    async def get(self, url: str, headers: Optional[dict[str, str]] = None) -> HttpResponse:
+        """GET `url` on a pooled connection and read the whole body."""
+        session = self._open()
+        async with session.get(url, headers=headers) as resp:
+            body = await resp.read()
+            return HttpResponse(
+                url=str(resp.url),
+                status=resp.status,
+                headers=resp.headers,
+                body=body,
+                encoding=resp.charset,
+            )
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,104 @@
+"""Streaming JSON Lines writer: one record per line, fast serializer when available, optional gzip/zstd."""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, Union, cast
+
+from .cleaned_table import CleanedTable, json_default, python_columns
+
+logger = logging.getLogger(__name__)
+
+JSONL_COMPRESSIONS = ("none", "gzip", "zstd")
+# File suffix appended after ".jsonl" for each codec
+JSONL_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+# Rows converted and written per batch; bounds memory for large tables
+CHUNK_ROWS = 10_000
+_BUFFER_BYTES = 1 << 20
+
+
+def _stdlib_dumps(record: dict[str, Any]) -> bytes:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=json_default).encode("utf-8")
+
+
+def get_serializer() -> Callable[[dict[str, Any]], bytes]:
+    """Return orjson.dumps when orjson is installed, else a compact stdlib json serializer."""
+    try:
+        import orjson  # type: ignore
+    except ImportError:
+        return _stdlib_dumps
+
+    option = orjson.OPT_SERIALIZE_NUMPY
+
+    def _orjson_dumps(record: dict[str, Any]) -> bytes:
+        return orjson.dumps(record, default=json_default, option=option)
+
+    return _orjson_dumps
+
+
+@contextmanager
+def open_output(file_path: str, compression: str = "none", append: bool = False) -> Iterator[BinaryIO]:
+    """
+    Open `file_path` for buffered binary writing, compressing with gzip or zstd if asked.
+    With `append`, data is added after the existing content (a new gzip member / zstd frame).
+    """
+    if compression not in JSONL_COMPRESSIONS:
+        raise ValueError(f"Unsupported jsonl compression: {compression}. Choose one of {JSONL_COMPRESSIONS}.")
+    file_mode = "ab" if append else "wb"
+    if compression == "gzip":
+        with gzip.open(file_path, file_mode, compresslevel=6) as f:
+            yield f  # type: ignore[misc]
+        return
+    with open(file_path, file_mode, buffering=_BUFFER_BYTES) as raw:
+        if compression == "zstd":
+            try:
+                import zstandard  # type: ignore
+            except ImportError as e:
+                raise ImportError("zstd-compressed jsonl needs the zstandard package") from e
+            with zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=False) as f:
+                yield f
+        else:
+            yield cast(BinaryIO, raw)
+
+
+def _chunks(rows: Union[CleanedTable, Iterable[dict[str, Any]]]) -> Iterator[list[dict[str, Any]]]:
+    """Yield rows in batches of CHUNK_ROWS; tables are converted one slice of columns at a time."""
+    if isinstance(rows, CleanedTable):
+        frame = rows.frame
+        columns = list(frame.columns)
+        for start in range(0, len(frame), CHUNK_ROWS):
+            values = python_columns(frame.iloc[start:start + CHUNK_ROWS])
+            yield [dict(zip(columns, row, strict=True)) for row in zip(*values, strict=True)]
+        return
+    batch: list[dict[str, Any]] = []
+    for record in rows:
+        batch.append(record)
+        if len(batch) >= CHUNK_ROWS:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_jsonl(
+    rows: Union[CleanedTable, Iterable[dict[str, Any]]],
+    file_path: str,
+    compression: str = "none",
+    append: bool = False,
+) -> int:
+    """
+    Stream `rows` (a CleanedTable, a list, or any iterable/generator of dicts) to `file_path`
+    as JSON Lines, one batch at a time, so memory stays flat as the table grows.
+    With `append`, the lines are added to an existing file instead of replacing it.
+    Returns the number of records written.
+    """
+    dumps = get_serializer()
+    count = 0
+    with open_output(file_path, compression, append) as f:
+        for batch in _chunks(rows):
+            f.write(b"\n".join(map(dumps, batch)) + b"\n")
+            count += len(batch)
+    logger.info("write_jsonl: wrote %d records to %s", count, file_path)
+    return count
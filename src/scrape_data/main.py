@@ -4,13 +4,18 @@ from __future__ import annotations
 import sys
 import logging
 import argparse
-import asyncio
+import time
 from typing import Optional
 import json
-from . import clean_data, scrape_web_data, visualize
-from . import static_models, dynamic_models, save_scraped_data
+from . import visualize
+from . import static_models, dynamic_models, pipeline, save_scraped_data, staged
 import shutil
 from .config import settings
+from .http_cache import HttpCache
+from .read_api import ReadApi, SnapshotCache
+from .runner import Runner, run
+from .scheduler import Scheduler
+from .targets import load_targets, select_targets
 
 
 logger = logging.getLogger(__name__)
@@ -50,21 +55,117 @@ def generate_mermaid_graphviz(visualizer, schema_dict) -> None:
         logger.warning("Graphviz diagram was not created.")
 
 
-def run_static_pipeline(visualizer, schema_json_string) -> None:
-    """scrape -> process/validate -> visualize (static)."""
-    logger.info("--- Starting Static Data Pipeline ---")
-    statics_raw_html: Optional[str] = asyncio.run(
-        scrape_web_data.fetch_static_data(settings.URL_STATIC)
+async def run_pipeline(
+    mode: str,
+    visualizer,
+    schema_dict,
+    file_path: Optional[str] = None,
+    file_format: str = "json",
+    compression: Optional[str] = None,
+    dedup: Optional[bool] = None,
+    cdc: Optional[bool] = None,
+    runner: Optional[Runner] = None,
+) -> pipeline.PipelineArtifact:
+    """
+    scrape once -> process/validate -> save -> visualize, sharing the fetched HTML across stages.
+    With a `runner`, its shared HTTP client, browser pool and cache are used.
+    """
+    logger.info("--- Starting %s Data Pipeline ---", mode.capitalize())
+    if runner is not None:
+        cache, resources = runner.cache, runner.resources()
+    else:
+        cache, resources = _http_cache(), {}
+    return await pipeline.run_pipeline(
+        mode,
+        file_path,
+        file_format,
+        visualize=lambda: generate_mermaid_graphviz(visualizer, schema_dict),
+        cache=cache if mode == "static" else None,
+        compression=compression,
+        dedup=dedup,
+        cdc_enabled=cdc,
+        **resources,
     )
-    clean_data.clean_static_data(statics_raw_html)
-    generate_mermaid_graphviz(visualizer, schema_json_string)
 
 
-async def run_dynamic_pipeline(visualizer, schema_json_string) -> None:
-    """scrape (async) -> process/validate -> visualize (dynamic)."""
-    logger.info("--- Starting Dynamic Data Pipeline ---")
-    await scrape_web_data.fetch_dynamic_table_content(settings.URL_DYNAMIC)
-    generate_mermaid_graphviz(visualizer, schema_json_string)
+async def run_registry(
+    names: Optional[list[str]] = None,
+    concurrency: Optional[int] = None,
+    dedup: Optional[bool] = None,
+    cdc: Optional[bool] = None,
+    runner: Optional[Runner] = None,
+    staged_run: Optional[bool] = None,
+) -> list[pipeline.TargetResult]:
+    """
+    Run the named registry targets (all when None) concurrently and log the per-target summary.
+    With a `runner`, every target shares its HTTP client, browser pool and cache. With `staged_run`
+    (STAGED_ENABLED when None) fetching, cleaning and writing overlap as separate stages, cleaning
+    in a process pool (see staged.run_staged).
+    """
+    targets = select_targets(load_targets(), names)
+    if runner is not None:
+        cache, resources = runner.cache, runner.resources()
+    else:
+        cache, resources = _http_cache(), {}
+    start = time.perf_counter()
+    if settings.STAGED_ENABLED if staged_run is None else staged_run:
+        results = await staged.run_staged(
+            targets, fetch_workers=concurrency, cache=cache, dedup=dedup, cdc_enabled=cdc, **resources
+        )
+    else:
+        results = await pipeline.run_targets(
+            targets, concurrency, cache, dedup=dedup, cdc_enabled=cdc, **resources
+        )
+    logger.info("Run summary:\n%s", pipeline.format_summary(results, time.perf_counter() - start))
+    return results
+
+
+async def serve(
+    names: Optional[list[str]] = None,
+    interval: Optional[float] = None,
+    jitter: Optional[float] = None,
+    concurrency: Optional[int] = None,
+    dedup: Optional[bool] = None,
+    cdc: Optional[bool] = None,
+    runner: Optional[Runner] = None,
+) -> Scheduler:
+    """
+    Run the named registry targets (all when None) on their intervals until SIGTERM/SIGINT,
+    keeping the runner's HTTP client, browser and cache warm between ticks.
+    """
+    targets = select_targets(load_targets(), names)
+    if runner is None:
+        async with Runner(cache=_http_cache()) as own:
+            return await serve(names, interval, jitter, concurrency, dedup, cdc, runner=own)
+    scheduler = Scheduler(
+        targets, runner, interval=interval, jitter=jitter, concurrency=concurrency, dedup=dedup, cdc_enabled=cdc
+    )
+    await scheduler.serve()
+    return scheduler
+
+
+async def serve_read_api(
+    names: Optional[list[str]] = None,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    ttl: Optional[float] = None,
+    runner: Optional[Runner] = None,
+) -> ReadApi:
+    """
+    Serve the latest cleaned snapshot of the named registry targets (all when None) over HTTP until
+    SIGTERM/SIGINT; stale snapshots are refreshed with the runner's HTTP client, browser and cache.
+    """
+    targets = select_targets(load_targets(), names)
+    if runner is None:
+        async with Runner(cache=_http_cache()) as own:
+            return await serve_read_api(names, host, port, ttl, runner=own)
+    api = ReadApi(SnapshotCache(targets, runner, ttl))
+    await api.serve(host, port)
+    return api
+
+
+def _http_cache() -> Optional[HttpCache]:
+    return HttpCache() if settings.HTTP_CACHE_ENABLED else None
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -73,9 +174,28 @@ def _build_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         "--mode",
-        choices=["static", "dynamic"],
+        choices=["static", "dynamic", "all"],
         default="static",
-        help="Which pipeline to run (default: static).",
+        help="Which pipeline to run (default: static); 'all' runs every registered target concurrently.",
+    )
+    parser.add_argument(
+        "--targets",
+        nargs="+",
+        default=None,
+        metavar="NAME",
+        help="Run these registered targets concurrently (see TARGETS / TARGETS_FILE).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Maximum targets in flight for --mode all / --targets (default: TARGET_CONCURRENCY).",
+    )
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help="--mode all / --targets: overlap fetching, cleaning (in a process pool) and writing "
+        "through bounded queues.",
     )
     parser.add_argument(
         "--file_path",
@@ -85,29 +205,169 @@ def _build_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         "--file_format",
-        choices=["json", "csv"],
+        choices=list(save_scraped_data.FILE_FORMATS),
         default="json",
-        help="File format to save the cleaned data.",
+        help="File format to save the cleaned data ('parquet' and 'feather' need pyarrow; "
+        "'sqlite' appends a snapshot to a history database).",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=list(save_scraped_data.COMPRESSIONS),
+        default=None,
+        help="Compression codec (jsonl: none/gzip/zstd; parquet/feather: zstd/snappy/lz4/gzip/none). "
+        "Defaults to JSONL_COMPRESSION or OUTPUT_COMPRESSION.",
+    )
+    parser.add_argument(
+        "--no_dedup",
+        action="store_true",
+        help="Always clean, save and visualize, even when the data hashes like the last saved run.",
+    )
+    parser.add_argument(
+        "--cdc",
+        action="store_true",
+        help="Dynamic mode: also append rows changed since the previous snapshot to <file_path>.delta.jsonl.",
     )
     return parser
 
 
+def _build_serve_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="scrape-data serve",
+        description="Keep running registered targets on their intervals until SIGTERM/SIGINT.",
+    )
+    parser.add_argument(
+        "--targets",
+        nargs="+",
+        default=None,
+        metavar="NAME",
+        help="Registered targets to schedule (default: all).",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=None,
+        help="Seconds between runs of targets without their own interval (default: SCHEDULE_INTERVAL_S).",
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=None,
+        help="Random shift of each run as a fraction of its interval (default: SCHEDULE_JITTER).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Maximum targets running at once (default: TARGET_CONCURRENCY).",
+    )
+    parser.add_argument(
+        "--no_dedup",
+        action="store_true",
+        help="Always clean and save, even when the data hashes like the last saved run.",
+    )
+    parser.add_argument(
+        "--cdc",
+        action="store_true",
+        help="Dynamic targets: also append changed rows to <file_path>.delta.jsonl.",
+    )
+    return parser
+
+
+def _build_api_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="scrape-data api",
+        description="Serve the latest cleaned snapshot per target as JSON, CSV or Arrow over HTTP.",
+    )
+    parser.add_argument(
+        "--targets",
+        nargs="+",
+        default=None,
+        metavar="NAME",
+        help="Registered targets to serve (default: all).",
+    )
+    parser.add_argument("--host", default=None, help="Interface to listen on (default: API_HOST).")
+    parser.add_argument("--port", type=int, default=None, help="Port to listen on (default: API_PORT).")
+    parser.add_argument(
+        "--ttl",
+        type=float,
+        default=None,
+        help="Seconds a snapshot is served before the next request refreshes it (default: API_TTL_S).",
+    )
+    return parser
+
+
+def api_main(argv: Optional[list[str]] = None) -> int:
+    """`scrape-data api`: the read API server."""
+    args = _build_api_parser().parse_args(argv)
+    try:
+        run(
+            lambda runner: serve_read_api(args.targets, args.host, args.port, args.ttl, runner=runner),
+            cache=_http_cache(),
+        )
+        return 0
+    except Exception as e:
+        logger.exception("Read API failed: %s", e)
+        return 1
+
+
+def serve_main(argv: Optional[list[str]] = None) -> int:
+    """`scrape-data serve` / `scrape-data daemon`: the scheduler daemon."""
+    args = _build_serve_parser().parse_args(argv)
+    try:
+        run(
+            lambda runner: serve(
+                args.targets, args.interval, args.jitter, args.concurrency,
+                dedup=False if args.no_dedup else None, cdc=True if args.cdc else None, runner=runner,
+            ),
+            cache=_http_cache(),
+        )
+        return 0
+    except Exception as e:
+        logger.exception("Scheduler failed: %s", e)
+        return 1
+
+
 def main(argv: Optional[list[str]] = None) -> int:
-    """Console entry point (no positional args expected by setuptools)."""
+    """
+    Console entry point (no positional args expected by setuptools); `serve`/`daemon` start the
+    scheduler and `api` the read API.
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in ("serve", "daemon"):
+        return serve_main(argv[1:])
+    if argv and argv[0] == "api":
+        return api_main(argv[1:])
     parser = _build_parser()
     args = parser.parse_args(argv)
 
+    dedup = False if args.no_dedup else None
+    cdc = True if args.cdc else None
+    staged_run = True if args.staged else None
+
     try:
-        save_scraped_data.main(args.mode, args.file_path, args.file_format)
-        static_vis, static_schema = static_model()
-        dynamic_vis, dynamic_schema = dynamic_model()
+        # one event loop, HTTP client and browser for the whole run (see runner.Runner)
+        if args.mode == "all" or args.targets:
+            results = run(
+                lambda runner: run_registry(
+                    args.targets, args.concurrency, dedup, cdc, runner=runner, staged_run=staged_run
+                ),
+                cache=_http_cache(),
+            )
+            return 0 if results and all(r.ok for r in results) else 1
 
         if args.mode == "static":
-            run_static_pipeline(static_vis, static_schema)
+            visualizer, schema_dict = static_model()
         else:
-            asyncio.run(run_dynamic_pipeline(dynamic_vis, dynamic_schema))
+            visualizer, schema_dict = dynamic_model()
 
-        return 0
+        artifact = run(
+            lambda runner: run_pipeline(
+                args.mode, visualizer, schema_dict, args.file_path, args.file_format, args.compression,
+                dedup=dedup, cdc=cdc, runner=runner,
+            ),
+            cache=_http_cache() if args.mode == "static" else None,
+        )
+        return 0 if artifact.records or artifact.unchanged else 1
     except Exception as e:
         logger.exception("Pipeline failed: %s", e)
         return 1
@@ -0,0 +1,411 @@
+"""Staged pipeline: fetch a page once, then clean, save and visualize that same artifact."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Union
+
+from . import cdc, clean_data, save_scraped_data, scrape_web_data
+from .cleaned_table import CleanedTable
+from .config import settings
+from .dedup import RunManifest, fragment_digest, records_digest
+from .browser_pool import BrowserPool
+from .http_cache import HttpCache
+from .http_client import HttpClient
+from .table_extractor import TableLocator, extract_table_fragment
+from .targets import Target
+
+logger = logging.getLogger(__name__)
+
+# What the clean stage hands on: a columnar CleanedTable, or plain records
+Records = Union[CleanedTable, list[dict[str, Any]]]
+
+
+@dataclass
+class PipelineArtifact:
+    """
+    State handed from one pipeline stage to the next.
+
+    Args:
+        mode: 'static' or 'dynamic'.
+        url: The page the raw content was fetched from.
+        raw: Raw content returned by the fetch stage (fetched exactly once per run): page HTML,
+            or for dynamic pages the in-page header/row arrays or the rows read from the JSON feed.
+        records: Cleaned rows produced by the clean stage: a columnar CleanedTable, or the
+            plain records reused from the HTTP cache.
+        saved_path: Final file path written by the save stage.
+        not_modified: True when a static page was revalidated with HTTP 304.
+        fragment: The static page's table HTML, extracted once when dedup hashes it; the clean
+            stage then parses only this fragment instead of the whole page.
+        fragment_hash: sha256 of the fetched table (see dedup.fragment_digest), when dedup is on.
+        records_hash: sha256 of the cleaned records, when dedup is on and cleaning ran.
+        unchanged: True when the run matched the last saved one and clean/save/visualize were skipped.
+        changes: Rows inserted/updated/deleted since the previous dynamic snapshot, when CDC is on.
+        target: Registry target supplying the model, table locator and selectors, if any.
+    """
+    mode: str
+    url: str
+    raw: Optional[clean_data.DynamicRaw] = None
+    records: Optional[Records] = None
+    saved_path: Optional[str] = None
+    not_modified: bool = False
+    fragment: Optional[str] = None
+    fragment_hash: Optional[str] = None
+    records_hash: Optional[str] = None
+    unchanged: bool = False
+    changes: Optional[cdc.ChangeSet] = None
+    target: Optional[Target] = None
+
+
+async def fetch_stage(
+    mode: str,
+    url: Optional[str] = None,
+    cache: Optional[HttpCache] = None,
+    target: Optional[Target] = None,
+    *,
+    client: Optional[HttpClient] = None,
+    pool: Optional[BrowserPool] = None,
+) -> PipelineArtifact:
+    """
+    Fetch the raw HTML for `mode` a single time and wrap it in a PipelineArtifact.
+    A registry `target` supplies the dynamic wait/table selectors. Pass the run's shared `client`
+    and `pool` (see runner.Runner) to reuse connections and the browser; otherwise each fetch
+    opens its own.
+    """
+    not_modified = False
+    raw: Optional[clean_data.DynamicRaw]
+    if mode == "static":
+        target_url = url or settings.URL_STATIC
+        doc = await scrape_web_data.fetch_static_document(target_url, cache=cache, **_shared(client=client))
+        raw = doc.html if doc else None
+        not_modified = bool(doc and doc.not_modified)
+    elif mode == "dynamic":
+        target_url = url or settings.URL_DYNAMIC
+        options = target.fetch_options() if target is not None else {}
+        raw = await scrape_web_data.fetch_dynamic_table_content(target_url, **options, **_shared(pool=pool))
+    else:
+        raise ValueError(f"Invalid mode: {mode}. Choose 'static' or 'dynamic'.")
+
+    if not raw:
+        logger.error("fetch_stage: nothing fetched from %s", target_url)
+    return PipelineArtifact(mode=mode, url=target_url, raw=raw, not_modified=not_modified, target=target)
+
+
+def _shared(**resources: Any) -> dict[str, Any]:
+    """Only the shared resources actually given, so fetchers keep their own defaults otherwise."""
+    return {name: value for name, value in resources.items() if value is not None}
+
+
+def clean_records(artifact: PipelineArtifact) -> Optional[Records]:
+    """
+    Run the cleaner for the artifact's mode (with its target's model and locator) on the raw content.
+    Pure CPU work with no cache or file access, so it can also run in a worker process.
+    """
+    options: dict[str, Any] = {}
+    if artifact.target is not None:
+        options = {"model": artifact.target.model_class(), "locator": artifact.target.locator}
+    if artifact.mode == "static":
+        if artifact.fragment:
+            # the dedup stage already extracted the located table: clean just that fragment
+            options["locator"] = TableLocator()
+            return clean_data.clean_static_data(artifact.fragment, output="frame", **options)
+        html = artifact.raw if isinstance(artifact.raw, str) else None  # static pages are always HTML
+        return clean_data.clean_static_data(html, output="frame", **options)
+    return clean_data.clean_dynamic_data(artifact.raw, output="frame", **options)
+
+
+def reuse_cleaned(artifact: PipelineArtifact, cache: Optional[HttpCache] = None) -> bool:
+    """
+    When the page was not modified (HTTP 304), load the records cached for it, rebuilt with the
+    cleaning plan's dtypes so the saved schema matches a fresh run; True if it did.
+    """
+    if not (artifact.not_modified and cache is not None):
+        return False
+    cached = cache.load_cleaned(artifact.url, cleaned_variant(artifact))
+    if not cached:
+        return False
+    logger.info("clean_stage: %s not modified; reusing %d cleaned records", artifact.url, len(cached))
+    model = artifact.target.model_class() if artifact.target is not None else None
+    artifact.records = clean_data.restore_table(cached, artifact.mode, model)
+    return True
+
+
+def store_cleaned(artifact: PipelineArtifact, cache: Optional[HttpCache] = None) -> None:
+    """Keep freshly cleaned static records in the HTTP cache for the next 304."""
+    if artifact.records and cache is not None and artifact.mode == "static":
+        cache.store_cleaned(artifact.url, artifact.records, cleaned_variant(artifact))
+
+
+def cleaned_variant(artifact: PipelineArtifact) -> str:
+    """HttpCache variant of the cleaned records: targets reading another table or model of a page get their own."""
+    target = artifact.target
+    if target is None or (not target.model and target.locator is None):
+        return ""
+    return repr((target.model, target.locator))
+
+
+def clean_stage(artifact: PipelineArtifact, cache: Optional[HttpCache] = None) -> PipelineArtifact:
+    """
+    Clean the fetched content in place; leaves records as None when there is nothing to clean.
+    When the page was not modified (HTTP 304) the cleaned records cached for it are reused.
+    """
+    if not artifact.raw or reuse_cleaned(artifact, cache):
+        return artifact
+    artifact.records = clean_records(artifact)
+    store_cleaned(artifact, cache)
+    return artifact
+
+
+def cdc_stage(artifact: PipelineArtifact, file_path: Optional[str] = None) -> PipelineArtifact:
+    """
+    Diff the cleaned dynamic records against the previous snapshot (keyed by the target's cdc_key,
+    else CDC_KEY) and append only the changed rows to the delta stream next to the output file.
+    Tables without the key column are skipped with a warning.
+    """
+    if not artifact.records or artifact.mode != "dynamic":
+        return artifact
+    key = (artifact.target.cdc_key if artifact.target is not None else None) or settings.CDC_KEY
+    records = artifact.records
+    columns = records.columns if isinstance(records, CleanedTable) else list(records[0])
+    if key not in columns:
+        logger.warning("cdc_stage: no %r column in %s; skipping change capture", key, artifact.url)
+        return artifact
+    base_file_path = save_scraped_data.resolve_base_file_path(artifact.mode, file_path)
+    save_scraped_data.prepare_output_dir(base_file_path, "jsonl")
+    artifact.changes = cdc.capture_changes(records, base_file_path, key)
+    return artifact
+
+
+def save_stage(
+    artifact: PipelineArtifact,
+    file_path: Optional[str] = None,
+    file_format: str = "json",
+    compression: Optional[str] = None,
+) -> PipelineArtifact:
+    """Save the cleaned records to disk, creating the output directory if needed."""
+    if not artifact.records:
+        return artifact
+    base_file_path = save_scraped_data.resolve_base_file_path(artifact.mode, file_path)
+    save_scraped_data.prepare_output_dir(base_file_path, file_format)
+    artifact.saved_path = save_scraped_data.save_records(
+        artifact.records, base_file_path, file_format, compression, artifact.mode
+    )
+    return artifact
+
+
+async def run_pipeline(
+    mode: str,
+    file_path: Optional[str] = None,
+    file_format: str = "json",
+    *,
+    url: Optional[str] = None,
+    visualize: Optional[Callable[[], None]] = None,
+    cache: Optional[HttpCache] = None,
+    compression: Optional[str] = None,
+    dedup: Optional[bool] = None,
+    cdc_enabled: Optional[bool] = None,
+    target: Optional[Target] = None,
+    client: Optional[HttpClient] = None,
+    pool: Optional[BrowserPool] = None,
+) -> PipelineArtifact:
+    """
+    Run fetch -> clean -> save -> visualize for one mode, fetching the page only once.
+    `visualize` is an optional callback run after a successful save.
+    With a static `cache`, the page is revalidated and a 304 reuses the last cleaned records.
+    With `dedup` (DEDUP_ENABLED when None), a fetched table that hashes like the last saved run
+    skips clean/save/visualize, and cleaned records that hash the same skip save/visualize.
+    With `cdc_enabled` (CDC_ENABLED when None), dynamic runs also append their row-level delta.
+    A registry `target` supplies the model, table locator and dynamic selectors; `client`/`pool`
+    are the run's shared HTTP client and browser pool.
+    """
+    artifact = await fetch_stage(mode, url, cache, target, client=client, pool=pool)
+    output = dedup_output(artifact, file_path, file_format, compression, dedup)
+    if output is not None and fragment_unchanged(artifact, output):
+        return artifact
+
+    clean_stage(artifact, cache)
+    if output is not None and records_unchanged(artifact, output):
+        return artifact
+
+    write_stage(artifact, file_path, file_format, compression, output=output, cdc_enabled=cdc_enabled)
+    if artifact.records and visualize is not None:
+        visualize()
+    return artifact
+
+
+def dedup_output(
+    artifact: PipelineArtifact,
+    file_path: Optional[str] = None,
+    file_format: str = "json",
+    compression: Optional[str] = None,
+    dedup: Optional[bool] = None,
+) -> Optional[str]:
+    """
+    Output file the run would write, used as its key in the dedup manifest; None when `dedup`
+    (DEDUP_ENABLED when None) is off or nothing was fetched.
+    """
+    if not artifact.raw or not (settings.DEDUP_ENABLED if dedup is None else dedup):
+        return None
+    base_file_path = save_scraped_data.resolve_base_file_path(artifact.mode, file_path)
+    return save_scraped_data.final_output_path(base_file_path, file_format, compression)
+
+
+def fragment_unchanged(artifact: PipelineArtifact, output: str) -> bool:
+    """Hash the fetched table; True (artifact marked unchanged) when it matches the last run saved to `output`."""
+    locator = _static_locator(artifact)
+    if locator is not None and isinstance(artifact.raw, str):
+        artifact.fragment = extract_table_fragment(artifact.raw, locator)
+    artifact.fragment_hash = fragment_digest(artifact.mode, artifact.raw, locator, artifact.fragment)
+    if RunManifest.for_output(output).unchanged(output, fragment=artifact.fragment_hash):
+        _no_change(artifact, output, artifact.fragment_hash, "clean/save/visualize")
+        return True
+    return False
+
+
+def _static_locator(artifact: PipelineArtifact) -> Optional[TableLocator]:
+    """The table a static artifact is cleaned from (its target's locator or the model's default)."""
+    if artifact.mode != "static":
+        return None
+    if artifact.target is None:
+        return clean_data.static_locator()
+    return clean_data.static_locator(artifact.target.model_class(), artifact.target.locator)
+
+
+def records_unchanged(artifact: PipelineArtifact, output: str) -> bool:
+    """
+    Hash the cleaned records (unless already hashed); True (artifact marked unchanged) when they
+    match the last run saved to `output`.
+    """
+    if not artifact.records:
+        return False
+    if artifact.records_hash is None:
+        artifact.records_hash = records_digest(artifact.records)
+    if RunManifest.for_output(output).unchanged(output, records=artifact.records_hash):
+        _no_change(artifact, output, artifact.records_hash, "save/visualize")
+        return True
+    return False
+
+
+def write_stage(
+    artifact: PipelineArtifact,
+    file_path: Optional[str] = None,
+    file_format: str = "json",
+    compression: Optional[str] = None,
+    *,
+    output: Optional[str] = None,
+    cdc_enabled: Optional[bool] = None,
+) -> PipelineArtifact:
+    """
+    Everything that touches the output directory: the CDC delta (when `cdc_enabled`, CDC_ENABLED
+    when None), the saved file, and, when dedup gave an `output`, the run's entry in the manifest.
+    The manifest is re-read here so runs writing to the same directory do not drop each other's entries.
+    """
+    if settings.CDC_ENABLED if cdc_enabled is None else cdc_enabled:
+        cdc_stage(artifact, file_path)
+    save_stage(artifact, file_path, file_format, compression)
+    if output is not None and artifact.saved_path and artifact.records_hash:
+        RunManifest.for_output(artifact.saved_path).record(
+            artifact.saved_path, fragment=artifact.fragment_hash, records=artifact.records_hash
+        )
+    return artifact
+
+
+def _no_change(artifact: PipelineArtifact, target: str, digest: Optional[str], skipped: str) -> PipelineArtifact:
+    artifact.unchanged = True
+    artifact.saved_path = target
+    logger.info("run_pipeline: no change for %s (sha256 %s); skipped %s", target, digest, skipped)
+    return artifact
+
+
+@dataclass
+class TargetResult:
+    """
+    Outcome of one target in a multi-target run.
+
+    Args:
+        name: Target name.
+        mode: 'static' or 'dynamic'.
+        status: 'ok', 'unchanged' (dedup skipped the run), 'empty' (nothing cleaned) or 'failed'.
+        seconds: Wall time of the target's own pipeline (waiting for a concurrency slot excluded).
+        rows: Number of cleaned rows (0 when unchanged, empty or failed).
+        saved_path: Output file written (or left as is when unchanged).
+        error: Exception text for failed targets.
+    """
+    name: str
+    mode: str
+    status: str
+    seconds: float
+    rows: int = 0
+    saved_path: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("ok", "unchanged")
+
+
+def target_result(target: Target, artifact: PipelineArtifact, seconds: float) -> TargetResult:
+    """TargetResult for a target whose pipeline finished (failures are reported by the caller)."""
+    if artifact.unchanged:
+        return TargetResult(target.name, target.mode, "unchanged", seconds, saved_path=artifact.saved_path)
+    if not artifact.records:
+        return TargetResult(target.name, target.mode, "empty", seconds)
+    return TargetResult(
+        target.name, target.mode, "ok", seconds, rows=len(artifact.records), saved_path=artifact.saved_path
+    )
+
+
+async def run_target(target: Target, cache: Optional[HttpCache] = None, **kwargs: Any) -> PipelineArtifact:
+    """Run the pipeline for one registry target (its URL, model, locator and sink)."""
+    return await run_pipeline(
+        target.mode,
+        target.base_file_path,
+        target.sink,
+        url=target.url,
+        cache=cache if target.mode == "static" else None,
+        compression=target.compression,
+        target=target,
+        **kwargs,
+    )
+
+
+async def run_targets(
+    targets: list[Target],
+    concurrency: Optional[int] = None,
+    cache: Optional[HttpCache] = None,
+    **kwargs: Any,
+) -> list[TargetResult]:
+    """
+    Run `targets` concurrently with at most `concurrency` (TARGET_CONCURRENCY when None) in flight.
+    A failing target is logged and reported; it never cancels the others. Results keep input order.
+    """
+    semaphore = asyncio.Semaphore(concurrency or settings.TARGET_CONCURRENCY)
+
+    async def one(target: Target) -> TargetResult:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                artifact = await run_target(target, cache, **kwargs)
+            except Exception as e:
+                logger.exception("run_targets: %s failed: %s", target.name, e)
+                return TargetResult(target.name, target.mode, "failed", time.perf_counter() - start, error=str(e))
+            return target_result(target, artifact, time.perf_counter() - start)
+
+    return list(await asyncio.gather(*(one(t) for t in targets)))
+
+
+def format_summary(results: list[TargetResult], elapsed: Optional[float] = None) -> str:
+    """Plain-text run summary: one line per target with status, rows and time."""
+    width = max([len(r.name) for r in results] + [6])
+    lines = [f"{'target':<{width}}  {'mode':<7}  {'status':<9}  {'rows':>7}  {'seconds':>8}  output"]
+    for r in results:
+        detail = r.saved_path or r.error or ""
+        lines.append(f"{r.name:<{width}}  {r.mode:<7}  {r.status:<9}  {r.rows:>7}  {r.seconds:>8.2f}  {detail}")
+    ok = sum(r.ok for r in results)
+    total = f"{ok}/{len(results)} targets ok"
+    if elapsed is not None:
+        total += f" in {elapsed:.2f}s (sum of target times {sum(r.seconds for r in results):.2f}s)"
+    lines.append(total)
+    return "\n".join(lines)
@@ -0,0 +1,296 @@
+"""Read API: the latest cleaned snapshot per target, kept in memory with a TTL and served over HTTP."""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import io
+import logging
+import signal
+import time
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from typing import Any, Optional
+
+import pandas as pd  # type: ignore
+from aiohttp import web
+
+from .cleaned_table import CleanedTable
+from .config import settings
+from .dedup import records_digest
+from .jsonl_writer import get_serializer
+from .pipeline import PipelineArtifact, clean_records, fetch_stage, reuse_cleaned, store_cleaned
+from .runner import Runner
+from .targets import Target
+
+logger = logging.getLogger(__name__)
+
+API_FORMATS = {
+    "json": "application/json",
+    "csv": "text/csv; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+STOP_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
+
+@dataclass
+class Snapshot:
+    """
+    One target's cleaned table as served by the API.
+
+    Args:
+        name: Target name.
+        table: The cleaned rows.
+        digest: sha256 of the rows (dedup.records_digest); the ETags are derived from it, so a
+            refresh that cleans to the same rows keeps them valid.
+        fetched_at: Wall-clock time of the last refresh (Last-Modified).
+        refreshed: time.monotonic() of the last refresh (TTL).
+        bodies: Encoded bodies per (format, gzip), built on first request.
+    """
+    name: str
+    table: CleanedTable
+    digest: str
+    fetched_at: float = field(default_factory=time.time)
+    refreshed: float = field(default_factory=time.monotonic)
+    bodies: dict[tuple[str, bool], bytes] = field(default_factory=dict)
+
+    def age(self) -> float:
+        return time.monotonic() - self.refreshed
+
+    def etag(self, fmt: str, gzipped: bool = False) -> str:
+        return f'"{self.digest[:32]}-{fmt}{"-gzip" if gzipped else ""}"'
+
+
+def encode(table: CleanedTable, fmt: str) -> bytes:
+    """Serialize the table as a JSON array of records, CSV, or an Arrow IPC stream (needs pyarrow)."""
+    if fmt == "json":
+        dumps = get_serializer()
+        return b"[" + b",".join(dumps(row) for row in table) + b"]"
+    if fmt == "csv":
+        return table.frame.to_csv(index=False).encode("utf-8")
+    if fmt == "arrow":
+        try:
+            import pyarrow as pa  # type: ignore
+        except ImportError as e:
+            raise ImportError("Arrow responses need pyarrow (pip install '.[arrow]')") from e
+        arrow_table = pa.Table.from_pandas(table.frame, preserve_index=False)
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, arrow_table.schema) as writer:
+            writer.write_table(arrow_table)
+        return sink.getvalue()
+    raise ValueError(f"Unsupported format: {fmt}. Choose one of {tuple(API_FORMATS)}.")
+
+
+class SnapshotCache:
+    """
+    Latest cleaned snapshot per target, refreshed through fetch_stage/clean_records once older than `ttl`.
+
+    Concurrent requests for a stale or missing target share one refresh (request coalescing), and a
+    client going away does not cancel it for the others. When a refresh fails the previous snapshot
+    keeps being served; only a target that never refreshed successfully raises.
+    """
+
+    def __init__(self, targets: list[Target], runner: Runner, ttl: Optional[float] = None) -> None:
+        self.targets = {t.name: t for t in targets}
+        self.runner = runner
+        self.ttl = settings.API_TTL_S if ttl is None else ttl
+        self.refreshes = 0
+        self._snapshots: dict[str, Snapshot] = {}
+        self._refreshing: dict[str, asyncio.Task[Snapshot]] = {}
+
+    def peek(self, name: str) -> Optional[Snapshot]:
+        """The cached snapshot for `name` (possibly stale), without refreshing."""
+        return self._snapshots.get(name)
+
+    async def get(self, name: str) -> Snapshot:
+        """A snapshot younger than the TTL, refreshing it (once, however many callers wait) if needed."""
+        snapshot = self._snapshots.get(name)
+        if snapshot is not None and snapshot.age() < self.ttl:
+            return snapshot
+        task = self._refreshing.get(name)
+        if task is None:
+            task = asyncio.create_task(self._refresh(self.targets[name]))
+            self._refreshing[name] = task
+            task.add_done_callback(lambda _: self._refreshing.pop(name, None))
+        try:
+            return await asyncio.shield(task)
+        except Exception as e:
+            if snapshot is None:
+                raise
+            logger.warning("SnapshotCache: refreshing %s failed (%s); serving the %.0fs old snapshot", name, e, snapshot.age())
+            return snapshot
+
+    async def _refresh(self, target: Target) -> Snapshot:
+        self.refreshes += 1
+        cache = self.runner.cache if target.mode == "static" else None
+        artifact = await fetch_stage(target.mode, target.url, cache, target, **self.runner.resources())
+        if not artifact.raw:
+            raise RuntimeError(f"nothing fetched from {target.url}")
+        previous = self._snapshots.get(target.name)
+        if artifact.not_modified and previous is not None:
+            return _renewed(previous)
+        # HttpCache is only used here on the loop; cleaning and hashing run in a thread so the loop
+        # keeps serving. Records reused on a 304 come back with the plan's dtypes, so digest and ETags hold
+        if reuse_cleaned(artifact, cache):
+            table = _table(artifact.records)
+            digest = await asyncio.to_thread(records_digest, table)
+        else:
+            cleaned = await asyncio.to_thread(_clean_and_hash, artifact)
+            if cleaned is None:
+                raise RuntimeError(f"nothing cleaned from {target.url}")
+            table, digest = cleaned
+            artifact.records = table
+            store_cleaned(artifact, cache)
+        if previous is not None and previous.digest == digest:
+            return _renewed(previous)
+        snapshot = Snapshot(target.name, table, digest)
+        self._snapshots[target.name] = snapshot
+        logger.info("SnapshotCache: %s refreshed (%d rows)", target.name, len(table))
+        return snapshot
+
+    async def body(self, snapshot: Snapshot, fmt: str, gzipped: bool) -> bytes:
+        """The encoded (and optionally gzipped) body, built once per snapshot and format."""
+        key = (fmt, gzipped)
+        if key not in snapshot.bodies:
+            snapshot.bodies[key] = await asyncio.to_thread(_encode_body, snapshot.table, fmt, gzipped)
+        return snapshot.bodies[key]
+
+
+def _renewed(snapshot: Snapshot) -> Snapshot:
+    snapshot.fetched_at, snapshot.refreshed = time.time(), time.monotonic()
+    return snapshot
+
+
+def _table(records: Any) -> CleanedTable:
+    return records if isinstance(records, CleanedTable) else CleanedTable(pd.DataFrame.from_records(records))
+
+
+def _clean_and_hash(artifact: PipelineArtifact) -> Optional[tuple[CleanedTable, str]]:
+    records = clean_records(artifact)
+    if not records:
+        return None
+    table = _table(records)
+    return table, records_digest(table)
+
+
+def _encode_body(table: CleanedTable, fmt: str, gzipped: bool) -> bytes:
+    data = encode(table, fmt)
+    return gzip.compress(data, compresslevel=6) if gzipped else data
+
+
+def _if_none_match(request: web.Request) -> set[str]:
+    header = request.headers.get("If-None-Match", "")
+    return {tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()}
+
+
+def _accepts_gzip(request: web.Request) -> bool:
+    for coding in request.headers.get("Accept-Encoding", "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() == "gzip":
+            return params.replace(" ", "") not in ("q=0", "q=0.0")
+    return False
+
+
+class ReadApi:
+    """
+    aiohttp application over a SnapshotCache.
+
+    Routes:
+        GET /health                  -> {"status": "ok"}
+        GET /targets                 -> registered targets with cache age and row counts
+        GET /targets/{name}          -> latest snapshot; ?format=json|csv|arrow (default json)
+        GET /targets/{name}.{format} -> same, format from the extension
+
+    Snapshot responses carry an ETag per format (a matching If-None-Match gets 304), Last-Modified,
+    Cache-Control max-age for the rest of the TTL, and are gzipped for clients that accept it once
+    at least `gzip_min_bytes` (API_GZIP_MIN_BYTES) long.
+    """
+
+    def __init__(self, cache: SnapshotCache, gzip_min_bytes: Optional[int] = None) -> None:
+        self.cache = cache
+        self.gzip_min_bytes = settings.API_GZIP_MIN_BYTES if gzip_min_bytes is None else gzip_min_bytes
+        self._stopping = asyncio.Event()
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.add_routes([
+            web.get("/health", self.health),
+            web.get("/targets", self.list_targets),
+            web.get(r"/targets/{name:[^{}/.]+}.{fmt:[a-z]+}", self.snapshot),
+            web.get("/targets/{name}", self.snapshot),
+        ])
+        return app
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok"})
+
+    async def list_targets(self, request: web.Request) -> web.Response:
+        entries = []
+        for name, target in self.cache.targets.items():
+            snapshot = self.cache.peek(name)
+            entries.append({
+                "name": name,
+                "mode": target.mode,
+                "url": target.url,
+                "rows": len(snapshot.table) if snapshot else None,
+                "age_s": round(snapshot.age(), 3) if snapshot else None,
+            })
+        return web.json_response(entries)
+
+    async def snapshot(self, request: web.Request) -> web.Response:
+        name = request.match_info["name"]
+        fmt = request.match_info.get("fmt") or request.query.get("format", "json")
+        if name not in self.cache.targets:
+            return web.json_response({"error": f"unknown target {name!r}"}, status=404)
+        if fmt not in API_FORMATS:
+            return web.json_response({"error": f"unsupported format {fmt!r}; use {list(API_FORMATS)}"}, status=400)
+        try:
+            snapshot = await self.cache.get(name)
+        except Exception as e:
+            logger.exception("ReadApi: no snapshot for %s: %s", name, e)
+            return web.json_response({"error": f"no snapshot for {name!r}: {e}"}, status=502)
+
+        headers = {
+            "Vary": "Accept-Encoding",
+            "Last-Modified": formatdate(snapshot.fetched_at, usegmt=True),
+            "Cache-Control": f"max-age={max(0, int(self.cache.ttl - snapshot.age()))}",
+        }
+        if _if_none_match(request) & {snapshot.etag(fmt), snapshot.etag(fmt, True), "*"}:
+            return web.Response(status=304, headers={**headers, "ETag": snapshot.etag(fmt)})
+        try:
+            body = await self.cache.body(snapshot, fmt, False)
+        except ImportError as e:
+            return web.json_response({"error": str(e)}, status=406)
+        gzipped = _accepts_gzip(request) and len(body) >= self.gzip_min_bytes
+        if gzipped:
+            body = await self.cache.body(snapshot, fmt, True)
+            headers["Content-Encoding"] = "gzip"
+        headers["ETag"] = snapshot.etag(fmt, gzipped)
+        headers["Content-Type"] = API_FORMATS[fmt]
+        return web.Response(body=body, headers=headers)
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def serve(self, host: Optional[str] = None, port: Optional[int] = None) -> None:
+        """Listen on host:port (API_HOST/API_PORT) until stop() or SIGTERM/SIGINT."""
+        loop = asyncio.get_running_loop()
+        handled = []
+        for sig in STOP_SIGNALS:
+            try:
+                loop.add_signal_handler(sig, self.stop)
+                handled.append(sig)
+            except (NotImplementedError, RuntimeError):  # Windows, or not the main thread
+                pass
+        app_runner = web.AppRunner(self.app())
+        await app_runner.setup()
+        try:
+            site = web.TCPSite(app_runner, host or settings.API_HOST, port or settings.API_PORT)
+            await site.start()
+            logger.info("ReadApi: serving %d targets on http://%s:%s", len(self.cache.targets),
+                        host or settings.API_HOST, port or settings.API_PORT)
+            await self._stopping.wait()
+        finally:
+            await app_runner.cleanup()
+            for sig in handled:
+                loop.remove_signal_handler(sig)
+        logger.info("ReadApi: stopped after %d refreshes", self.cache.refreshes)
@@ -0,0 +1,105 @@
+"""One event loop per CLI run, owning the shared HTTP client, browser pool and HTTP cache."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from . import scrape_web_data
+from .browser_pool import BrowserPool
+from .config import settings
+from .http_cache import HttpCache
+from .http_client import HttpClient
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Runner:
+    """
+    Async context manager holding the resources every step of a run shares.
+
+    - `client`: one pooled keep-alive HttpClient for all static fetches.
+    - `pool`: one BrowserPool for all dynamic fetches; Chromium is only launched when the first
+      dynamic page is requested, so static-only runs never start a browser.
+    - `cache`: optional HttpCache for static revalidation.
+
+    Everything is opened on `__aenter__` and closed on `__aexit__`, so static and dynamic work
+    scheduled on the same loop (e.g. asyncio.gather of two pipelines) reuses the same connections
+    and browser.
+    """
+
+    def __init__(
+        self,
+        *,
+        headless: bool = settings.HEADLESS,
+        slow_mo_ms: int = settings.SLOW_MO_MS,
+        cache: Optional[HttpCache] = None,
+    ) -> None:
+        self.headless = headless
+        self.slow_mo_ms = slow_mo_ms
+        self.cache = cache
+        self.client = HttpClient()
+        self._pool: Optional[BrowserPool] = None
+
+    async def __aenter__(self) -> Runner:
+        await self.client.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        try:
+            if self._pool is not None:
+                await self._pool.close()
+                self._pool = None
+        finally:
+            await self.client.close()
+
+    @property
+    def pool(self) -> BrowserPool:
+        """The run's BrowserPool, created on first use (Chromium itself starts on the first page)."""
+        if self._pool is None:
+            self._pool = BrowserPool(headless=self.headless, slow_mo_ms=self.slow_mo_ms)
+        return self._pool
+
+    def resources(self) -> dict[str, Any]:
+        """client/pool keyword arguments for pipeline.run_pipeline and run_targets."""
+        return {"client": self.client, "pool": self.pool}
+
+    async def fetch_static(self, url: str = settings.URL_STATIC, **kwargs: Any) -> Optional[str]:
+        """fetch_static_data on the shared client."""
+        return await scrape_web_data.fetch_static_data(url, client=self.client, **kwargs)
+
+    async def fetch_dynamic(
+        self, url: str = settings.URL_DYNAMIC, **kwargs: Any
+    ) -> Optional[scrape_web_data.DynamicContent]:
+        """fetch_dynamic_table_content on the shared browser pool."""
+        return await scrape_web_data.fetch_dynamic_table_content(url, pool=self.pool, **kwargs)
+
+    async def fetch(self, mode: str, url: Optional[str] = None) -> Any:
+        """Raw content for 'static' or 'dynamic' (URL_STATIC / URL_DYNAMIC when `url` is None)."""
+        if mode == "static":
+            return await self.fetch_static(url or settings.URL_STATIC)
+        if mode == "dynamic":
+            return await self.fetch_dynamic(url or settings.URL_DYNAMIC)
+        raise ValueError(f"Invalid mode: {mode}. Choose 'static' or 'dynamic'.")
+
+
+def run(main: Callable[[Runner], Awaitable[T]], **runner_kwargs: Any) -> T:
+    """
+    Run `main(runner)` to completion on a new event loop; the loop, client and browser live for
+    the whole call and are torn down once at the end. This is the only place the CLI entry points
+    start a loop; from async code use `async with Runner() as runner:` instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise RuntimeError("runner.run() cannot be called from a running event loop; use 'async with Runner()'")
+
+    async def _main() -> T:
+        async with Runner(**runner_kwargs) as runner:
+            return await main(runner)
+
+    return asyncio.run(_main())
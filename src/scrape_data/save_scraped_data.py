@@ -1,73 +1,154 @@
 """Script to save cleaned HTML table data from static or dynamic web pages."""
 from . import clean_data
-from . import scrape_web_data
+from .cleaned_table import CleanedTable, json_default
+from .config import settings
+from .jsonl_writer import JSONL_SUFFIXES, write_jsonl
+from .runner import run
+from .snapshot_store import SnapshotStore
 import logging
 import argparse
 import json
 import pathlib
 import pandas
 import os
-import asyncio
+from typing import Iterable, Optional, TextIO, Union
 logging.basicConfig(level=logging.INFO)
 
+CleanedData = Union[list, CleanedTable]
+
+FILE_FORMATS = ("json", "jsonl", "csv", "parquet", "feather", "sqlite")
+# Columnar formats are written with pyarrow (optional dependency: pip install '.[arrow]')
+COLUMNAR_FORMATS = ("parquet", "feather")
+COMPRESSIONS = ("zstd", "snappy", "lz4", "gzip", "none")
+
+def resolve_compression(file_format: str, compression: Optional[str] = None) -> str:
+    """Return `compression`, or the configured default for `file_format` when None."""
+    if compression is not None:
+        return compression
+    return settings.JSONL_COMPRESSION if file_format=="jsonl" else settings.OUTPUT_COMPRESSION
+
+def _write_json_array(f: TextIO, rows: Iterable[dict]) -> None:
+    """Write rows as a JSON array laid out like json.dump(indent=4), one row at a time."""
+    f.write("[")
+    first = True
+    for row in rows:
+        f.write("\n    " if first else ",\n    ")
+        f.write(json.dumps(row, indent=4, ensure_ascii=False, default=json_default).replace("\n", "\n    "))
+        first = False
+    f.write("]" if first else "\n]")
+
+def _write_columnar(frame: pandas.DataFrame, file_path: str, file_format: str, compression: str) -> None:
+    """Write a Parquet or Arrow IPC (Feather v2) file with the given codec."""
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unsupported compression: {compression}. Choose one of {COMPRESSIONS}.")
+    if file_format=="parquet":
+        frame.to_parquet(file_path, engine="pyarrow", compression=None if compression=="none" else compression, index=False)
+    else:
+        if compression in ("snappy", "gzip"):
+            raise ValueError(f"Feather/Arrow IPC supports zstd, lz4 or none, not {compression}.")
+        frame.reset_index(drop=True).to_feather(file_path, compression="uncompressed" if compression=="none" else compression)
+
 def save_cleaned_data_to_file(
-        data: list,
+        data: CleanedData,
         file_path: str, 
-        file_format:str) -> None:
+        file_format:str,
+        compression: Optional[str] = None,
+        mode: Optional[str] = None) -> None:
     """
-    Saves the cleaned static population data to a specified file format (JSON or CSV).
+    Saves the cleaned static population data to a specified file format (JSON, JSON Lines, CSV, Parquet or Feather),
+    or appends it as a new snapshot to a SQLite database.
     
     Args:
+        data: Cleaned records, or a CleanedTable whose DataFrame is written without copying.
+            For jsonl any iterable of dicts (e.g. a generator) is streamed as it is consumed.
         file_path: The base path where the cleaned data will be saved (e.g., 'data/output').
-        file_format: The file format ('json' or 'csv').
+        file_format: The file format ('json', 'jsonl', 'csv', 'parquet', 'feather' or 'sqlite').
+        compression: Codec for jsonl ('none', 'gzip', 'zstd') or parquet/feather ('zstd', 'snappy',
+            'lz4', 'gzip', 'none'); None uses JSONL_COMPRESSION / OUTPUT_COMPRESSION. Ignored for sqlite.
+        mode: 'static' or 'dynamic', selecting the sqlite row table (inferred from the columns if None).
     """
-    
+    compression = resolve_compression(file_format, compression)
     if file_format=="json":
         with open(file_path, 'w',encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)  
+            _write_json_array(f, data)
+    elif file_format=="jsonl":
+        write_jsonl(data, file_path, compression)
     elif file_format=="csv":
-        pandas.DataFrame(data).to_csv(file_path, index=False)
+        frame = data.frame if isinstance(data, CleanedTable) else pandas.DataFrame(data)
+        frame.to_csv(file_path, index=False)
+    elif file_format in COLUMNAR_FORMATS:
+        frame = data.frame if isinstance(data, CleanedTable) else pandas.DataFrame(data)
+        _write_columnar(frame, file_path, file_format, compression)
+    elif file_format=="sqlite":
+        with SnapshotStore(file_path) as store:
+            store.append(data, mode)
     else:
-        logging.error(f"Unsupported file format: {file_format}. Only 'json' and 'csv' are supported.")
+        logging.error(f"Unsupported file format: {file_format}. Choose one of {FILE_FORMATS}.")
     
 def save_cleaned_data(
         mode:str,
         file_path:str,
-        file_format:str="json") -> None:
+        file_format:str="json",
+        compression:Optional[str]=None) -> None:
     """
     Main function to scrape, clean, and save data based on the specified mode.
+    The fetch runs on the single event loop (and client/browser) owned by runner.run.
     """
-    if mode=="static":
-        static_html = asyncio.run(scrape_web_data.fetch_static_data())
-        cleaned_data = clean_data.clean_static_data(static_html)
-    elif mode=="dynamic":
-        dynamic_html = asyncio.run(scrape_web_data.fetch_dynamic_table_content())
-        cleaned_data = clean_data.clean_dynamic_data(dynamic_html)
-    else:
+    if mode not in ("static", "dynamic"):
         logging.error(f"Invalid mode: {mode}. Choose 'static' or 'dynamic'.")
         return
+    raw = run(lambda r: r.fetch(mode))
+    if mode=="static":
+        cleaned_data = clean_data.clean_static_data(raw, output="frame")
+    else:
+        cleaned_data = clean_data.clean_dynamic_data(raw, output="frame")
+    save_records(cleaned_data, file_path, file_format, compression, mode)
+
+def save_records(
+        cleaned_data: Optional[CleanedData],
+        file_path: str,
+        file_format: str = "json",
+        compression: Optional[str] = None,
+        mode: Optional[str] = None) -> Optional[str]:
+    """
+    Save already-cleaned records next to `file_path`, swapping its extension for `file_format`
+    (plus .gz/.zst for compressed jsonl). With 'sqlite' the records are appended to that database
+    as a new snapshot of `mode`, keeping earlier runs.
+    Returns the final file path, or None when there was nothing to save.
+    """
     if not cleaned_data:
         logging.error("No cleaned data to save.")
-        return
-    base_name,_ =os.path.splitext(file_path)
-    final_file_path= f"{base_name}.{file_format}"
-    save_cleaned_data_to_file(cleaned_data,final_file_path,file_format)
+        return None
+    compression = resolve_compression(file_format, compression)
+    final_file_path = final_output_path(file_path, file_format, compression)
+    save_cleaned_data_to_file(cleaned_data,final_file_path,file_format,compression,mode)
     logging.info(f"File saved successfully: {final_file_path}")
+    return final_file_path
 
-def main(mode:str, file_path:str, file_format)->None:
-    base_file_path: str
+def final_output_path(file_path: str, file_format: str, compression: Optional[str] = None) -> str:
+    """The file save_records writes for `file_path`: its extension swapped for `file_format` (+ .gz/.zst for jsonl)."""
+    compression = resolve_compression(file_format, compression)
+    base_name,_ =os.path.splitext(file_path)
+    suffix = JSONL_SUFFIXES.get(compression, "") if file_format=="jsonl" else ""
+    return f"{base_name}.{file_format}{suffix}"
 
+def resolve_base_file_path(mode: str, file_path: Optional[str] = None) -> str:
+    """Return the base output path (without extension) for a mode, defaulting to data/cleaned_<mode>_data."""
     if file_path is None:
         if mode=="static":
-            base_file_path="data/cleaned_static_data"
-        else:
-            base_file_path="data/cleaned_dynamic_data"
-    else:
-        base_file_path = file_path
+            return "data/cleaned_static_data"
+        return "data/cleaned_dynamic_data"
+    return file_path
+
+def prepare_output_dir(base_file_path: str, file_format: str) -> None:
+    """Create the parent directory of the final output file if needed."""
     final_path = pathlib.Path(f"{base_file_path}.{file_format}")
-    output_dir = final_path.parent
-    output_dir.mkdir(parents=True, exist_ok=True)
-    save_cleaned_data(mode, base_file_path, file_format)
+    final_path.parent.mkdir(parents=True, exist_ok=True)
+
+def main(mode:str, file_path:str, file_format:str, compression:Optional[str]=None)->None:
+    base_file_path = resolve_base_file_path(mode, file_path)
+    prepare_output_dir(base_file_path, file_format)
+    save_cleaned_data(mode, base_file_path, file_format, compression)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -90,8 +171,17 @@ if __name__ == "__main__":
         "--file_format",
         type=str,
         default="json",
-        help="File format to save the cleaned data. Currently 'json' and 'csv' are supported.",
-        choices=["json","csv"]
-    )   
+        help="File format to save the cleaned data. 'jsonl' streams one record per line; 'parquet' and 'feather' need pyarrow; "
+             "'sqlite' appends a snapshot to a history database.",
+        choices=list(FILE_FORMATS)
+    )
+    parser.add_argument(
+        "--compression",
+        type=str,
+        default=None,
+        help="Compression codec (jsonl: none/gzip/zstd; parquet/feather: zstd/snappy/lz4/gzip/none). "
+             "Defaults to JSONL_COMPRESSION or OUTPUT_COMPRESSION.",
+        choices=list(COMPRESSIONS)
+    )
     args = parser.parse_args()
-    main(args.mode, args.file_path, args.file_format)
\ No newline at end of file
+    main(args.mode, args.file_path, args.file_format, args.compression)
\ No newline at end of file
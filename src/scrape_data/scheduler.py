@@ -0,0 +1,154 @@
+"""Long-running scheduler: every target re-runs on its own jittered interval, sharing one warm Runner."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import signal
+import time
+from typing import Any, Optional
+
+from .config import settings
+from .pipeline import TargetResult, run_target, target_result
+from .runner import Runner
+from .targets import Target
+
+logger = logging.getLogger(__name__)
+
+STOP_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
+
+class Scheduler:
+    """
+    Runs each target forever, one asyncio task per target, until `stop()` (or SIGTERM/SIGINT).
+
+    - Every target waits its own interval (`Target.interval`, else `interval`, else
+      SCHEDULE_INTERVAL_S) between run starts, shifted by a random +/-`jitter` fraction so targets
+      do not fire in lockstep; the first run of each is spread over the first jitter window.
+    - A target never runs twice at once: a run that overruns its interval delays the next one
+      instead of overlapping it, and `run_once` skips a target that is already running.
+    - At most `concurrency` (TARGET_CONCURRENCY) targets run at the same time.
+    - All runs share the runner's HTTP client, browser pool and cache, so connections and Chromium
+      stay warm between ticks.
+    - On stop, no new runs start; in-flight runs get `grace` (SHUTDOWN_GRACE_S) seconds to finish.
+    """
+
+    def __init__(
+        self,
+        targets: list[Target],
+        runner: Runner,
+        *,
+        interval: Optional[float] = None,
+        jitter: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        grace: Optional[float] = None,
+        rng: Optional[random.Random] = None,
+        **run_kwargs: Any,
+    ) -> None:
+        self.targets = targets
+        self.runner = runner
+        self.interval = interval or settings.SCHEDULE_INTERVAL_S
+        self.jitter = settings.SCHEDULE_JITTER if jitter is None else jitter
+        self.grace = settings.SHUTDOWN_GRACE_S if grace is None else grace
+        self.run_kwargs = run_kwargs
+        self.rng = rng or random.Random()
+        self.last: dict[str, TargetResult] = {}
+        self.runs = 0
+        self._slots = asyncio.Semaphore(concurrency or settings.TARGET_CONCURRENCY)
+        self._running: set[str] = set()
+        self._stopping = asyncio.Event()
+
+    def interval_for(self, target: Target) -> float:
+        return target.interval or self.interval
+
+    def next_delay(self, target: Target, elapsed: float = 0.0) -> float:
+        """Seconds from now until the next run, counted from the start of a run that took `elapsed`."""
+        base = self.interval_for(target)
+        spread = base * self.jitter
+        return max(0.0, base + self.rng.uniform(-spread, spread) - elapsed)
+
+    def stop(self) -> None:
+        """Start a graceful shutdown: start no new runs and let the in-flight ones finish."""
+        if not self._stopping.is_set():
+            logger.info("Scheduler: stopping")
+        self._stopping.set()
+
+    @property
+    def stopping(self) -> bool:
+        return self._stopping.is_set()
+
+    async def _sleep(self, seconds: float) -> bool:
+        """Wait `seconds`, returning early (True) when the scheduler is stopping."""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def run_once(self, target: Target) -> Optional[TargetResult]:
+        """Run `target` once now; None when it is already running or the scheduler is stopping."""
+        if target.name in self._running:
+            logger.warning("Scheduler: %s is still running; skipping this tick", target.name)
+            return None
+        self._running.add(target.name)
+        try:
+            async with self._slots:
+                if self.stopping:
+                    return None
+                start = time.perf_counter()
+                try:
+                    artifact = await run_target(
+                        target, self.runner.cache, **self.runner.resources(), **self.run_kwargs
+                    )
+                except Exception as e:
+                    logger.exception("Scheduler: %s failed: %s", target.name, e)
+                    result = TargetResult(
+                        target.name, target.mode, "failed", time.perf_counter() - start, error=str(e)
+                    )
+                else:
+                    result = target_result(target, artifact, time.perf_counter() - start)
+        finally:
+            self._running.discard(target.name)
+        self.last[target.name] = result
+        self.runs += 1
+        logger.info(
+            "Scheduler: %s %s (%d rows) in %.2fs", target.name, result.status, result.rows, result.seconds
+        )
+        return result
+
+    async def _loop(self, target: Target) -> None:
+        delay = self.rng.uniform(0, self.interval_for(target) * self.jitter)
+        while not await self._sleep(delay):
+            start = time.perf_counter()
+            await self.run_once(target)
+            delay = self.next_delay(target, time.perf_counter() - start)
+
+    async def serve(self) -> None:
+        """Run until stopped; SIGTERM/SIGINT stop gracefully where the loop supports signal handlers."""
+        loop = asyncio.get_running_loop()
+        handled = []
+        for sig in STOP_SIGNALS:
+            try:
+                loop.add_signal_handler(sig, self.stop)
+                handled.append(sig)
+            except (NotImplementedError, RuntimeError):  # Windows, or not the main thread
+                pass
+        logger.info(
+            "Scheduler: serving %d targets (%s)",
+            len(self.targets),
+            ", ".join(f"{t.name} every {self.interval_for(t):g}s" for t in self.targets),
+        )
+        tasks = [asyncio.create_task(self._loop(t), name=f"schedule:{t.name}") for t in self.targets]
+        try:
+            await self._stopping.wait()
+            _, pending = await asyncio.wait(tasks, timeout=self.grace) if tasks else (set(), set())
+            for task in pending:
+                logger.warning("Scheduler: cancelling %s after %.0fs grace", task.get_name(), self.grace)
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            for task in tasks:
+                task.cancel()
+            for sig in handled:
+                loop.remove_signal_handler(sig)
+        logger.info("Scheduler: stopped after %d runs", self.runs)
@@ -3,53 +3,168 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Optional
+from dataclasses import dataclass
+from typing import Any, Optional, Union, cast
 from .utils.accept_cookies import accept_cookies
-import requests
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from .utils.feed_capture import FeedCapture
+import aiohttp
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 import argparse
 from .utils.decorators import retry_async
+from .browser_pool import BrowserPool
+from .http_client import HttpClient, HttpStatusError
+from .http_cache import HttpCache
+from .table_extractor import TableLocator, extract_table_fragment
 from scrape_data.config import settings
 
 logger = logging.getLogger(__name__)  
 
 
+@dataclass
+class StaticDocument:
+    """
+    Result of a static fetch.
+
+    Args:
+        html: Decoded body, or the located table fragment when a TableLocator was given.
+        not_modified: True when the server answered 304 and `html` came from the HttpCache.
+    """
+    html: str
+    not_modified: bool = False
+
+
 @retry_async(
     max_retries=settings.MAX_RETRIES,
     base_delay=5.0,
-    exceptions=(requests.RequestException,),
+    exceptions=(aiohttp.ClientError, asyncio.TimeoutError),
     retry_on_none=True,
     max_delay=30.0,
 )
-async def fetch_static_data(url: str = settings.URL_STATIC) -> Optional[str]:
+async def _fetch_static_with_client(
+    client: HttpClient,
+    url: str,
+    table: Optional[TableLocator] = None,
+    cache: Optional[HttpCache] = None,
+) -> Optional[StaticDocument]:
+    """GET `url` on the pooled client; retryable statuses raise so the decorator retries them."""
+    try:
+        validators = cache.validators(url) if cache is not None else {}
+        resp = await client.get(url, headers=validators or None)
+
+        html: Optional[str] = None
+        not_modified = False
+        if resp.status == 304 and cache is not None:
+            html = cache.load_body(url)
+            not_modified = html is not None
+            if html is None:
+                # body vanished from the cache between validators() and now: refetch unconditionally
+                resp = await client.get(url)
+
+        if html is None:
+            if resp.status in settings.STATUS_FORCELIST or resp.status >= 400:
+                raise HttpStatusError(url, resp.status)
+            if resp.status != 200:
+                return None
+            html = resp.text()
+            if cache is not None and (resp.headers.get("ETag") or resp.headers.get("Last-Modified")):
+                cache.store(
+                    url,
+                    html,
+                    etag=resp.headers.get("ETag"),
+                    last_modified=resp.headers.get("Last-Modified"),
+                )
+
+        if table is not None:
+            html = extract_table_fragment(html, table)
+            if html is None:
+                return None
+        return StaticDocument(html=html, not_modified=not_modified)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.warning("Static fetch error: %s", e)
+        raise
+
+
+async def fetch_static_document(
+    url: str = settings.URL_STATIC,
+    *,
+    client: Optional[HttpClient] = None,
+    table: Optional[TableLocator] = None,
+    cache: Optional[HttpCache] = None,
+) -> Optional[StaticDocument]:
     """
-    Fetch raw HTML from a static page (requests in a thread) with retries.
-    Returns the HTML string or None.
+    Fetch a static page with retries, revalidating against `cache` when one is given.
+    Pass a shared `client` to reuse its pooled keep-alive connections across fetches;
+    otherwise a short-lived client is opened for this call (and shared by its retries).
+    On a 304 the cached body is returned with not_modified=True.
     """
-    headers = {"User-Agent": settings.USER_AGENT}
+    if client is not None:
+        return await _fetch_static_with_client(client, url, table, cache)
+    async with HttpClient() as own_client:
+        return await _fetch_static_with_client(own_client, url, table, cache)
+
+
+async def fetch_static_data(
+    url: str = settings.URL_STATIC,
+    *,
+    client: Optional[HttpClient] = None,
+    table: Optional[TableLocator] = None,
+    cache: Optional[HttpCache] = None,
+) -> Optional[str]:
+    """
+    Fetch raw HTML from a static page with retries.
+    Returns the decoded body as-is, or only the outer HTML of the `table` it locates,
+    so the document is parsed once downstream. Returns None on failure or no match.
+    See fetch_static_document for `client` and `cache`.
+    """
+    doc = await fetch_static_document(url, client=client, table=table, cache=cache)
+    return doc.html if doc else None
+
+
+# Dynamic fetches return the rendered table HTML ("dom"), a {"headers": [...], "rows": [[...]]}
+# array built in the page ("js"), or rows taken from the JSON feed ("network").
+DynamicContent = Union[str, dict[str, list[Any]], list[dict[str, Any]]]
+EXTRACT_MODES = ("dom", "js", "network")
+
+# Walks the table in the page and returns only its text, so no HTML crosses the Playwright channel.
+_TABLE_TO_ARRAYS_JS = """
+(selector) => {
+    const table = document.querySelector(selector);
+    if (!table) return null;
+    const text = (cell) => cell.textContent.trim();
+    const headerRow = table.tHead && table.tHead.rows.length ? table.tHead.rows[0] : table.rows[0];
+    const headers = headerRow ? Array.from(headerRow.cells, text) : [];
+    const bodyRows = table.tBodies.length
+        ? Array.from(table.tBodies).flatMap((b) => Array.from(b.rows))
+        : Array.from(table.rows).slice(1);
+    const rows = bodyRows.map((r) => Array.from(r.cells, text));
+    return { headers, rows };
+}
+"""
+
+
+async def _wait_for_table(page: Any, selector: str, timeout_ms: int) -> None:
+    await page.wait_for_selector(
+        selector, 
+        state="attached", 
+        timeout=timeout_ms)
+
+
+async def _extract_table_html(page: Any, selector: str, timeout_ms: int, table_selector: str) -> str:
+    """Wait for the rendered table and return it as a <table>...</table> string."""
+    await _wait_for_table(page, selector, timeout_ms)
+    table_locator = page.locator(table_selector).first
+    table_html = await table_locator.inner_html()
+    return f"<table>{table_html}</table>"
+
+
+async def _extract_table_arrays(
+    page: Any, selector: str, timeout_ms: int, table_selector: str
+) -> Optional[dict[str, list[Any]]]:
+    """Wait for the rendered table and return its headers and row texts via one page.evaluate."""
+    await _wait_for_table(page, selector, timeout_ms)
+    return await page.evaluate(_TABLE_TO_ARRAYS_JS, table_selector)
 
-    def sync_request() -> Optional[str]:
-        try:
-            resp = requests.get(url, headers=headers, timeout=15)
-         
-            if resp.status_code in settings.STATUS_FORCELIST:
-                resp.raise_for_status()
-            if resp.status_code == 200:
-                soup = BeautifulSoup(resp.content, "html.parser")
-                return str(soup)
-           
-            resp.raise_for_status()
-            return None
-        except requests.RequestException as e:
-            logger.warning("Static fetch error: %s", e)
-          
-            raise
-
-    
-    return await asyncio.to_thread(sync_request)
 
-from scrape_data.config import settings
 @retry_async(
     max_retries=settings.MAX_RETRIES,
     base_delay=10.0,
@@ -57,70 +172,116 @@ from scrape_data.config import settings
     exceptions=(PlaywrightTimeoutError, Exception), 
     retry_on_none=True,
 )
+async def _fetch_dynamic_with_pool(
+    pool: BrowserPool,
+    url: str,
+    selector: str,
+    timeout_ms: int,
+    extract: str,
+    table_selector: str = settings.TABLE_SELECTOR_DYNAMIC,
+) -> Optional[DynamicContent]:
+    """
+    Render `url` on a pooled page and return the table content for `extract` mode.
+    Retries reuse the pool's running browser, so they only pay for navigation.
+    """
+    async with pool.page() as page:
+        capture = None
+        if extract == "network":
+            capture = FeedCapture()
+            capture.attach(page)
+
+        await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+
+        # warm runs load the saved consent state, so the banner normally never shows up
+        consent_assumed = pool.has_consent_state
+        if not consent_assumed:
+            await _accept_and_save_consent(pool, page)
+
+        if settings.DEBUG:
+            print({settings.DEBUG})
+            await page.screenshot(path=settings.DEBUG_SCREENSHOT_PATH,full_page=True)
+
+        if capture is not None:
+            records = await capture.wait_for_records(settings.DYNAMIC_FEED_TIMEOUT_MS)
+            if records:
+                logger.info("Captured %d rows from the JSON feed for %s", len(records), url)
+                return records
+            logger.warning("No matching JSON feed seen for %s; falling back to DOM extraction", url)
+
+        try:
+            return await _extract_dom(page, extract, selector, timeout_ms, table_selector)
+        except PlaywrightTimeoutError:
+            # the saved consent cookie may have expired and the banner be back over the table
+            if not consent_assumed or not await _accept_and_save_consent(pool, page):
+                raise
+            logger.warning("Saved consent state was not honoured for %s; accepted the banner again", url)
+            return await _extract_dom(page, extract, selector, timeout_ms, table_selector)
+
+
+async def _accept_and_save_consent(pool: BrowserPool, page: Any) -> bool:
+    """Click the cookie banner if one shows up, saving the consent state after every click."""
+    if not await accept_cookies(page):
+        return False
+    await pool.save_storage_state(page.context)
+    return True
+
+
+async def _extract_dom(
+    page: Any, extract: str, selector: str, timeout_ms: int, table_selector: str
+) -> Optional[DynamicContent]:
+    if extract == "js":
+        return await _extract_table_arrays(page, selector, timeout_ms, table_selector)
+    return await _extract_table_html(page, selector, timeout_ms, table_selector)
+
+
 async def fetch_dynamic_table_content(
     url: str = settings.URL_DYNAMIC,
     *,
+    selector: str = settings.TABLE_HEADER_SELECTOR_DYNAMIC,
+    timeout_ms: int = settings.PLAYWRIGHT_TIMEOUT_MS,
     headless: bool = True,
     slow_mo_ms: int = 0,
-) -> Optional[str]:
-    """
-    Use Playwright to fetch fully rendered table HTML.
-    Returns a <table>...</table> string or None.
+    pool: Optional[BrowserPool] = None,
+    extract: str = settings.DYNAMIC_EXTRACT_MODE,
+    table_selector: str = settings.TABLE_SELECTOR_DYNAMIC,
+) -> Optional[DynamicContent]:
     """
-    browser = None
-    context = None
-    page = None
+    Use Playwright to fetch the dynamic table: wait for `selector`, then read `table_selector`.
+    Pass a running `pool` to reuse its browser across calls; otherwise a
+    short-lived pool is opened for this call (and shared by its retries).
 
-    async with async_playwright() as p:
-        try:
-            browser = await p.chromium.launch(headless=headless, slow_mo=slow_mo_ms)
-            context = await browser.new_context(
-                user_agent=settings.USER_AGENT,
-                java_script_enabled=True,
+    extract="dom" returns a <table>...</table> string; extract="js" returns
+    {"headers": [...], "rows": [[...], ...]} built by one page.evaluate; extract="network"
+    returns IndexData-shaped records captured from the JSON feed behind the table, falling
+    back to the DOM string when no matching response shows up. Returns None on failure.
+    """
+    if extract not in EXTRACT_MODES:
+        raise ValueError(f"Invalid extract mode: {extract}. Choose one of {EXTRACT_MODES}.")
+    # retry_async solves its result type to a join of DynamicContent's members; restore the union.
+    if pool is not None:
+        content = await _fetch_dynamic_with_pool(pool, url, selector, timeout_ms, extract, table_selector)
+    else:
+        async with BrowserPool(headless=headless, slow_mo_ms=slow_mo_ms) as own_pool:
+            content = await _fetch_dynamic_with_pool(
+                own_pool, url, selector, timeout_ms, extract, table_selector
             )
-            for script in settings.BYPASS_SCRIPTS:
-                await context.add_init_script(script)
-            page = await context.new_page()
-            await page.goto(url, wait_until="domcontentloaded", timeout=settings.PLAYWRIGHT_TIMEOUT_MS)
-            
-            await accept_cookies(page)
-
-            if settings.DEBUG:
-                print({settings.DEBUG})
-                await page.screenshot(path=settings.DEBUG_SCREENSHOT_PATH,full_page=True)
-
-            await page.wait_for_selector(
-                settings.TABLE_HEADER_SELECTOR_DYNAMIC, 
-                state="attached", 
-                timeout=settings.PLAYWRIGHT_TIMEOUT_MS)
-
-            table_locator = page.locator("div.tableContainer table").first
-            table_html = await table_locator.inner_html()
-            return f"<table>{table_html}</table>"
-        finally:
-            try:
-                if page:
-                    await page.close()
-                if context:
-                    await context.close()
-            finally:
-                if browser:
-                    await browser.close()
+    return cast(Optional[DynamicContent], content)
 
 
 def main(mode: str) -> None:
+    from .runner import run  # runner imports this module
+
+    html = run(lambda runner: runner.fetch(mode))
     if mode == "static":
-        html = asyncio.run(fetch_static_data())
         if not html:
             logger.info("Failed to fetch static data.")
         else:
             logger.info("Static data fetched successfully. HTML length: %s", len(html))
     else:
-        html = asyncio.run(fetch_dynamic_table_content())
         if not html:
             logger.info("Failed to fetch dynamic data.")
         else:
-            logger.info("Dynamic data fetched successfully. HTML snippet:\n%s...", html[:100])
+            logger.info("Dynamic data fetched successfully. Snippet:\n%s...", str(html)[:100])
 
 
 if __name__ == "__main__":
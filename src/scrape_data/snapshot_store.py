@@ -0,0 +1,218 @@
+"""SQLite snapshot store: every cleaned table is appended as a timestamped snapshot instead of overwritten."""
+from __future__ import annotations
+
+import logging
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional, Type, Union
+
+import pandas as pd  # type: ignore
+from pydantic import BaseModel  # type: ignore
+
+from . import dynamic_models, static_models
+from .cleaned_table import CleanedTable, python_columns
+from .cleaning_plan import PARSER_FLOAT, compile_plan
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SnapshotLayout:
+    """
+    Where the rows of one mode live.
+
+    Args:
+        table: Row table name.
+        model: Row model; its field names are the SQL columns, its aliases the DataFrame columns.
+        key: Field the history queries filter on (indexed together with scraped_at).
+    """
+    table: str
+    model: Type[BaseModel]
+    key: str
+
+    @property
+    def fields(self) -> list[Any]:
+        return list(self.model.__fields__.values())  # type: ignore[attr-defined]
+
+    def sql_types(self) -> dict[str, str]:
+        """Field name -> SQLite column type, from the cleaning plan (int/volume -> INTEGER, float -> REAL)."""
+        kinds = dict(compile_plan(self.model).parsers)
+        types = {}
+        for f in self.fields:
+            kind = kinds.get(f.alias)
+            types[f.name] = "TEXT" if kind is None else ("REAL" if kind == PARSER_FLOAT else "INTEGER")
+        return types
+
+
+LAYOUTS = {
+    "static": SnapshotLayout(table="static_rows", model=static_models.CountryData, key="country_name"),
+    "dynamic": SnapshotLayout(table="dynamic_rows", model=dynamic_models.IndexData, key="symbol"),
+}
+
+
+def _timestamp(value: Optional[datetime] = None) -> str:
+    """UTC ISO-8601 text with microseconds, so snapshot times sort lexicographically."""
+    value = value or datetime.now(timezone.utc)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def infer_mode(columns: Iterable[str]) -> Optional[str]:
+    """Return the mode whose key column alias appears in `columns` (None if neither does)."""
+    columns = set(columns)
+    for mode, layout in LAYOUTS.items():
+        if layout.model.__fields__[layout.key].alias in columns:  # type: ignore[attr-defined]
+            return mode
+    return None
+
+
+class SnapshotStore:
+    """
+    Append-only history of cleaned tables in one SQLite database (WAL mode).
+
+    Tables:
+        snapshots        snapshot_id, mode, scraped_at, row_count (one row per saved table)
+        static_rows      snapshot_id, scraped_at + the CountryData fields
+        dynamic_rows     snapshot_id, scraped_at + the IndexData fields
+
+    Row tables are indexed on (key, scraped_at) for per-symbol / per-country time series and on
+    snapshot_id for latest-snapshot reads, so both stay index lookups as history grows.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0) -> None:
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=timeout)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL only syncs at checkpoints; a crash can lose the last snapshot but never corrupts
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def __enter__(self) -> "SnapshotStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _create_schema(self) -> None:
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                "snapshot_id INTEGER PRIMARY KEY, mode TEXT NOT NULL, "
+                "scraped_at TEXT NOT NULL, row_count INTEGER NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS snapshots_mode ON snapshots (mode, snapshot_id)")
+            for layout in LAYOUTS.values():
+                columns = ", ".join(f'"{name}" {sql_type}' for name, sql_type in layout.sql_types().items())
+                self.conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {layout.table} ("
+                    f"snapshot_id INTEGER NOT NULL REFERENCES snapshots (snapshot_id), "
+                    f"scraped_at TEXT NOT NULL, {columns})"
+                )
+                self.conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {layout.table}_{layout.key}_time "
+                    f'ON {layout.table} ("{layout.key}", scraped_at)'
+                )
+                self.conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {layout.table}_snapshot ON {layout.table} (snapshot_id)"
+                )
+
+    def append(
+        self,
+        data: Union[CleanedTable, pd.DataFrame, list[dict[str, Any]]],
+        mode: Optional[str] = None,
+        scraped_at: Optional[datetime] = None,
+    ) -> int:
+        """
+        Insert one cleaned table as a new snapshot (a single transaction, rows bulk-inserted with
+        executemany) and return its snapshot_id. Columns are matched by field alias; fields missing
+        from the table are stored as NULL, but a table with none of the mode's columns raises
+        ValueError. `mode` is inferred from the columns when omitted.
+        """
+        frame = data.frame if isinstance(data, CleanedTable) else pd.DataFrame(data)
+        mode = mode or infer_mode(frame.columns)
+        if mode not in LAYOUTS:
+            raise ValueError(f"Cannot store snapshot: unknown mode {mode!r}. Choose one of {tuple(LAYOUTS)}.")
+        layout = LAYOUTS[mode]
+        present = [f for f in layout.fields if f.alias in frame.columns]
+        if not present:
+            raise ValueError(
+                f"Cannot store snapshot: none of the {layout.model.__name__} columns are in the table "
+                f"(got {list(frame.columns)})"
+            )
+        names = [f.name for f in present]
+        values = python_columns(frame, [f.alias for f in present])
+        timestamp = _timestamp(scraped_at)
+
+        columns = ", ".join(["snapshot_id", "scraped_at"] + [f'"{n}"' for n in names])
+        placeholders = ", ".join("?" * (len(names) + 2))
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO snapshots (mode, scraped_at, row_count) VALUES (?, ?, ?)",
+                (mode, timestamp, len(frame)),
+            )
+            snapshot_id = cursor.lastrowid
+            rows = zip(*values, strict=True) if values else ((),) * len(frame)
+            self.conn.executemany(
+                f"INSERT INTO {layout.table} ({columns}) VALUES ({placeholders})",
+                ((snapshot_id, timestamp, *row) for row in rows),
+            )
+        logger.info("SnapshotStore: stored %s snapshot %d (%d rows) in %s", mode, snapshot_id, len(frame), self.path)
+        return int(snapshot_id)  # type: ignore[arg-type]
+
+    def _read(
+        self, layout: SnapshotLayout, where: str, params: tuple, with_time: bool, order: str = "rowid"
+    ) -> pd.DataFrame:
+        types = layout.sql_types()
+        selected = (["scraped_at"] if with_time else []) + [f'"{name}"' for name in types]
+        frame = pd.read_sql_query(
+            f"SELECT {', '.join(selected)} FROM {layout.table} WHERE {where} ORDER BY {order}",
+            self.conn,
+            params=params,
+        )
+        for name, sql_type in types.items():
+            if sql_type == "INTEGER":
+                frame[name] = frame[name].astype("Int64")
+        return frame.rename(columns={f.name: f.alias for f in layout.fields})
+
+    def snapshots(self, mode: str, limit: Optional[int] = None) -> pd.DataFrame:
+        """snapshot_id, scraped_at and row_count of the stored snapshots for `mode`, newest first."""
+        query = "SELECT snapshot_id, scraped_at, row_count FROM snapshots WHERE mode = ? ORDER BY snapshot_id DESC"
+        params: tuple = (mode,)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (limit,)
+        return pd.read_sql_query(query, self.conn, params=params)
+
+    def latest(self, mode: str = "dynamic") -> Optional[CleanedTable]:
+        """The most recent snapshot for `mode` as a CleanedTable (alias columns), or None if there is none."""
+        row = self.conn.execute("SELECT max(snapshot_id) FROM snapshots WHERE mode = ?", (mode,)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return CleanedTable(self._read(LAYOUTS[mode], "snapshot_id = ?", (row[0],), with_time=False))
+
+    def history(
+        self,
+        key: str,
+        mode: str = "dynamic",
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> pd.DataFrame:
+        """
+        Time series of one symbol (dynamic) or country (static): scraped_at plus the row fields,
+        oldest first, optionally limited to since <= scraped_at <= until.
+        """
+        layout = LAYOUTS[mode]
+        where = f'"{layout.key}" = ?'
+        params: tuple = (key,)
+        if since is not None:
+            where += " AND scraped_at >= ?"
+            params += (_timestamp(since),)
+        if until is not None:
+            where += " AND scraped_at <= ?"
+            params += (_timestamp(until),)
+        return self._read(layout, where, params, with_time=True, order="scraped_at, rowid")
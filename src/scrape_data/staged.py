@@ -0,0 +1,201 @@
+"""Staged executor for registry runs: async fetch workers -> process-pool cleaning -> one writer, joined by bounded queues."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+from .browser_pool import BrowserPool
+from .config import settings
+from .dedup import records_digest
+from .http_cache import HttpCache
+from .http_client import HttpClient
+from .pipeline import (
+    PipelineArtifact,
+    Records,
+    TargetResult,
+    clean_records,
+    dedup_output,
+    fetch_stage,
+    fragment_unchanged,
+    records_unchanged,
+    reuse_cleaned,
+    store_cleaned,
+    target_result,
+    write_stage,
+)
+from .targets import Target
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Job:
+    """One fetched target moving through the clean and write stages."""
+    index: int
+    target: Target
+    start: float
+    artifact: PipelineArtifact
+    output: Optional[str] = None
+
+
+def clean_in_worker(artifact: PipelineArtifact, with_hash: bool) -> tuple[Optional[Records], Optional[str]]:
+    """Process-pool task: clean the raw content and, for dedup, hash the records in the same process."""
+    records = clean_records(artifact)
+    return records, records_digest(records) if with_hash and records else None
+
+
+def clean_workers(workers: Optional[int] = None) -> int:
+    return workers or settings.CLEAN_WORKERS or os.cpu_count() or 1
+
+
+def clean_executor(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Process pool for clean_in_worker. Workers are spawned rather than forked so they never inherit
+    the event loop, open sockets or the browser's threads.
+    """
+    return ProcessPoolExecutor(max_workers=clean_workers(workers), mp_context=multiprocessing.get_context("spawn"))
+
+
+async def run_staged(
+    targets: list[Target],
+    *,
+    fetch_workers: Optional[int] = None,
+    workers: Optional[int] = None,
+    queue_size: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    cache: Optional[HttpCache] = None,
+    dedup: Optional[bool] = None,
+    cdc_enabled: Optional[bool] = None,
+    client: Optional[HttpClient] = None,
+    pool: Optional[BrowserPool] = None,
+) -> list[TargetResult]:
+    """
+    Run `targets` as three overlapping stages instead of one pipeline per target:
+
+    - fetch: `fetch_workers` (TARGET_CONCURRENCY when None) async workers fetch pages and drop
+      those whose table hashes like the last saved run (parsed and hashed in a thread, so the
+      other fetchers keep going);
+    - clean: `workers` (CLEAN_WORKERS, else one per CPU) cleaners run clean_records and the records
+      hash in `executor` (a spawned process pool, created and shut down here when None);
+    - write: one writer runs CDC, save and the manifest update in a thread, one target at a time
+      (the shared HttpCache is only used from the loop).
+
+    The stages are joined by queues of at most `queue_size` (STAGE_QUEUE_SIZE) artifacts, so fetch
+    workers wait when cleaning falls behind and no more pages are held in memory than the queues,
+    cleaners and writer can take. Outputs and statuses match run_targets; a failing target is
+    reported without stopping the others, and results keep input order.
+    """
+    n_fetch = fetch_workers or settings.TARGET_CONCURRENCY
+    n_clean = clean_workers(workers)
+    size = queue_size or settings.STAGE_QUEUE_SIZE
+    owned = executor is None
+    if executor is None:
+        executor = clean_executor(n_clean)
+    loop = asyncio.get_running_loop()
+
+    pending: asyncio.Queue[tuple[int, Target]] = asyncio.Queue()
+    for index, target in enumerate(targets):
+        pending.put_nowait((index, target))
+    to_clean: asyncio.Queue[Optional[_Job]] = asyncio.Queue(maxsize=size)
+    to_write: asyncio.Queue[Optional[_Job]] = asyncio.Queue(maxsize=size)
+    results: list[Optional[TargetResult]] = [None] * len(targets)
+
+    def failed(index: int, target: Target, start: float, error: BaseException) -> None:
+        logger.error("run_staged: %s failed: %s", target.name, error, exc_info=error)
+        seconds = time.perf_counter() - start
+        results[index] = TargetResult(target.name, target.mode, "failed", seconds, error=str(error))
+
+    def finish(job: _Job, error: Optional[BaseException] = None) -> None:
+        if error is not None:
+            failed(job.index, job.target, job.start, error)
+        else:
+            results[job.index] = target_result(job.target, job.artifact, time.perf_counter() - job.start)
+
+    async def fetcher() -> None:
+        while not pending.empty():
+            index, target = pending.get_nowait()
+            start = time.perf_counter()
+            try:
+                artifact = await fetch_stage(
+                    target.mode,
+                    target.url,
+                    cache if target.mode == "static" else None,
+                    target,
+                    client=client,
+                    pool=pool,
+                )
+            except Exception as e:
+                failed(index, target, start, e)
+                continue
+            job = _Job(index, target, start, artifact)
+            try:
+                job.output = dedup_output(artifact, target.base_file_path, target.sink, target.compression, dedup)
+                # lxml parses the whole page here: keep it off the loop so other fetches overlap
+                if not artifact.raw or (
+                    job.output is not None and await asyncio.to_thread(fragment_unchanged, artifact, job.output)
+                ):
+                    finish(job)
+                    continue
+            except Exception as e:
+                finish(job, e)
+                continue
+            await to_clean.put(job)
+
+    async def cleaner() -> None:
+        while (job := await to_clean.get()) is not None:
+            artifact = job.artifact
+            try:
+                if not reuse_cleaned(artifact, cache if artifact.mode == "static" else None):
+                    artifact.records, artifact.records_hash = await loop.run_in_executor(
+                        executor, clean_in_worker, artifact, job.output is not None
+                    )
+                    # HttpCache is not thread-safe: it is only used here on the loop, never by the writer thread
+                    store_cleaned(artifact, cache)
+            except Exception as e:
+                finish(job, e)
+                continue
+            if not artifact.records:
+                finish(job)
+                continue
+            await to_write.put(job)
+
+    def write(job: _Job) -> None:
+        artifact, target = job.artifact, job.target
+        if job.output is not None and records_unchanged(artifact, job.output):
+            return
+        write_stage(
+            artifact, target.base_file_path, target.sink, target.compression,
+            output=job.output, cdc_enabled=cdc_enabled,
+        )
+
+    async def writer() -> None:
+        while (job := await to_write.get()) is not None:
+            try:
+                await asyncio.to_thread(write, job)
+            except Exception as e:
+                finish(job, e)
+                continue
+            finish(job)
+
+    fetchers = [asyncio.create_task(fetcher()) for _ in range(min(n_fetch, len(targets)) or 1)]
+    cleaners = [asyncio.create_task(cleaner()) for _ in range(n_clean)]
+    writer_task = asyncio.create_task(writer())
+    try:
+        await asyncio.gather(*fetchers)
+        for _ in cleaners:
+            await to_clean.put(None)
+        await asyncio.gather(*cleaners)
+        await to_write.put(None)
+        await writer_task
+    finally:
+        for task in (*fetchers, *cleaners, writer_task):
+            task.cancel()
+        if owned:
+            executor.shutdown(cancel_futures=True)
+    return [r for r in results if r is not None]
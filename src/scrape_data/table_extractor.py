@@ -0,0 +1,143 @@
+"""Locate a single target <table> in an HTML document with lxml and read it into a DataFrame."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import lxml.html
+import pandas as pd  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TableLocator:
+    """
+    Describe which <table> to pick; all given criteria must match, the first match wins.
+
+    Args:
+        table_id: Required value of the table's id attribute.
+        attrs: Attribute values the table must carry (e.g. {"class": "datatable"}).
+        headers: Header texts that must all appear in the table's header row.
+        xpath: Optional XPath evaluated on the document; its first <table> result is used.
+        css: Optional CSS selector (needs the `cssselect` package); like xpath, narrows the candidates.
+    """
+    table_id: Optional[str] = None
+    attrs: dict[str, str] = field(default_factory=dict)
+    headers: tuple[str, ...] = ()
+    xpath: Optional[str] = None
+    css: Optional[str] = None
+
+
+def _cell_text(cell: Any) -> str:
+    return " ".join(cell.text_content().split())
+
+
+def _cells(row: Any) -> list[Any]:
+    return [c for c in row if c.tag in ("th", "td")]
+
+
+def _header_row(table: Any) -> Optional[Any]:
+    """The first <thead> row, else the first row with <th> cells."""
+    for row in table.iter("tr"):
+        parent = row.getparent()
+        in_thead = parent is not None and parent.tag == "thead"
+        if in_thead or any(c.tag == "th" for c in row):
+            return row
+    return None
+
+
+def header_texts(table: Any) -> list[str]:
+    """Texts of the table's header row: the first <thead> row, else the first row with <th> cells."""
+    row = _header_row(table)
+    return [_cell_text(c) for c in _cells(row)] if row is not None else []
+
+
+def _matches(table: Any, locator: TableLocator) -> bool:
+    if locator.table_id is not None and table.get("id") != locator.table_id:
+        return False
+    for key, value in locator.attrs.items():
+        actual = table.get(key)
+        if actual is None:
+            return False
+        # class attributes match on any one of their space-separated tokens
+        if key == "class" and value in actual.split():
+            continue
+        if actual != value:
+            return False
+    if locator.headers:
+        found = set(header_texts(table))
+        if not all(h in found for h in locator.headers):
+            return False
+    return True
+
+
+def find_table(root: Any, locator: Optional[TableLocator] = None) -> Optional[Any]:
+    """Return the first <table> element under `root` matching `locator` (any table if None)."""
+    locator = locator or TableLocator()
+    if locator.xpath:
+        hits = [h for h in root.xpath(locator.xpath) if getattr(h, "tag", None) == "table"]
+        candidates = iter(hits)
+    elif locator.css:
+        from lxml.cssselect import CSSSelector  # optional dependency: cssselect
+
+        candidates = iter([h for h in CSSSelector(locator.css)(root) if h.tag == "table"])
+    else:
+        candidates = root.iter("table")
+    return next((t for t in candidates if _matches(t, locator)), None)
+
+
+def extract_table_fragment(html: str, locator: Optional[TableLocator] = None) -> Optional[str]:
+    """Return the outer HTML of the target table, or None if no table matches."""
+    if not html:
+        return None
+    root = lxml.html.fromstring(html)
+    table = find_table(root, locator)
+    if table is None:
+        logger.warning("extract_table_fragment: no table matched %s", locator)
+        return None
+    return lxml.html.tostring(table, encoding="unicode")
+
+
+def _own_rows(table: Any) -> list[Any]:
+    """<tr> elements of this table only (rows of nested tables are skipped)."""
+    return table.xpath("./tr | ./thead/tr | ./tbody/tr | ./tfoot/tr")
+
+
+def extract_table_frame(
+    html: str,
+    locator: Optional[TableLocator] = None,
+    columns: Optional[list[str]] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Parse `html` once with lxml and build a DataFrame from the target table only.
+
+    Only the table matched by `locator` is read, and of it only the header texts listed in
+    `columns` (all columns if None; names missing from the header are left out, in the
+    table's order). Cells are whitespace-normalized strings and empty cells become None, so
+    numeric columns are left to the clean_data parsers. Returns None if no table matches.
+    """
+    if not html:
+        return None
+    table = find_table(lxml.html.fromstring(html), locator)
+    if table is None:
+        logger.warning("extract_table_frame: no table matched %s", locator)
+        return None
+
+    header_row = _header_row(table)
+    headers = [_cell_text(c) for c in _cells(header_row)] if header_row is not None else []
+    wanted = set(columns) if columns is not None else set(headers)
+    picked = [(i, h) for i, h in enumerate(headers) if h in wanted]
+    positions = [i for i, _ in picked]
+
+    data: list[list[Optional[str]]] = []
+    for row in _own_rows(table):
+        if row is header_row:
+            continue
+        cells = _cells(row)
+        if not any(c.tag == "td" for c in cells):
+            continue
+        texts = [_cell_text(cells[i]) if i < len(cells) else "" for i in positions]
+        data.append([t or None for t in texts])
+    return pd.DataFrame(data, columns=[h for _, h in picked])
@@ -0,0 +1,173 @@
+"""Registry of scrape targets: URL, fetch mode, table locator, row model and output sink per named table."""
+from __future__ import annotations
+
+import importlib
+import logging
+from dataclasses import dataclass, fields
+from typing import Any, Optional, Type
+
+from pydantic import BaseModel  # type: ignore
+
+from .cleaning_plan import row_model
+from .config import settings
+from .save_scraped_data import FILE_FORMATS
+from .snapshot_store import LAYOUTS
+from .table_extractor import TableLocator
+
+logger = logging.getLogger(__name__)
+
+MODES = ("static", "dynamic")
+_LOCATOR_KEYS = ("table_id", "attrs", "headers", "xpath", "css")
+
+
+@dataclass(frozen=True)
+class Target:
+    """
+    One table to scrape.
+
+    Args:
+        name: Unique name, used with --targets and as the default output file name.
+        url: Page holding the table.
+        mode: 'static' (HTTP fetch) or 'dynamic' (rendered with Playwright).
+        model: Row or table model as "module:Class" (modules may be relative to scrape_data);
+            empty uses CountryData / IndexData for the mode.
+        locator: Which <table> to read from the page; None uses clean_data's default for the mode.
+        wait_selector: Dynamic only: selector to wait for (TABLE_HEADER_SELECTOR_DYNAMIC if None).
+        table_selector: Dynamic only: CSS selector of the rendered table (TABLE_SELECTOR_DYNAMIC if None).
+        file_path: Base output path without extension (data/<name> if None).
+        sink: Output format: json, jsonl, csv, parquet, feather or sqlite.
+        compression: Codec for jsonl/parquet/feather (configured default if None).
+        interval: Seconds between runs under `scrape-data serve` (SCHEDULE_INTERVAL_S if None).
+        cdc_key: Dynamic only: column identifying a row for --cdc (CDC_KEY if None).
+    """
+    name: str
+    url: str
+    mode: str = "static"
+    model: str = ""
+    locator: Optional[TableLocator] = None
+    wait_selector: Optional[str] = None
+    table_selector: Optional[str] = None
+    file_path: Optional[str] = None
+    sink: str = "json"
+    compression: Optional[str] = None
+    interval: Optional[float] = None
+    cdc_key: Optional[str] = None
+
+    @property
+    def base_file_path(self) -> str:
+        return self.file_path or f"data/{self.name}"
+
+    def model_class(self) -> Optional[Type[BaseModel]]:
+        """Import the configured model (None when the mode's default model applies)."""
+        return resolve_model(self.model) if self.model else None
+
+    def fetch_options(self) -> dict[str, Any]:
+        """Extra keyword arguments for fetch_dynamic_table_content."""
+        options: dict[str, Any] = {}
+        if self.wait_selector:
+            options["selector"] = self.wait_selector
+        if self.table_selector:
+            options["table_selector"] = self.table_selector
+        return options
+
+
+def resolve_model(path: str) -> Type[BaseModel]:
+    """Import "package.module:Class" (or "module:Class" relative to scrape_data) and check it is a model."""
+    module_name, _, attr = path.partition(":")
+    if not attr:
+        raise ValueError(f"Model must look like 'module:Class', got {path!r}")
+    try:
+        module = importlib.import_module(module_name)
+    except ModuleNotFoundError:
+        module = importlib.import_module(f"{__package__}.{module_name}")
+    model = getattr(module, attr)
+    if not (isinstance(model, type) and issubclass(model, BaseModel)):
+        raise ValueError(f"{path!r} is not a Pydantic model")
+    return model
+
+
+def _locator(spec: Optional[dict[str, Any]]) -> Optional[TableLocator]:
+    if not spec:
+        return None
+    unknown = set(spec) - set(_LOCATOR_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown locator keys {sorted(unknown)}; use {_LOCATOR_KEYS}")
+    spec = dict(spec)
+    if "headers" in spec:
+        spec["headers"] = tuple(spec["headers"])
+    return TableLocator(**spec)
+
+
+def target_from_dict(entry: dict[str, Any]) -> Target:
+    """Build a Target from one registry entry (a [[targets]] table or a TARGETS item), validating it."""
+    entry = dict(entry)
+    for required in ("name", "url"):
+        if not entry.get(required):
+            raise ValueError(f"Target entry is missing {required!r}: {entry}")
+    unknown = set(entry) - {f.name for f in fields(Target)}
+    if unknown:
+        raise ValueError(f"Target {entry['name']!r}: unknown keys {sorted(unknown)}")
+    entry["locator"] = _locator(entry.get("locator"))
+    target = Target(**entry)
+    if target.mode not in MODES:
+        raise ValueError(f"Target {target.name!r}: invalid mode {target.mode!r}. Choose one of {MODES}.")
+    if target.sink not in FILE_FORMATS:
+        raise ValueError(f"Target {target.name!r}: invalid sink {target.sink!r}. Choose one of {FILE_FORMATS}.")
+    if target.interval is not None and not target.interval > 0:
+        raise ValueError(f"Target {target.name!r}: interval must be a positive number of seconds")
+    model = target.model_class()
+    if target.sink == "sqlite" and model is not None and row_model(model) is not LAYOUTS[target.mode].model:
+        raise ValueError(
+            f"Target {target.name!r}: the sqlite sink only stores {LAYOUTS[target.mode].model.__name__} "
+            f"rows for {target.mode} targets; choose another sink for model {target.model!r}"
+        )
+    return target
+
+
+def builtin_targets() -> list[Target]:
+    """The two original sources, driven by URL_STATIC / URL_DYNAMIC and their selectors."""
+    return [
+        Target(name="static", url=settings.URL_STATIC, mode="static", file_path="data/cleaned_static_data"),
+        Target(name="dynamic", url=settings.URL_DYNAMIC, mode="dynamic", file_path="data/cleaned_dynamic_data"),
+    ]
+
+
+def _read_toml(path: str) -> dict[str, Any]:
+    try:
+        import tomllib  # Python 3.11+
+    except ImportError:  # pragma: no cover - Python 3.10
+        try:
+            import tomli as tomllib  # type: ignore
+        except ImportError as e:
+            raise ImportError("Reading TARGETS_FILE on Python 3.10 needs the tomli package") from e
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def load_targets(
+    path: Optional[str] = None,
+    entries: Optional[list[dict[str, Any]]] = None,
+) -> dict[str, Target]:
+    """
+    Name -> Target for the built-in targets, then TARGETS (`entries`), then the [[targets]] tables of
+    the TOML file at `path` (TARGETS_FILE when None); later definitions replace earlier ones by name.
+    """
+    path = settings.TARGETS_FILE if path is None else path
+    raw = list(settings.TARGETS if entries is None else entries)
+    if path:
+        raw += _read_toml(path).get("targets", [])
+    registry = {t.name: t for t in builtin_targets()}
+    for entry in raw:
+        target = target_from_dict(entry)
+        registry[target.name] = target
+    return registry
+
+
+def select_targets(registry: dict[str, Target], names: Optional[list[str]] = None) -> list[Target]:
+    """The targets named in `names` (all of them, in registry order, if None); unknown names raise."""
+    if not names:
+        return list(registry.values())
+    unknown = [n for n in names if n not in registry]
+    if unknown:
+        raise ValueError(f"Unknown targets {unknown}. Registered: {sorted(registry)}")
+    return [registry[n] for n in names]
@@ -1,41 +1,70 @@
 import asyncio
+import re
+from typing import Any, Optional
+from collections.abc import Callable
 from playwright.async_api import Page
+from scrape_data.config import settings
 
-async def accept_cookies(page: Page) -> bool:
+_ROLE_NAME = re.compile(r"accept all|agree|go to end|reject all", re.IGNORECASE)
+
+
+async def _wait_visible(make_locator: Callable[[], Any], timeout_ms: int) -> Optional[Any]:
+    """Return the locator once it is visible, or None if it never shows up (or cannot be built)."""
+    try:
+        locator = make_locator()
+        await locator.wait_for(state="visible", timeout=timeout_ms)
+        return locator
+    except Exception:
+        return None
+
+
+async def _first_visible(candidates: list[Callable[[], Any]], timeout_ms: int) -> Optional[Any]:
+    """
+    Wait for all candidates at once and return the first one to become visible.
+    When several are already visible together, the earliest candidate in the list wins.
+    """
+    tasks = [asyncio.ensure_future(_wait_visible(c, timeout_ms)) for c in candidates]
+    pending = set(tasks)
+    try:
+        while pending:
+            _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            found = [t.result() for t in tasks if t.done() and t.result() is not None]
+            if found:
+                return found[0]
+        return None
+    finally:
+        for t in pending:
+            t.cancel()
+
+
+async def accept_cookies(
+    page: Page,
+    selectors: Optional[list[str]] = None,
+    timeout_ms: int = settings.COOKIE_WAIT_TIMEOUT_MS,
+) -> bool:
     """
     Try to accept cookies on the page if a consent dialog appears.
+    Every selector in every frame (plus a role-based fallback) is raced at once and only
+    the winning button is clicked, so a page without a banner costs one `timeout_ms`.
     Returns True if a button was clicked, False otherwise.
     """
-    cookie_button_selectors = [
-        "button:has-text('Accept all')",
-        "button:has-text('Agree')",
-        "button:has-text('I agree')",
-        "button:has-text('Go to end')",
-        "button:has-text('Reject all')",
+    cookie_button_selectors = selectors or settings.COOKIE_BUTTON_SELECTORS
+    await page.evaluate("window.scrollBy(0, document.body.scrollHeight / 2)")
+
+    # page.frames includes the main frame, so it covers the page itself as well
+    targets = list(page.frames) or [page]
+    candidates: list[Callable[[], Any]] = [
+        (lambda t=target, s=sel: t.locator(s).first)
+        for sel in cookie_button_selectors
+        for target in targets
     ]
-    for _ in range(2):
-        await page.evaluate("window.scrollBy(0, document.body.scrollHeight / 2)")
-        await asyncio.sleep(0.5)
-
-
-    for sel in cookie_button_selectors:
-        try:
-            await page.locator(sel).first.click(timeout=2000)
-            return True
-        except Exception:
-            continue
-
-    for frame in page.frames:
-        for sel in cookie_button_selectors:
-            try:
-                await frame.locator(sel).first.click(timeout=1500)
-                return True
-            except Exception:
-                continue
+    candidates.append(lambda: page.get_by_role("button", name=_ROLE_NAME).first)
 
+    button = await _first_visible(candidates, timeout_ms)
+    if button is None:
+        return False
     try:
-        btn = page.get_by_role("button", name=r"(?i)(accept all|agree|go to end|reject all)")
-        await btn.first.click(timeout=2000)
+        await button.click(timeout=timeout_ms)
         return True
     except Exception:
         return False
@@ -0,0 +1,124 @@
+"""Capture the JSON quote feed behind the dynamic indices table and map it to IndexData-shaped records."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Optional
+from collections.abc import Iterable, Iterator
+
+from scrape_data.config import settings
+
+logger = logging.getLogger(__name__)
+
+# IndexData alias -> candidate keys in a Yahoo quote object (first present key wins)
+FEED_FIELD_MAP: dict[str, tuple[str, ...]] = {
+    "Symbol": ("symbol",),
+    "Name": ("shortName", "longName", "displayName"),
+    "Last Price": ("regularMarketPrice",),
+    "Change": ("regularMarketChange",),
+    "% Change": ("regularMarketChangePercent",),
+    "Volume": ("regularMarketVolume",),
+}
+
+
+def _raw(value: Any) -> Any:
+    """Yahoo wraps many numbers as {'raw': 1.23, 'fmt': '1.23'}; unwrap to the raw value."""
+    if isinstance(value, dict):
+        return value.get("raw", value.get("fmt"))
+    return value
+
+
+def _quote_to_record(quote: dict[str, Any]) -> dict[str, Any]:
+    """Map one quote object onto the IndexData aliases used by the rendered table."""
+    record: dict[str, Any] = {}
+    for alias, keys in FEED_FIELD_MAP.items():
+        value = next((_raw(quote[k]) for k in keys if k in quote), None)
+        if alias == "% Change" and isinstance(value, (int, float)):
+            value = f"{value:+.2f}%"
+        record[alias] = value
+    return record
+
+
+def _iter_quote_lists(payload: Any) -> Iterator[list[dict[str, Any]]]:
+    """Yield every list of dicts in the payload whose items carry a 'symbol' key."""
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            if node and all(isinstance(x, dict) for x in node) and "symbol" in node[0]:
+                yield node
+            else:
+                stack.extend(node)
+
+
+def records_from_payload(payload: Any) -> list[dict[str, Any]]:
+    """Extract IndexData-shaped records from a captured JSON payload (empty list if none)."""
+    records: list[dict[str, Any]] = []
+    seen: set[str] = set()
+    for quotes in _iter_quote_lists(payload):
+        for quote in quotes:
+            rec = _quote_to_record(quote)
+            if rec["Symbol"] and rec["Symbol"] not in seen:
+                seen.add(rec["Symbol"])
+                records.append(rec)
+    return records
+
+
+class FeedCapture:
+    """
+    Listen to a page's responses and keep the records from JSON feeds matching `url_patterns`.
+
+    Call `attach(page)` before navigation, then `await wait_for_records(timeout_ms)`. The quote
+    endpoint also serves the page's ticker strip, so the first matching response is not
+    necessarily the table's: the capture keeps listening until no new feed arrived for
+    `settle_ms` (DYNAMIC_FEED_SETTLE_MS) and returns the records of the largest feed.
+    """
+
+    def __init__(self, url_patterns: Optional[Iterable[str]] = None, settle_ms: Optional[int] = None) -> None:
+        patterns = settings.DYNAMIC_FEED_URL_PATTERNS if url_patterns is None else url_patterns
+        self.url_patterns = tuple(patterns)
+        self.settle_ms = settings.DYNAMIC_FEED_SETTLE_MS if settle_ms is None else settle_ms
+        self.feeds: list[list[dict[str, Any]]] = []
+        self._arrived = asyncio.Event()
+
+    @property
+    def records(self) -> list[dict[str, Any]]:
+        """Records of the largest feed seen so far (the table's, not the ticker strip's)."""
+        return max(self.feeds, key=len, default=[])
+
+    def matches(self, url: str) -> bool:
+        return any(p in url for p in self.url_patterns)
+
+    def attach(self, page: Any) -> None:
+        page.on("response", self._on_response)
+
+    async def _on_response(self, response: Any) -> None:
+        if not self.matches(response.url):
+            return
+        try:
+            payload = await response.json()
+        except Exception as e:
+            logger.debug("FeedCapture: non-JSON response from %s: %s", response.url, e)
+            return
+        records = records_from_payload(payload)
+        if records:
+            self.feeds.append(records)
+            self._arrived.set()
+
+    async def wait_for_records(self, timeout_ms: int) -> Optional[list[dict[str, Any]]]:
+        """Return captured records, or None if no matching feed arrived within `timeout_ms`."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_ms / 1000
+        try:
+            await asyncio.wait_for(self._arrived.wait(), timeout=timeout_ms / 1000)
+        except asyncio.TimeoutError:
+            return None
+        while (remaining := deadline - loop.time()) > 0:
+            self._arrived.clear()
+            try:
+                await asyncio.wait_for(self._arrived.wait(), timeout=min(self.settle_ms / 1000, remaining))
+            except asyncio.TimeoutError:
+                break
+        return list(self.records)
@@ -0,0 +1,65 @@
+"""Playwright request interception that aborts unneeded assets and ad/tracker traffic."""
+from __future__ import annotations
+
+import logging
+import re
+from collections import Counter
+from typing import Any, Optional
+from collections.abc import Iterable
+
+from scrape_data.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceBlocker:
+    """
+    Route handler for a Playwright BrowserContext.
+
+    A request is aborted when its resource type is in `resource_types` or its URL
+    contains any of `url_patterns` (plain substrings, e.g. 'doubleclick.net').
+    `blocked` counts aborted requests per resource type; `allowed` counts the rest.
+    """
+
+    def __init__(
+        self,
+        resource_types: Optional[Iterable[str]] = None,
+        url_patterns: Optional[Iterable[str]] = None,
+    ) -> None:
+        types = settings.BLOCKED_RESOURCE_TYPES if resource_types is None else resource_types
+        patterns = settings.BLOCKED_URL_PATTERNS if url_patterns is None else url_patterns
+        self.resource_types = frozenset(t.lower() for t in types)
+        patterns = [p for p in patterns if p]
+        # one alternation regex keeps the per-request check to a single scan of the URL
+        self._url_re = re.compile("|".join(re.escape(p) for p in patterns)) if patterns else None
+        self.blocked: Counter[str] = Counter()
+        self.allowed = 0
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """Return True if a request with this resource type / URL should be aborted."""
+        if resource_type in self.resource_types:
+            return True
+        return bool(self._url_re and self._url_re.search(url))
+
+    async def handle(self, route: Any) -> None:
+        """Playwright route callback: abort blocked requests, continue everything else."""
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.blocked[request.resource_type] += 1
+            await route.abort()
+        else:
+            self.allowed += 1
+            await route.continue_()
+
+    async def attach(self, context: Any) -> None:
+        """Install this blocker on every request made by `context`."""
+        await context.route("**/*", self.handle)
+
+    @property
+    def total_blocked(self) -> int:
+        return sum(self.blocked.values())
+
+    def summary(self) -> str:
+        """Human-readable one-line summary for logs."""
+        by_type = ", ".join(f"{k}={v}" for k, v in self.blocked.most_common())
+        return f"blocked={self.total_blocked} allowed={self.allowed} ({by_type or 'none'})"
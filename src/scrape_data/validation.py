@@ -0,0 +1,218 @@
+"""Columnar validation of cleaned tables against Pydantic row models."""
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Optional, Type
+
+import numpy as np
+import pandas as pd  # type: ignore
+from pydantic import BaseModel  # type: ignore
+
+from .cleaned_table import python_columns
+from .cleaning_plan import row_model
+
+logger = logging.getLogger(__name__)
+
+_INT_KINDS = ("integer", "empty")
+_FLOAT_KINDS = ("integer", "floating", "mixed-integer-float", "decimal", "empty")
+_STR_KINDS = ("string", "empty")
+
+
+@dataclass
+class ValidationReport:
+    """
+    Outcome of validating a table column by column.
+
+    Args:
+        model: The row model the table was checked against.
+        valid: Boolean mask, True for rows that passed every column check.
+        failures: Field alias -> positions of the rows failing that column's checks.
+    """
+    model: Type[BaseModel]
+    valid: np.ndarray
+    failures: dict[str, list[int]] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return bool(self.valid.all())
+
+    @property
+    def invalid_rows(self) -> list[int]:
+        return np.flatnonzero(~self.valid).tolist()
+
+    def summary(self, limit: int = 5) -> dict[str, Any]:
+        """Failing row counts per column, with the first `limit` row positions of each."""
+        return {alias: {"count": len(rows), "rows": rows[:limit]} for alias, rows in self.failures.items()}
+
+
+def _constraint(model_field: Any, name: str) -> Any:
+    value = getattr(model_field.type_, name, None)
+    return value if value is not None else getattr(model_field.field_info, name, None)
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or value is pd.NA or (isinstance(value, float) and value != value)
+
+
+def _per_value(series: pd.Series, check: Any) -> np.ndarray:
+    """Run `check` on each non-missing value (missing values pass; nullability is checked separately)."""
+    values = series.to_numpy(dtype=object)
+    return np.fromiter((_is_missing(v) or check(v) for v in values), dtype=bool, count=len(values))
+
+
+def _pydantic_accepts(model_field: Any, model: Type[BaseModel], value: Any) -> bool:
+    _, error = model_field.validate(value, {}, loc=model_field.alias, cls=model)
+    return error is None
+
+
+def _type_mask(series: pd.Series, model_field: Any, model: Type[BaseModel]) -> np.ndarray:
+    """True where the (non-null) value is acceptable for the field type; nulls are handled separately."""
+    field_type = model_field.type_
+    kind = pd.api.types.infer_dtype(series, skipna=True)
+    strict = bool(getattr(field_type, "strict", False))
+    if not isinstance(field_type, type):
+        return _per_value(series, lambda v: _pydantic_accepts(model_field, model, v))
+    if issubclass(field_type, bool):
+        if kind in ("boolean", "empty"):
+            return np.ones(len(series), dtype=bool)
+    elif issubclass(field_type, int):
+        if kind in _INT_KINDS:
+            return np.ones(len(series), dtype=bool)
+        if kind in ("floating", "mixed-integer-float") and not strict:
+            values = series.to_numpy(dtype="float64", na_value=np.nan)
+            return np.isnan(values) | (np.isfinite(values) & (values == np.trunc(values)))
+        if strict:
+            return _per_value(series, lambda v: isinstance(v, int) and not isinstance(v, bool))
+    elif issubclass(field_type, float):
+        if kind in _FLOAT_KINDS:
+            return np.ones(len(series), dtype=bool)
+        if not strict:
+            return pd.to_numeric(series, errors="coerce").notna().to_numpy() | series.isna().to_numpy()
+    elif issubclass(field_type, str):
+        if kind in _STR_KINDS or (not strict and kind in ("integer", "floating", "mixed-integer-float")):
+            return np.ones(len(series), dtype=bool)
+        return _per_value(series, lambda v: isinstance(v, str))
+
+    # anything else (nested models, dates, unusual mixes): ask pydantic, one value at a time
+    return _per_value(series, lambda v: _pydantic_accepts(model_field, model, v))
+
+
+def _constraint_mask(series: pd.Series, model_field: Any) -> np.ndarray:
+    """True where the value satisfies the numeric bounds / length / regex constraints of the field."""
+    ok = np.ones(len(series), dtype=bool)
+    bounds = {name: _constraint(model_field, name) for name in ("gt", "ge", "lt", "le")}
+    if any(v is not None for v in bounds.values()):
+        values = pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        with np.errstate(invalid="ignore"):
+            if bounds["gt"] is not None:
+                ok &= ~(values <= bounds["gt"])
+            if bounds["ge"] is not None:
+                ok &= ~(values < bounds["ge"])
+            if bounds["lt"] is not None:
+                ok &= ~(values >= bounds["lt"])
+            if bounds["le"] is not None:
+                ok &= ~(values > bounds["le"])
+    min_length = _constraint(model_field, "min_length")
+    max_length = _constraint(model_field, "max_length")
+    regex = _constraint(model_field, "regex")
+    if min_length is not None or max_length is not None or regex is not None:
+        text = series.astype("string")
+        if min_length is not None:
+            ok &= (text.str.len() >= min_length).fillna(True).to_numpy(dtype=bool)
+        if max_length is not None:
+            ok &= (text.str.len() <= max_length).fillna(True).to_numpy(dtype=bool)
+        if regex is not None:
+            pattern = regex.pattern if isinstance(regex, re.Pattern) else regex
+            ok &= text.str.match(pattern).fillna(True).to_numpy(dtype=bool)
+    return ok
+
+
+def validate_frame(df: pd.DataFrame, model: Type[BaseModel]) -> ValidationReport:
+    """
+    Check every column of `df` against the matching field of `model` (table models are resolved
+    to their row model) with vectorized masks: nullability, type and declared constraints.
+    Columns missing from `df` fail every row when the field is required.
+    """
+    model = row_model(model)
+    n = len(df)
+    valid = np.ones(n, dtype=bool)
+    failures: dict[str, list[int]] = {}
+    for model_field in model.__fields__.values():  # type: ignore[attr-defined]
+        alias = model_field.alias
+        if alias not in df.columns:
+            if model_field.required:
+                column_ok = np.zeros(n, dtype=bool)
+            else:
+                continue
+        else:
+            series = df[alias]
+            column_ok = _type_mask(series, model_field, model) & _constraint_mask(series, model_field)
+            if not model_field.allow_none:
+                column_ok &= ~series.isna().to_numpy()
+        if not column_ok.all():
+            failures[alias] = np.flatnonzero(~column_ok).tolist()
+        valid &= column_ok
+    return ValidationReport(model=model, valid=valid, failures=failures)
+
+
+def _exact_kinds(field_type: Any) -> tuple[str, ...]:
+    if not isinstance(field_type, type):
+        return ("empty",)
+    if issubclass(field_type, bool):
+        return ("boolean", "empty")
+    if issubclass(field_type, int):
+        return _INT_KINDS
+    if issubclass(field_type, float):
+        return ("floating", "empty")
+    if issubclass(field_type, str):
+        return _STR_KINDS
+    return ("empty",)
+
+
+def _cast(series: pd.Series, model_field: Any, model: Type[BaseModel]) -> pd.Series:
+    """
+    Convert a validated column to the values pydantic would have stored: _type_mask accepts
+    coercible kinds (ints for str fields, integral floats for int fields, ...) that construct()
+    would otherwise keep as they are.
+    """
+    field_type = model_field.type_
+    kind = pd.api.types.infer_dtype(series, skipna=True)
+    if kind in _exact_kinds(field_type):
+        return series
+    numeric = kind in ("integer", "floating", "mixed-integer-float")
+    if isinstance(field_type, type) and not issubclass(field_type, bool) and numeric:
+        if issubclass(field_type, int):
+            return series.astype("Int64")
+        if issubclass(field_type, float):
+            return series.astype("Float64")
+        if issubclass(field_type, str):
+            return series.astype("string")
+
+    def coerce(value: Any) -> Any:
+        if _is_missing(value):
+            return None
+        coerced, error = model_field.validate(value, {}, loc=model_field.alias, cls=model)
+        return value if error else coerced
+
+    return pd.Series([coerce(v) for v in series.to_numpy(dtype=object)], index=series.index, dtype=object)
+
+
+def materialize(df: pd.DataFrame, model: Type[BaseModel], mask: Optional[np.ndarray] = None) -> list[BaseModel]:
+    """
+    Build row model instances with construct() (no second validation pass) for the rows
+    selected by `mask` (all rows if None). Columns are first cast to their field types, so the
+    instances hold the same values validation would give; missing values become None.
+    """
+    model = row_model(model)
+    rows = df if mask is None else df[mask]
+    fields = {f.alias: f for f in model.__fields__.values()}  # type: ignore[attr-defined]
+    columns = [c for c in rows.columns if c in fields]
+    keys = [fields[c].name for c in columns]
+    rows = pd.DataFrame({c: _cast(rows[c], fields[c], model) for c in columns}, index=rows.index)
+    values = python_columns(rows, columns)
+    construct = model.construct
+    if not columns:
+        return [construct() for _ in range(len(rows))]
+    return [construct(**dict(zip(keys, row, strict=True))) for row in zip(*values, strict=True)]
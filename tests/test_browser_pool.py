@@ -0,0 +1,219 @@
+import pytest
+import scrape_data.browser_pool as bp
+import scrape_data.scrape_web_data as swd
+
+
+class DummyPage:
+    async def goto(self, *a, **kw): return None
+    async def close(self): return None
+
+
+class DummyContext:
+    def __init__(self, counters):
+        self.counters = counters
+        self.closed = False
+    async def add_init_script(self, *a, **kw): return None
+    async def route(self, *a, **kw): return None
+    async def new_page(self): return DummyPage()
+    async def close(self):
+        self.closed = True
+        self.counters["contexts_closed"] += 1
+
+
+class DummyBrowser:
+    def __init__(self, counters): self.counters = counters
+    async def new_context(self, *a, **kw):
+        self.counters["contexts"] += 1
+        return DummyContext(self.counters)
+    def is_connected(self): return True
+    async def close(self): return None
+
+
+def install_dummy_playwright(monkeypatch):
+    counters = {"launches": 0, "contexts": 0, "contexts_closed": 0}
+
+    class DummyChromium:
+        async def launch(self, *a, **kw):
+            counters["launches"] += 1
+            return DummyBrowser(counters)
+
+    class DummyPlaywright:
+        chromium = DummyChromium()
+        async def start(self): return self
+        async def stop(self): return None
+
+    monkeypatch.setattr(bp, "async_playwright", lambda: DummyPlaywright())
+    return counters
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_browser_and_recycles_contexts(monkeypatch):
+    counters = install_dummy_playwright(monkeypatch)
+
+    async with bp.BrowserPool(max_contexts=1, max_uses_per_context=2) as pool:
+        for _ in range(5):
+            async with pool.page() as page:
+                await page.goto("http://fake-url")
+
+    assert counters["launches"] == 1
+    # 5 pages with 2 uses per context -> contexts created for pages 1, 3 and 5
+    assert counters["contexts"] == 3
+    assert counters["contexts_closed"] == 3
+
+
+@pytest.mark.asyncio
+async def test_pool_discards_context_after_failure(monkeypatch):
+    counters = install_dummy_playwright(monkeypatch)
+
+    async with bp.BrowserPool(max_contexts=1, max_uses_per_context=10) as pool:
+        with pytest.raises(RuntimeError):
+            async with pool.page():
+                raise RuntimeError("navigation failed")
+        async with pool.page():
+            pass
+
+    assert counters["contexts"] == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_dynamic_retries_share_one_browser(monkeypatch):
+    counters = install_dummy_playwright(monkeypatch)
+    attempts = {"n": 0}
+
+    async def fake_accept_cookies(page): return False
+    monkeypatch.setattr(swd, "accept_cookies", fake_accept_cookies)
+
+    class FlakyPage(DummyPage):
+        async def wait_for_selector(self, *a, **kw):
+            attempts["n"] += 1
+            if attempts["n"] == 1:
+                raise RuntimeError("table not rendered yet")
+        def locator(self, *a, **kw):
+            class Loc:
+                first = None
+                async def inner_html(self): return "<tr><td>x</td></tr>"
+            loc = Loc()
+            loc.first = loc
+            return loc
+
+    monkeypatch.setattr(DummyContext, "new_page", lambda self: _coro(FlakyPage()))
+
+    async def no_sleep(*a, **kw): return None
+    monkeypatch.setattr("scrape_data.utils.decorators.asyncio.sleep", no_sleep)
+
+    html = await swd.fetch_dynamic_table_content("http://fake-url")
+    assert html == "<table><tr><td>x</td></tr></table>"
+    assert attempts["n"] == 2
+    assert counters["launches"] == 1
+
+
+async def _coro(value):
+    return value
+
+
+@pytest.mark.asyncio
+async def test_storage_state_saved_after_consent_and_reused(monkeypatch, tmp_path):
+    state_path = tmp_path / "state" / "storage.json"
+    context_kwargs = []
+    consent_calls = {"n": 0}
+
+    class StatefulContext(DummyContext):
+        async def storage_state(self, path):
+            with open(path, "w") as f:
+                f.write("{}")
+
+    class StatefulPage(DummyPage):
+        def __init__(self, context): self.context = context
+        async def wait_for_selector(self, *a, **kw): return None
+        def locator(self, *a, **kw):
+            class Loc:
+                first = None
+                async def inner_html(self): return "<tr></tr>"
+            loc = Loc()
+            loc.first = loc
+            return loc
+
+    class StatefulBrowser(DummyBrowser):
+        async def new_context(self, *a, **kw):
+            context_kwargs.append(kw)
+            ctx = StatefulContext({"contexts_closed": 0})
+            ctx.new_page = lambda: _coro(StatefulPage(ctx))
+            return ctx
+
+    class DummyChromium:
+        async def launch(self, *a, **kw): return StatefulBrowser({})
+
+    class DummyPlaywright:
+        chromium = DummyChromium()
+        async def start(self): return self
+        async def stop(self): return None
+
+    async def fake_accept_cookies(page):
+        consent_calls["n"] += 1
+        return True
+
+    monkeypatch.setattr(bp, "async_playwright", lambda: DummyPlaywright())
+    monkeypatch.setattr(swd, "accept_cookies", fake_accept_cookies)
+
+    for _ in range(2):
+        async with bp.BrowserPool(storage_state_path=str(state_path), block_resources=False) as pool:
+            await swd.fetch_dynamic_table_content("http://fake-url", pool=pool)
+
+    assert state_path.exists()
+    # cold run clicks the banner; the warm run loads the saved state and skips it
+    assert consent_calls["n"] == 1
+    assert "storage_state" not in context_kwargs[0]
+    assert context_kwargs[1]["storage_state"] == str(state_path)
+
+
+@pytest.mark.asyncio
+async def test_expired_consent_state_is_recovered_and_saved_again(monkeypatch, tmp_path):
+    state_path = tmp_path / "storage.json"
+    state_path.write_text("{}")
+    state = {"banner": True, "waits": 0, "clicks": 0, "saves": 0}
+
+    class BannerPage(DummyPage):
+        def __init__(self, context): self.context = context
+        async def wait_for_selector(self, *a, **kw):
+            state["waits"] += 1
+            if state["banner"]:
+                raise swd.PlaywrightTimeoutError("table hidden behind the consent banner")
+        def locator(self, *a, **kw):
+            class Loc:
+                first = None
+                async def inner_html(self): return "<tr></tr>"
+            loc = Loc()
+            loc.first = loc
+            return loc
+
+    class StatefulContext(DummyContext):
+        async def storage_state(self, path):
+            state["saves"] += 1
+
+    class StatefulBrowser(DummyBrowser):
+        async def new_context(self, *a, **kw):
+            ctx = StatefulContext({"contexts_closed": 0})
+            ctx.new_page = lambda: _coro(BannerPage(ctx))
+            return ctx
+
+    class DummyChromium:
+        async def launch(self, *a, **kw): return StatefulBrowser({})
+
+    class DummyPlaywright:
+        chromium = DummyChromium()
+        async def start(self): return self
+        async def stop(self): return None
+
+    async def fake_accept_cookies(page):
+        clicked, state["banner"] = state["banner"], False
+        state["clicks"] += clicked
+        return clicked
+
+    monkeypatch.setattr(bp, "async_playwright", lambda: DummyPlaywright())
+    monkeypatch.setattr(swd, "accept_cookies", fake_accept_cookies)
+
+    async with bp.BrowserPool(storage_state_path=str(state_path), block_resources=False) as pool:
+        html = await swd.fetch_dynamic_table_content("http://fake-url", pool=pool)
+
+    assert html == "<table><tr></tr></table>"
+    assert state == {"banner": False, "waits": 2, "clicks": 1, "saves": 1}
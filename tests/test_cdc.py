@@ -0,0 +1,61 @@
+import gzip
+import json
+
+import pandas as pd
+
+import scrape_data.cdc as cdc
+from scrape_data.cleaned_table import CleanedTable
+
+
+def _snapshot(prices, volumes=None):
+    symbols = list(prices)
+    return CleanedTable(pd.DataFrame({
+        "Symbol": symbols,
+        "Last Price": [prices[s] for s in symbols],
+        "Volume": pd.array([(volumes or {}).get(s) for s in symbols], dtype="Int64"),
+    }))
+
+
+def test_diff_snapshots_classifies_rows_by_key():
+    previous = _snapshot({"^A": 1.0, "^B": 2.0, "^C": 3.0}, {"^A": 10})
+    current = _snapshot({"^A": 1.0, "^B": 2.5, "^D": 4.0}, {"^A": 11})
+    changes = cdc.diff_snapshots(previous, current)
+
+    assert changes.counts() == {"insert": 1, "update": 2, "delete": 1}
+    assert list(changes.inserted["Symbol"]) == ["^D"]
+    assert list(changes.deleted["Symbol"]) == ["^C"]
+    assert list(changes.updated["Symbol"]) == ["^A", "^B"]
+    assert changes.changed == [["Volume"], ["Last Price"]]
+
+
+def test_missing_values_and_reloaded_dtypes_are_not_changes(tmp_path):
+    table = _snapshot({"^A": 1.0, "^B": 2.0}, {"^A": 5})
+    state = tmp_path / "state.jsonl"
+    cdc.save_state(table, str(state))
+    assert len(cdc.diff_snapshots(cdc.load_state(str(state)), table)) == 0
+    assert len(cdc.diff_snapshots(table, table)) == 0
+
+
+def test_first_snapshot_is_all_inserts():
+    changes = cdc.diff_snapshots(None, [{"Symbol": "^A", "Last Price": 1.0}])
+    assert changes.counts() == {"insert": 1, "update": 0, "delete": 0}
+
+
+def test_capture_changes_appends_only_changed_rows(tmp_path):
+    base = str(tmp_path / "dyn")
+    cdc.capture_changes(_snapshot({"^A": 1.0, "^B": 2.0}), base)
+    cdc.capture_changes(_snapshot({"^A": 1.0, "^B": 2.0}), base)
+    cdc.capture_changes(_snapshot({"^A": 1.5}), base)
+
+    lines = [json.loads(line) for line in (tmp_path / "dyn.delta.jsonl").read_text().splitlines()]
+    assert [(line["op"], line["Symbol"]) for line in lines] == [
+        ("insert", "^A"), ("insert", "^B"), ("update", "^A"), ("delete", "^B"),
+    ]
+    assert lines[2]["changed"] == ["Last Price"] and lines[2]["Last Price"] == 1.5
+
+
+def test_write_jsonl_append_keeps_gzip_members(tmp_path):
+    out = tmp_path / "d.jsonl.gz"
+    cdc.write_jsonl([{"a": 1}], str(out), "gzip", append=True)
+    cdc.write_jsonl([{"a": 2}], str(out), "gzip", append=True)
+    assert [json.loads(line) for line in gzip.decompress(out.read_bytes()).splitlines()] == [{"a": 1}, {"a": 2}]
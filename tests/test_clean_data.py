@@ -25,6 +25,19 @@ def test_parse_float_nullable():
     assert pytest.approx(out.iloc[1], rel=1e-9) == 3.2
     assert pd.isna(out.iloc[2]) and pd.isna(out.iloc[3]) and pd.isna(out.iloc[4])
 
+def test_parse_numeric_handles_signs_percent_and_null_tokens():
+    s = pd.Series(["-1,234.5", "+0.98%", " 12 % ", "--", "N/A", "1e3", "1.5"], dtype=object)
+    out = _parse_float_nullable(s)
+    assert list(out[:3]) == [-1234.5, 0.98, 12.0]
+    assert out[3:5].isna().all()
+    assert list(out[5:]) == [1000.0, 1.5]
+    # non-integral values cannot be represented as Int64 and become missing
+    assert list(_parse_int_nullable(s)) == [pd.NA, pd.NA, pd.NA, pd.NA, pd.NA, 1000, pd.NA]
+
+def test_parse_int_nullable_rejects_percentages():
+    out = _parse_int_nullable(pd.Series(["12%", "12 %", "12", "1,200"], dtype=object))
+    assert list(out) == [pd.NA, pd.NA, 12, 1200]
+
 def test_parse_volume_value():
     assert _parse_volume_value("1.2K") == 1200
     assert _parse_volume_value("3.4M") == 3_400_000
@@ -39,6 +52,17 @@ def test_parse_volume_column():
     out = _parse_volume_column(s)
     assert list(out.astype("Int64")) == [1000, 2_000_000, 3000, pd.NA]
 
+def test_parse_volume_column_matches_scalar_parser():
+    cells = ["1.2K", "3.4m", " 5.5 B", "-1.5K", "+3K", ".5K", "12.", "1,2,3", "1e5", "2.5e3K",
+             "1.005K", "1234567890123456789", "--", "-", "", "nan", None, float("nan"), "K", "1..2", 7, 3.9]
+    s = pd.Series(cells, dtype=object)
+    expected = pd.Series([_parse_volume_value(c) for c in cells], dtype="Int64")
+    assert _parse_volume_column(s).equals(expected)
+
+def test_parse_volume_column_numeric_input_and_overflow():
+    assert list(_parse_volume_column(pd.Series([1.9, 2.0, None]))) == [1, 2, pd.NA]
+    assert _parse_volume_column(pd.Series(["1e30"], dtype=object)).isna().all()
+
 
 def test_clean_static_data_success(monkeypatch):
     monkeypatch.setattr(m.settings, "REQUIRED_COLUMNS_STATIC", ["Country", "Population 2025"], raising=False)
@@ -119,3 +143,45 @@ def test_validate_with_model_table_wrapper(monkeypatch):
     validated = _validate_with_model(records, Table)
     assert hasattr(validated, "rows")
     assert validated.rows[1].Country == "B"
+
+def test_clean_dynamic_data_from_feed_records():
+    records = [
+        {"Symbol": "^ABC", "Name": "ABC", "Last Price": 1234.56, "Change": 3.21, "% Change": "+0.26%", "Volume": 1200000},
+        {"Symbol": "^DEF", "Name": "DEF", "Last Price": None, "Change": -0.5, "% Change": "-0.10%", "Volume": None},
+    ]
+    out = clean_dynamic_data(records)
+    assert out[0]["Symbol"] == "^ABC"
+    assert abs(out[0]["Last Price"] - 1234.56) < 1e-9
+    assert out[0]["Volume"] == 1_200_000
+    assert pd.isna(out[1]["Last Price"])
+    assert out[1]["Volume"] is None or pd.isna(out[1]["Volume"])
+
+def test_clean_dynamic_data_from_js_arrays():
+    arrays = {
+        "headers": ["Symbol", "Last Price", "Change", "Volume"],
+        "rows": [["^ABC", "1,234.56", "+3.21", "1.2M"], ["^DEF", "", "-0.5"]],
+    }
+    out = clean_dynamic_data(arrays)
+    assert out[0]["Symbol"] == "^ABC"
+    assert abs(out[0]["Last Price"] - 1234.56) < 1e-9
+    assert abs(out[0]["Change"] - 3.21) < 1e-9
+    assert out[0]["Volume"] == 1_200_000
+    assert pd.isna(out[1]["Last Price"])
+    assert out[1]["Volume"] is None or pd.isna(out[1]["Volume"])
+
+def test_clean_data_with_target_locator_and_custom_model():
+    from pydantic import BaseModel, Field
+
+    class Rate(BaseModel):
+        pair: str = Field(alias="Pair")
+        rate: float = Field(alias="Rate")
+
+    html = """
+    <table id="old"><tr><th>Pair</th><th>Rate</th></tr><tr><td>EUR/USD</td><td>1.00</td></tr></table>
+    <table id="new"><tr><th>Pair</th><th>Rate</th></tr><tr><td>EUR/USD</td><td>1.10</td></tr></table>
+    """
+    out = clean_static_data(html, model=Rate, locator=m.TableLocator(table_id="new"))
+    assert out == [{"Pair": "EUR/USD", "Rate": 1.1}]
+    # without a locator the first table carrying all of the model's columns is used
+    assert clean_static_data(html, model=Rate)[0]["Rate"] == 1.0
+    assert clean_dynamic_data(html, locator=m.TableLocator(table_id="missing")) is None
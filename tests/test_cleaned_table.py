@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from scrape_data.cleaned_table import CleanedTable
+from scrape_data.clean_data import clean_dynamic_data
+
+
+def _table():
+    return CleanedTable(pd.DataFrame({
+        "Symbol": ["^A", "^B", "^C"],
+        "Volume": pd.array([10, None, 30], dtype="Int64"),
+    }))
+
+
+def test_row_view_builds_plain_dicts_on_demand():
+    table = _table()
+    assert len(table) == 3 and bool(table)
+    assert table[0] == {"Symbol": "^A", "Volume": 10}
+    assert table[-2] == {"Symbol": "^B", "Volume": None}
+    assert table[1:] == [{"Symbol": "^B", "Volume": None}, {"Symbol": "^C", "Volume": 30}]
+    assert [r["Symbol"] for r in table] == ["^A", "^B", "^C"]
+    with pytest.raises(IndexError):
+        table[3]
+
+
+def test_equality_and_records_round_trip():
+    table = _table()
+    assert table == table.to_records()
+    assert table == _table()
+    assert not CleanedTable(pd.DataFrame({"a": []}))
+
+
+def test_clean_functions_return_columnar_result_on_request():
+    arrays = {"headers": ["Symbol", "Volume"], "rows": [["^A", "1.2K"], ["^B", "--"]]}
+    table = clean_dynamic_data(arrays, output="frame")
+    assert isinstance(table, CleanedTable)
+    assert str(table.frame["Volume"].dtype) == "Int64"
+    assert table == clean_dynamic_data(arrays)
+    with pytest.raises(ValueError):
+        clean_dynamic_data(arrays, output="arrow")
@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+from pydantic import BaseModel, Field
+
+import scrape_data.cleaning_plan as cp
+from scrape_data.dynamic_models import IndexData, IndexTable
+from scrape_data.static_models import CountryData, PopulationTable
+
+
+def test_plan_for_index_data_uses_field_types_and_registered_parser():
+    plan = cp.compile_plan(IndexData)
+    assert plan.keep == ("Symbol", "Name", "Last Price", "Change", "% Change", "Volume")
+    assert plan.parsers == (("Last Price", "float"), ("Change", "float"), ("Volume", "volume"))
+
+
+def test_table_model_resolves_to_row_model_and_plans_are_cached():
+    assert cp.row_model(PopulationTable) is CountryData
+    assert cp.compile_plan(IndexTable) == cp.compile_plan(IndexData)
+    assert cp.compile_plan(CountryData, ("Country",)) is cp.compile_plan(CountryData, ("Country",))
+
+
+def test_required_columns_are_kept_first():
+    plan = cp.compile_plan(CountryData, ("Country", "Population 2025"))
+    assert plan.keep[:2] == ("Country", "Population 2025")
+    assert "Yearly Change" in plan.keep
+    assert plan.parsers == (("Population 2025", "int"),)
+
+
+def test_project_drops_unplanned_columns():
+    plan = cp.compile_plan(CountryData)
+    df = pd.DataFrame({"#": [1], "Country (or dependency)": ["A"], "Density": [5]})
+    assert list(plan.project(df).columns) == ["Country (or dependency)"]
+
+
+def test_unknown_parser_is_rejected():
+    class Row(BaseModel):
+        size: int = Field(alias="Size")
+
+    with pytest.raises(ValueError):
+        cp.register_parsers(Row, {"Size": "bogus"})
+
+
+def test_parser_mapping_stays_out_of_the_model_schema():
+    assert "parser" not in IndexData.schema()["properties"]["Volume"]
+
+
+def test_new_models_need_no_cleaning_code():
+    from scrape_data.clean_data import clean_dynamic_data
+
+    class Quote(BaseModel):
+        ticker: str = Field(alias="Ticker")
+        shares: int = Field(alias="Shares")
+        ratio: float = Field(alias="Ratio")
+
+    cp.register_parsers(Quote, {"Shares": "volume"})
+
+    arrays = {"headers": ["Ticker", "Shares", "Ratio", "Extra"], "rows": [["X", "2.5K", "-1,000.5%", "dropped"]]}
+    assert clean_dynamic_data(arrays, model=Quote) == [{"Ticker": "X", "Shares": 2500, "Ratio": -1000.5}]
@@ -0,0 +1,42 @@
+import pandas as pd
+
+import scrape_data.dedup as dd
+from scrape_data.cleaned_table import CleanedTable
+
+PAGE = """<html><body><p>Updated {stamp}</p>
+<table><thead><tr><th>Country (or dependency)</th><th>Population 2025</th></tr></thead>
+<tbody><tr><td>A</td><td>{pop}</td></tr></tbody></table></body></html>"""
+
+
+def test_fragment_digest_ignores_content_around_the_table():
+    first = dd.fragment_digest("static", PAGE.format(stamp="09:00", pop="1,000"))
+    assert first == dd.fragment_digest("static", PAGE.format(stamp="10:00", pop="1,000"))
+    assert first != dd.fragment_digest("static", PAGE.format(stamp="10:00", pop="1,001"))
+    assert dd.fragment_digest("dynamic", {"headers": ["Symbol"], "rows": [["^A"]]}) == dd.fragment_digest(
+        "dynamic", {"rows": [["^A"]], "headers": ["Symbol"]}
+    )
+    assert dd.fragment_digest("static", None) is None
+
+
+def test_records_digest_matches_tables_and_frames():
+    frame = pd.DataFrame({"Symbol": ["^A", "^B"], "Volume": pd.array([1, None], dtype="Int64")})
+    assert dd.records_digest(CleanedTable(frame)) == dd.records_digest(frame.copy())
+    assert dd.records_digest(frame) != dd.records_digest(frame.rename(columns={"Volume": "Vol"}))
+    assert dd.records_digest(frame) != dd.records_digest(frame.iloc[:1])
+
+
+def test_manifest_compares_with_newest_entry_of_an_existing_output(tmp_path, monkeypatch):
+    monkeypatch.setattr(dd.settings, "DEDUP_MANIFEST_NAME", "m.json")
+    out = tmp_path / "out.json"
+    manifest = dd.RunManifest.for_output(str(out))
+    manifest.record(str(out), fragment="f1", records="r1")
+    assert not manifest.unchanged(str(out), fragment="f1")  # output file is gone
+
+    out.write_text("[]")
+    reloaded = dd.RunManifest(str(tmp_path / "m.json"), history=2)
+    assert reloaded.unchanged(str(out), fragment="f1")
+    reloaded.record(str(out), fragment="f2", records="r2")
+    reloaded.record(str(out), fragment="f3", records="r3")
+    assert not reloaded.unchanged(str(out), fragment="f1", records="r2")
+    assert reloaded.unchanged(str(out), records="r3")
+    assert [e["fragment"] for e in reloaded._entries[str(out)]] == ["f2", "f3"]
@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+from scrape_data.http_cache import HttpCache
+from scrape_data.http_client import HttpResponse
+import scrape_data.scrape_web_data as swd
+
+
+def test_store_and_validators_roundtrip(tmp_path):
+    cache = HttpCache(directory=str(tmp_path))
+    assert cache.validators("http://a") == {}
+
+    cache.store("http://a", "<html>a</html>", etag='"abc"', last_modified="Wed, 01 Oct 2025 00:00:00 GMT")
+    assert cache.validators("http://a") == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Wed, 01 Oct 2025 00:00:00 GMT",
+    }
+    # index survives a reload
+    again = HttpCache(directory=str(tmp_path))
+    assert again.load_body("http://a") == "<html>a</html>"
+
+
+def test_cleaned_records_are_serialized_and_dropped_on_new_body(tmp_path):
+    cache = HttpCache(directory=str(tmp_path))
+    cache.store("http://a", "v1", etag='"1"', last_modified=None)
+    cache.store_cleaned("http://a", [{"Population 2025": pd.NA, "Country": "A"}])
+    assert cache.load_cleaned("http://a") == [{"Population 2025": None, "Country": "A"}]
+
+    cache.store("http://a", "v2", etag='"2"', last_modified=None)
+    assert cache.load_cleaned("http://a") is None
+
+
+def test_cleaned_variants_of_one_page_are_kept_apart(tmp_path):
+    cache = HttpCache(directory=str(tmp_path))
+    cache.store("http://a", "v1", etag='"1"', last_modified=None)
+    cache.store_cleaned("http://a", [{"Country": "A"}])
+    cache.store_cleaned("http://a", [{"GDP": 1}], variant="gdp")
+
+    assert cache.load_cleaned("http://a") == [{"Country": "A"}]
+    assert cache.load_cleaned("http://a", "gdp") == [{"GDP": 1}]
+    assert cache.load_cleaned("http://a", "other") is None
+    assert cache.total_bytes == len("v1") + len('[{"Country": "A"}]') + len('[{"GDP": 1}]')
+
+    cache.store("http://a", "v2", etag='"2"', last_modified=None)
+    assert cache.load_cleaned("http://a", "gdp") is None
+    assert not list(tmp_path.glob("*.cleaned.json"))
+
+
+def test_lru_eviction_respects_size_cap(tmp_path):
+    cache = HttpCache(directory=str(tmp_path), max_bytes=25)
+    cache.store("http://a", "a" * 10, etag='"a"', last_modified=None)
+    cache.store("http://b", "b" * 10, etag='"b"', last_modified=None)
+    cache.load_body("http://a")  # a is now more recently used than b
+    cache.store("http://c", "c" * 10, etag='"c"', last_modified=None)
+
+    assert cache.load_body("http://b") is None
+    assert cache.load_body("http://a") == "a" * 10
+    assert cache.load_body("http://c") == "c" * 10
+    assert cache.total_bytes <= 25
+
+
+class RecordingClient:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.headers = []
+    async def get(self, url, headers=None):
+        self.headers.append(headers)
+        return self.responses.pop(0)
+
+
+@pytest.mark.asyncio
+async def test_fetch_static_document_sends_validators_and_uses_cache_on_304(tmp_path):
+    cache = HttpCache(directory=str(tmp_path))
+    client = RecordingClient(
+        HttpResponse(url="http://a", status=200, headers={"ETag": '"v1"'}, body=b"<table>v1</table>"),
+        HttpResponse(url="http://a", status=304),
+    )
+
+    first = await swd.fetch_static_document("http://a", client=client, cache=cache)
+    second = await swd.fetch_static_document("http://a", client=client, cache=cache)
+
+    assert first.html == "<table>v1</table>" and first.not_modified is False
+    assert second.html == "<table>v1</table>" and second.not_modified is True
+    assert client.headers[0] is None
+    assert client.headers[1] == {"If-None-Match": '"v1"'}
@@ -0,0 +1,61 @@
+import gzip
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from scrape_data.http_client import HttpClient
+import scrape_data.scrape_web_data as swd
+
+
+@pytest_asyncio.fixture
+async def server():
+    peers = []
+
+    async def page(request):
+        peers.append(request.transport.get_extra_info("peername"))
+        body = gzip.compress("<html><table><tr><td>ü</td></tr></table></html>".encode("utf-8"))
+        return web.Response(
+            body=body,
+            headers={"Content-Encoding": "gzip", "Content-Type": "text/html; charset=utf-8"},
+        )
+
+    async def flaky(request):
+        return web.Response(status=404)
+
+    app = web.Application()
+    app.router.add_get("/page", page)
+    app.router.add_get("/missing", flaky)
+    srv = TestServer(app)
+    await srv.start_server()
+    srv.peers = peers
+    yield srv
+    await srv.close()
+
+
+@pytest.mark.asyncio
+async def test_client_decodes_gzip_and_reuses_connection(server):
+    async with HttpClient(limit_per_host=1) as client:
+        first = await client.get(str(server.make_url("/page")))
+        second = await client.get(str(server.make_url("/page")))
+
+    assert first.status == 200
+    assert first.text() == "<html><table><tr><td>ü</td></tr></table></html>"
+    assert second.text() == first.text()
+    # both requests travelled over the same keep-alive socket
+    assert server.peers[0] == server.peers[1]
+
+
+@pytest.mark.asyncio
+async def test_fetch_static_data_uses_shared_client(server):
+    async with HttpClient() as client:
+        html = await swd.fetch_static_data(str(server.make_url("/page")), client=client)
+    assert "<td>ü</td>" in html
+
+
+@pytest.mark.asyncio
+async def test_fetch_static_data_raises_on_error_status(server, monkeypatch):
+    async def no_sleep(*a, **kw): return None
+    monkeypatch.setattr("scrape_data.utils.decorators.asyncio.sleep", no_sleep)
+    async with HttpClient() as client:
+        with pytest.raises(swd.HttpStatusError):
+            await swd.fetch_static_data(str(server.make_url("/missing")), client=client)
@@ -0,0 +1,53 @@
+import gzip
+import json
+
+import pandas as pd
+import pytest
+
+import scrape_data.jsonl_writer as jw
+from scrape_data.cleaned_table import CleanedTable
+
+
+def _table(n=25):
+    return CleanedTable(pd.DataFrame({
+        "Symbol": [f"^S{i}" for i in range(n)],
+        "Volume": pd.array([i if i % 5 else None for i in range(n)], dtype="Int64"),
+    }))
+
+
+def _read_lines(data: bytes):
+    return [json.loads(line) for line in data.decode("utf-8").splitlines()]
+
+
+def test_write_jsonl_streams_table_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(jw, "CHUNK_ROWS", 10)
+    out = tmp_path / "out.jsonl"
+    assert jw.write_jsonl(_table(), str(out)) == 25
+    rows = _read_lines(out.read_bytes())
+    assert rows == _table().to_records()
+    assert rows[0] == {"Symbol": "^S0", "Volume": None}
+
+
+def test_write_jsonl_accepts_generators_and_gzip(tmp_path):
+    out = tmp_path / "out.jsonl.gz"
+    gen = ({"i": i, "name": "é"} for i in range(3))
+    assert jw.write_jsonl(gen, str(out), "gzip") == 3
+    assert _read_lines(gzip.decompress(out.read_bytes()))[2] == {"i": 2, "name": "é"}
+
+
+def test_write_jsonl_zstd(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    out = tmp_path / "out.jsonl.zst"
+    jw.write_jsonl(_table(3), str(out), "zstd")
+    data = zstandard.ZstdDecompressor().stream_reader(out.open("rb")).read()
+    assert len(_read_lines(data)) == 3
+
+
+def test_stdlib_serializer_matches_fast_one():
+    record = {"a": 1, "b": None, "c": "ü", "d": 1.5, "e": pd.NA}
+    assert json.loads(jw._stdlib_dumps(record)) == json.loads(jw.get_serializer()(record))
+
+
+def test_unknown_compression_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        jw.write_jsonl([{"a": 1}], str(tmp_path / "x.jsonl"), "snappy")
@@ -1,55 +1,142 @@
 import scrape_data.main as rp
 
 
-def test_main_static_success(monkeypatch):
-    calls = {}
+class DummyVis:
+    def generate_mermaid_schema(self, *a, **kw): return "graph TD; A-->B;"
+    def generate_graphvid(self, schema_dict): return "out/schema.png"
 
-    # patch save_scraped_data.main
-    monkeypatch.setattr(rp.save_scraped_data, "main", lambda *a, **kw: calls.setdefault("save", True))
 
-    # patch scrape_web_data + clean_data
-    async def fake_fetch_static(url): return "<html>static</html>"
-    monkeypatch.setattr(rp.scrape_web_data, "fetch_static_data", fake_fetch_static)
-    monkeypatch.setattr(rp.clean_data, "clean_static_data", lambda html: [{"Country": "X"}])
+def test_main_static_success(monkeypatch, tmp_path):
+    calls = {"fetch": 0}
 
-    # patch visualizer methods
-    class DummyVis:
-        def generate_mermaid_schema(self, *a, **kw): return "graph TD; A-->B;"
-        def generate_graphvid(self, schema_dict): return "out/schema.png"
+    # patch scrape_web_data + clean_data as seen by the pipeline
+    async def fake_fetch_static(url, cache=None, **kw):
+        calls["fetch"] += 1
+        return rp.pipeline.scrape_web_data.StaticDocument(html="<html>static</html>")
+    monkeypatch.setattr(rp.pipeline.scrape_web_data, "fetch_static_document", fake_fetch_static)
+    monkeypatch.setattr(rp.settings, "HTTP_CACHE_ENABLED", False)
+    monkeypatch.setattr(rp.pipeline.clean_data, "clean_static_data", lambda html, **kw: [{"Country": "X"}])
 
+    # patch visualizer methods
     monkeypatch.setattr(rp, "static_model", lambda: (DummyVis(), {"definitions": {}}))
     monkeypatch.setattr(rp, "dynamic_model", lambda: (DummyVis(), {"definitions": {}}))
 
-    rc = rp.main(["--mode", "static", "--file_format", "json"])
+    out_base = tmp_path / "static"
+    rc = rp.main(["--mode", "static", "--file_format", "json", "--file_path", str(out_base)])
     assert rc == 0
-    assert calls["save"] is True
-
+    assert calls["fetch"] == 1
+    assert (tmp_path / "static.json").exists()
 
-def test_main_dynamic_success(monkeypatch):
-    calls = {}
 
-    monkeypatch.setattr(rp.save_scraped_data, "main", lambda *a, **kw: calls.setdefault("save", True))
+def test_main_dynamic_success(monkeypatch, tmp_path):
+    calls = {"fetch": 0}
 
-    async def fake_fetch_dynamic(url): return "<html>dyn</html>"
-    monkeypatch.setattr(rp.scrape_web_data, "fetch_dynamic_table_content", fake_fetch_dynamic)
-    monkeypatch.setattr(rp.clean_data, "clean_dynamic_data", lambda html: [{"Index": "Y"}])
-
-    class DummyVis:
-        def generate_mermaid_schema(self, *a, **kw): return "graph TD; A-->B;"
-        def generate_graphvid(self, schema_dict): return "out/schema.png"
+    async def fake_fetch_dynamic(url, **kw):
+        calls["fetch"] += 1
+        return "<html>dyn</html>"
+    monkeypatch.setattr(rp.pipeline.scrape_web_data, "fetch_dynamic_table_content", fake_fetch_dynamic)
+    monkeypatch.setattr(rp.pipeline.clean_data, "clean_dynamic_data", lambda html, **kw: [{"Index": "Y"}])
 
     monkeypatch.setattr(rp, "static_model", lambda: (DummyVis(), {"definitions": {}}))
     monkeypatch.setattr(rp, "dynamic_model", lambda: (DummyVis(), {"definitions": {}}))
 
-    rc = rp.main(["--mode", "dynamic", "--file_format", "csv"])
+    out_base = tmp_path / "dynamic"
+    rc = rp.main(["--mode", "dynamic", "--file_format", "csv", "--file_path", str(out_base)])
     assert rc == 0
-    assert calls["save"] is True
+    assert calls["fetch"] == 1
+    assert (tmp_path / "dynamic.csv").exists()
 
 
 def test_main_exception(monkeypatch):
-    # Force save_scraped_data.main to raise
-    def boom(*a, **kw): raise RuntimeError("fail")
-    monkeypatch.setattr(rp.save_scraped_data, "main", boom)
+    # Force the fetch stage to raise
+    async def boom(*a, **kw): raise RuntimeError("fail")
+    monkeypatch.setattr(rp.pipeline.scrape_web_data, "fetch_static_document", boom)
+    monkeypatch.setattr(rp.settings, "HTTP_CACHE_ENABLED", False)
+    monkeypatch.setattr(rp, "static_model", lambda: (DummyVis(), {"definitions": {}}))
 
     rc = rp.main(["--mode", "static"])
     assert rc == 1
+
+
+def test_main_returns_failure_when_nothing_cleaned(monkeypatch):
+    async def fake_fetch_static(url, cache=None): return None
+    monkeypatch.setattr(rp.pipeline.scrape_web_data, "fetch_static_document", fake_fetch_static)
+    monkeypatch.setattr(rp.settings, "HTTP_CACHE_ENABLED", False)
+    monkeypatch.setattr(rp, "static_model", lambda: (DummyVis(), {"definitions": {}}))
+
+    rc = rp.main(["--mode", "static"])
+    assert rc == 1
+
+
+def test_parser_accepts_columnar_formats_and_compression():
+    args = rp._build_parser().parse_args(["--file_format", "parquet", "--compression", "snappy"])
+    assert (args.file_format, args.compression) == ("parquet", "snappy")
+
+
+def test_main_runs_registry_targets(monkeypatch):
+    ran = {}
+
+    async def fake_run_targets(targets, concurrency=None, cache=None, **kw):
+        ran["names"] = [t.name for t in targets]
+        ran["concurrency"] = concurrency
+        ran["shared"] = sorted(k for k in ("client", "pool") if kw.get(k) is not None)
+        return [rp.pipeline.TargetResult(t.name, t.mode, "ok", 0.1, rows=1) for t in targets]
+
+    monkeypatch.setattr(rp.pipeline, "run_targets", fake_run_targets)
+    monkeypatch.setattr(rp.settings, "HTTP_CACHE_ENABLED", False)
+
+    assert rp.main(["--targets", "dynamic", "--concurrency", "3"]) == 0
+    assert ran == {"names": ["dynamic"], "concurrency": 3, "shared": ["client", "pool"]}
+    assert rp.main(["--mode", "all"]) == 0
+    assert ran["names"] == ["static", "dynamic"]
+    assert rp.main(["--targets", "missing"]) == 1
+
+
+def test_main_staged_flag_uses_staged_executor(monkeypatch):
+    ran = {}
+
+    async def fake_run_staged(targets, fetch_workers=None, **kw):
+        ran["names"] = [t.name for t in targets]
+        ran["fetch_workers"] = fetch_workers
+        return [rp.pipeline.TargetResult(t.name, t.mode, "unchanged", 0.1) for t in targets]
+
+    async def must_not_run(*a, **kw):
+        raise AssertionError("run_targets should not be used with --staged")
+
+    monkeypatch.setattr(rp.staged, "run_staged", fake_run_staged)
+    monkeypatch.setattr(rp.pipeline, "run_targets", must_not_run)
+    monkeypatch.setattr(rp.settings, "HTTP_CACHE_ENABLED", False)
+
+    assert rp.main(["--mode", "all", "--staged", "--concurrency", "2"]) == 0
+    assert ran == {"names": ["static", "dynamic"], "fetch_workers": 2}
+
+
+def test_main_serve_subcommand_starts_scheduler(monkeypatch):
+    seen = {}
+
+    async def fake_serve(self):
+        seen["targets"] = [t.name for t in self.targets]
+        seen["interval"] = self.interval
+        seen["dedup"] = self.run_kwargs["dedup"]
+        seen["warm"] = self.runner.client is not None
+
+    monkeypatch.setattr(rp.Scheduler, "serve", fake_serve)
+    monkeypatch.setattr(rp.settings, "HTTP_CACHE_ENABLED", False)
+
+    assert rp.main(["serve", "--targets", "static", "--interval", "60", "--no_dedup"]) == 0
+    assert seen == {"targets": ["static"], "interval": 60.0, "dedup": False, "warm": True}
+
+
+def test_main_api_subcommand_serves_read_api(monkeypatch):
+    seen = {}
+
+    async def fake_serve(self, host=None, port=None):
+        seen["targets"] = sorted(self.cache.targets)
+        seen["ttl"] = self.cache.ttl
+        seen["address"] = (host, port)
+
+    monkeypatch.setattr(rp.ReadApi, "serve", fake_serve)
+    monkeypatch.setattr(rp.settings, "HTTP_CACHE_ENABLED", False)
+
+    assert rp.main(["api", "--targets", "dynamic", "--port", "9000", "--ttl", "30"]) == 0
+    assert seen == {"targets": ["dynamic"], "ttl": 30.0, "address": (None, 9000)}
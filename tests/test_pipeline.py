@@ -0,0 +1,297 @@
+import json
+import pytest
+import scrape_data.pipeline as pl
+from scrape_data import table_extractor
+
+
+@pytest.mark.asyncio
+async def test_run_pipeline_fetches_once_and_shares_html(monkeypatch, tmp_path):
+    seen = {"fetch": 0, "clean": None, "visualized": False}
+
+    async def fake_fetch_dynamic(url):
+        seen["fetch"] += 1
+        return "<table>dyn</table>"
+
+    def fake_clean(html, **kw):
+        seen["clean"] = html
+        return [{"Symbol": "^ABC"}]
+
+    monkeypatch.setattr(pl.scrape_web_data, "fetch_dynamic_table_content", fake_fetch_dynamic)
+    monkeypatch.setattr(pl.clean_data, "clean_dynamic_data", fake_clean)
+
+    artifact = await pl.run_pipeline(
+        "dynamic",
+        str(tmp_path / "out" / "dyn"),
+        "json",
+        visualize=lambda: seen.update(visualized=True),
+    )
+
+    assert seen["fetch"] == 1
+    assert seen["clean"] == "<table>dyn</table>"
+    assert seen["visualized"] is True
+    assert artifact.saved_path.endswith("dyn.json")
+    assert json.loads((tmp_path / "out" / "dyn.json").read_text())[0]["Symbol"] == "^ABC"
+
+
+@pytest.mark.asyncio
+async def test_run_pipeline_skips_downstream_when_fetch_fails(monkeypatch, tmp_path):
+    async def fake_fetch_static(url, cache=None): return None
+    monkeypatch.setattr(pl.scrape_web_data, "fetch_static_document", fake_fetch_static)
+
+    called = {"visualized": False}
+    artifact = await pl.run_pipeline(
+        "static",
+        str(tmp_path / "static"),
+        visualize=lambda: called.update(visualized=True),
+    )
+    assert artifact.records is None
+    assert artifact.saved_path is None
+    assert called["visualized"] is False
+
+
+@pytest.mark.asyncio
+async def test_fetch_stage_invalid_mode():
+    with pytest.raises(ValueError):
+        await pl.fetch_stage("unknown")
+
+
+@pytest.mark.asyncio
+async def test_run_pipeline_reuses_cleaned_records_on_not_modified(monkeypatch, tmp_path):
+    cache = pl.HttpCache(directory=str(tmp_path / "cache"))
+    url = "http://fake-url/static"
+    cache.store(url, "<table>cached</table>", etag='"v1"', last_modified=None)
+    cache.store_cleaned(url, [{"Country": "Cached"}])
+
+    async def fake_fetch_static(url, cache=None):
+        return pl.scrape_web_data.StaticDocument(html=cache.load_body(url), not_modified=True)
+
+    def must_not_clean(html, **kw):
+        raise AssertionError("cleaning should be skipped on 304")
+
+    monkeypatch.setattr(pl.scrape_web_data, "fetch_static_document", fake_fetch_static)
+    monkeypatch.setattr(pl.clean_data, "clean_static_data", must_not_clean)
+
+    artifact = await pl.run_pipeline("static", str(tmp_path / "static"), url=url, cache=cache)
+    assert artifact.not_modified is True
+    assert artifact.records == [{"Country": "Cached"}]
+    assert json.loads((tmp_path / "static.json").read_text())[0]["Country"] == "Cached"
+
+
+@pytest.mark.asyncio
+async def test_reused_records_keep_the_cleaned_dtypes(monkeypatch, tmp_path):
+    pa = pytest.importorskip("pyarrow.parquet")
+    cache = pl.HttpCache(directory=str(tmp_path / "cache"))
+    url = "http://fake-url/static"
+    page = (
+        "<table><tr><th>Country (or dependency)</th><th>Population 2025</th></tr>"
+        "<tr><td>A</td><td>1,000</td></tr><tr><td>B</td><td>N/A</td></tr></table>"
+    )
+    not_modified = {"flag": False}
+
+    async def fake_fetch_static(url, cache=None, **kw):
+        if not not_modified["flag"]:
+            cache.store(url, page, etag='"v1"', last_modified=None)
+        return pl.scrape_web_data.StaticDocument(html=page, not_modified=not_modified["flag"])
+
+    def must_not_clean(html, **kw):
+        raise AssertionError("cleaning should be skipped on 304")
+
+    monkeypatch.setattr(pl.scrape_web_data, "fetch_static_document", fake_fetch_static)
+    out = str(tmp_path / "static")
+
+    await pl.run_pipeline("static", out, "parquet", url=url, cache=cache, dedup=False)
+    fresh = pa.read_schema(out + ".parquet")
+    not_modified["flag"] = True
+    monkeypatch.setattr(pl.clean_data, "clean_static_data", must_not_clean)
+    artifact = await pl.run_pipeline("static", out, "parquet", url=url, cache=cache, dedup=False)
+
+    assert artifact.records.frame["Population 2025"].dtype == "Int64"
+    assert pa.read_schema(out + ".parquet").field("Population 2025").type == fresh.field("Population 2025").type
+    assert str(fresh.field("Population 2025").type) == "int64"
+
+
+@pytest.mark.asyncio
+async def test_run_pipeline_skips_unchanged_runs(monkeypatch, tmp_path):
+    seen = {"clean": 0, "visualized": 0}
+    pages = iter(["<table>v1</table>", "<table>v1</table>", "<table>v2</table>"])
+
+    async def fake_fetch_dynamic(url):
+        return next(pages)
+
+    def fake_clean(html, **kw):
+        seen["clean"] += 1
+        return [{"Symbol": "^ABC"}]
+
+    def visualize():
+        seen["visualized"] += 1
+
+    monkeypatch.setattr(pl.scrape_web_data, "fetch_dynamic_table_content", fake_fetch_dynamic)
+    monkeypatch.setattr(pl.clean_data, "clean_dynamic_data", fake_clean)
+    out = str(tmp_path / "dyn")
+
+    first = await pl.run_pipeline("dynamic", out, visualize=visualize, dedup=True)
+    same_page = await pl.run_pipeline("dynamic", out, visualize=visualize, dedup=True)
+    same_records = await pl.run_pipeline("dynamic", out, visualize=visualize, dedup=True)
+
+    assert not first.unchanged and first.records_hash
+    assert same_page.unchanged and same_page.records is None
+    assert same_records.unchanged and same_records.records_hash == first.records_hash
+    assert seen == {"clean": 2, "visualized": 1}
+    assert (tmp_path / pl.settings.DEDUP_MANIFEST_NAME).exists()
+
+
+@pytest.mark.asyncio
+async def test_run_pipeline_cdc_stage_writes_dynamic_deltas(monkeypatch, tmp_path):
+    snapshots = iter([[{"Symbol": "^A", "Change": 1.0}], [{"Symbol": "^A", "Change": 2.0}]])
+
+    async def fake_fetch_dynamic(url):
+        return "<table>dyn</table>"
+
+    monkeypatch.setattr(pl.scrape_web_data, "fetch_dynamic_table_content", fake_fetch_dynamic)
+    monkeypatch.setattr(pl.clean_data, "clean_dynamic_data", lambda html, **kw: next(snapshots))
+
+    out = str(tmp_path / "dyn")
+    await pl.run_pipeline("dynamic", out, dedup=False, cdc_enabled=True)
+    artifact = await pl.run_pipeline("dynamic", out, dedup=False, cdc_enabled=True)
+
+    assert artifact.changes.counts() == {"insert": 0, "update": 1, "delete": 0}
+    ops = [json.loads(line)["op"] for line in (tmp_path / "dyn.delta.jsonl").read_text().splitlines()]
+    assert ops == ["insert", "update"]
+
+
+@pytest.mark.asyncio
+async def test_run_targets_respects_concurrency_limit(monkeypatch, tmp_path):
+    import asyncio
+
+    state = {"active": 0, "peak": 0}
+
+    async def fake_fetch_static(url, cache=None):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        if url.endswith("/bad"):
+            raise RuntimeError("boom")
+        return pl.scrape_web_data.StaticDocument(html=f"<table>{url}</table>")
+
+    seen = {}
+
+    def fake_clean(html, **kw):
+        seen[html] = kw.get("locator")
+        return [{"Country": html}]
+
+    monkeypatch.setattr(pl.scrape_web_data, "fetch_static_document", fake_fetch_static)
+    monkeypatch.setattr(pl.clean_data, "clean_static_data", fake_clean)
+    locator = pl.clean_data.TableLocator(table_id="t")
+    targets = [
+        pl.Target(name=f"t{i}", url=f"http://x/{i}", file_path=str(tmp_path / f"t{i}"), locator=locator)
+        for i in range(5)
+    ] + [pl.Target(name="bad", url="http://x/bad", file_path=str(tmp_path / "bad"))]
+
+    results = await pl.run_targets(targets, concurrency=2, dedup=False)
+
+    assert state["peak"] == 2
+    assert [r.status for r in results] == ["ok"] * 5 + ["failed"]
+    assert results[0].rows == 1 and results[0].saved_path.endswith("t0.json")
+    assert seen["<table>http://x/0</table>"] == locator
+    summary = pl.format_summary(results, elapsed=0.1)
+    assert "5/6 targets ok" in summary and "boom" in summary
+
+
+@pytest.mark.asyncio
+async def test_dedup_hashes_the_targets_own_table(monkeypatch, tmp_path):
+    default_table = "<table><tr><th>Country (or dependency)</th><th>Population 2025</th></tr><tr><td>A</td><td>1</td></tr></table>"
+    pages = iter([
+        f"<html>{default_table}<table id='gdp'><tr><th>Country</th></tr><tr><td>{gdp}</td></tr></table></html>"
+        for gdp in ("100", "200")
+    ])
+
+    async def fake_fetch_static(url, cache=None, **kw):
+        return pl.scrape_web_data.StaticDocument(html=next(pages))
+
+    monkeypatch.setattr(pl.scrape_web_data, "fetch_static_document", fake_fetch_static)
+    monkeypatch.setattr(pl.clean_data, "clean_static_data", lambda html, **kw: [{"Country": html.count("200")}])
+    target = pl.Target(
+        name="gdp", url="http://x/gdp", locator=pl.clean_data.TableLocator(table_id="gdp"), file_path=str(tmp_path / "gdp")
+    )
+
+    first = await pl.run_target(target)
+    second = await pl.run_target(target)
+
+    assert not first.unchanged and not second.unchanged
+    assert first.fragment_hash != second.fragment_hash
+    assert json.loads((tmp_path / "gdp.json").read_text()) == [{"Country": 1}]
+
+
+@pytest.mark.asyncio
+async def test_static_dedup_parses_the_page_once(monkeypatch, tmp_path):
+    table = (
+        "<table><tr><th>Country (or dependency)</th><th>Population 2025</th></tr>"
+        "<tr><td>A</td><td>1,000</td></tr></table>"
+    )
+    page = f"<html><p>updated 09:00</p>{table}<table><tr><td>ad</td></tr></table></html>"
+    parsed = []
+    fromstring = table_extractor.lxml.html.fromstring
+
+    def spy(html, *args, **kw):
+        parsed.append(html)
+        return fromstring(html, *args, **kw)
+
+    async def fake_fetch_static(url, cache=None, **kw):
+        return pl.scrape_web_data.StaticDocument(html=page)
+
+    monkeypatch.setattr(pl.scrape_web_data, "fetch_static_document", fake_fetch_static)
+    monkeypatch.setattr(table_extractor.lxml.html, "fromstring", spy)
+
+    artifact = await pl.run_pipeline("static", str(tmp_path / "static"), dedup=True)
+
+    assert parsed.count(page) == 1 and artifact.fragment in parsed
+    assert artifact.fragment_hash == pl.fragment_digest("static", page)
+    assert [r["Population 2025"] for r in artifact.records] == [1000]
+
+
+@pytest.mark.asyncio
+async def test_targets_sharing_a_url_keep_their_own_cleaned_records(monkeypatch, tmp_path):
+    cache = pl.HttpCache(directory=str(tmp_path / "cache"))
+    url = "http://x/page"
+    cache.store(url, "<html>page</html>", etag='"v1"', last_modified=None)
+    not_modified = {"flag": False}
+
+    async def fake_fetch_static(url, cache=None, **kw):
+        return pl.scrape_web_data.StaticDocument(html=cache.load_body(url), not_modified=not_modified["flag"])
+
+    monkeypatch.setattr(pl.scrape_web_data, "fetch_static_document", fake_fetch_static)
+    def fake_clean(html, locator=None, **kw):
+        assert not not_modified["flag"], "cleaning should be skipped on 304"
+        return [{"table": locator.table_id}]
+
+    monkeypatch.setattr(pl.clean_data, "clean_static_data", fake_clean)
+    targets = [
+        pl.Target(name=n, url=url, locator=pl.clean_data.TableLocator(table_id=n), file_path=str(tmp_path / n))
+        for n in ("a", "b")
+    ]
+
+    for target in targets:
+        await pl.run_target(target, cache, dedup=False)
+    not_modified["flag"] = True
+    reused = [await pl.run_target(target, cache, dedup=False) for target in targets]
+
+    assert [a.records for a in reused] == [[{"table": "a"}], [{"table": "b"}]]
+
+
+@pytest.mark.asyncio
+async def test_cdc_uses_the_targets_key_and_skips_tables_without_it(monkeypatch, tmp_path):
+    async def fake_fetch_dynamic(url, **kw):
+        return "<table>fx</table>"
+
+    monkeypatch.setattr(pl.scrape_web_data, "fetch_dynamic_table_content", fake_fetch_dynamic)
+    monkeypatch.setattr(pl.clean_data, "clean_dynamic_data", lambda html, **kw: [{"Pair": "EUR/USD", "Rate": 1.1}])
+
+    keyed = pl.Target(name="fx", url="http://x/fx", mode="dynamic", cdc_key="Pair", file_path=str(tmp_path / "fx"))
+    artifact = await pl.run_target(keyed, dedup=False, cdc_enabled=True)
+    assert artifact.changes.counts() == {"insert": 1, "update": 0, "delete": 0}
+
+    unkeyed = pl.Target(name="fx2", url="http://x/fx", mode="dynamic", file_path=str(tmp_path / "fx2"))
+    artifact = await pl.run_target(unkeyed, dedup=False, cdc_enabled=True)
+    assert artifact.changes is None and artifact.saved_path.endswith("fx2.json")
+    assert not (tmp_path / "fx2.delta.jsonl").exists()
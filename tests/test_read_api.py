@@ -0,0 +1,181 @@
+import asyncio
+import gzip
+import io
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+import scrape_data.pipeline as pl
+import scrape_data.read_api as ra
+from scrape_data.cleaned_table import CleanedTable
+from scrape_data.targets import Target
+
+RUNNER = SimpleNamespace(cache=None, resources=lambda: {})
+TARGETS = [Target(name="static", url="http://x/static"), Target(name="other", url="http://x/other")]
+
+
+def _rows(n=3, value=1):
+    return CleanedTable(pd.DataFrame({
+        "Country (or dependency)": [f"C{i}" for i in range(n)],
+        "Population 2025": pd.array([value * i for i in range(n)], dtype="Int64"),
+    }))
+
+
+@pytest.fixture
+def source(monkeypatch):
+    state = {"fetches": 0, "rows": _rows(), "fail": False}
+
+    async def fake_fetch_static(url, cache=None, **kw):
+        state["fetches"] += 1
+        await asyncio.sleep(0.02)
+        if state["fail"]:
+            return None
+        return pl.scrape_web_data.StaticDocument(html=f"<table>{url}</table>")
+
+    monkeypatch.setattr(pl.scrape_web_data, "fetch_static_document", fake_fetch_static)
+    monkeypatch.setattr(pl.clean_data, "clean_static_data", lambda html, **kw: state["rows"])
+    return state
+
+
+async def _client(ttl=60.0, **kw):
+    api = ra.ReadApi(ra.SnapshotCache(TARGETS, RUNNER, ttl=ttl), **kw)
+    client = TestClient(TestServer(api.app()), auto_decompress=False)
+    await client.start_server()
+    return api, client
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_refresh(source):
+    api, client = await _client()
+    try:
+        responses = await asyncio.gather(*(client.get("/targets/static") for _ in range(20)))
+        bodies = [await r.json() for r in responses]
+        assert source["fetches"] == 1
+        assert all(r.status == 200 for r in responses)
+        assert bodies[0] == [
+            {"Country (or dependency)": "C0", "Population 2025": 0},
+            {"Country (or dependency)": "C1", "Population 2025": 1},
+            {"Country (or dependency)": "C2", "Population 2025": 2},
+        ]
+        await client.get("/targets/static")
+        assert source["fetches"] == 1  # still within the TTL
+
+        listing = await (await client.get("/targets")).json()
+        assert [(t["name"], t["rows"]) for t in listing] == [("static", 3), ("other", None)]
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_etag_gzip_and_formats(source):
+    source["rows"] = _rows(500)
+    api, client = await _client(gzip_min_bytes=100)
+    try:
+        plain = await client.get("/targets/static.csv", headers={"Accept-Encoding": "identity"})
+        assert plain.headers["Content-Type"].startswith("text/csv")
+        assert "Content-Encoding" not in plain.headers
+        csv_body = await plain.read()
+        assert pd.read_csv(io.BytesIO(csv_body))["Population 2025"].sum() == sum(range(500))
+
+        zipped = await client.get("/targets/static?format=csv", headers={"Accept-Encoding": "gzip, br"})
+        assert zipped.headers["Content-Encoding"] == "gzip"
+        assert zipped.headers["Vary"] == "Accept-Encoding"
+        assert gzip.decompress(await zipped.read()) == csv_body
+        assert zipped.headers["ETag"] != plain.headers["ETag"]
+
+        for etag in (plain.headers["ETag"], zipped.headers["ETag"]):
+            cached = await client.get("/targets/static.csv", headers={"If-None-Match": etag})
+            assert cached.status == 304 and await cached.read() == b""
+        assert (await client.get("/targets/static.json", headers={"If-None-Match": plain.headers["ETag"]})).status == 200
+
+        pa = pytest.importorskip("pyarrow")
+        arrow = await client.get("/targets/static.arrow", headers={"Accept-Encoding": "identity"})
+        table = pa.ipc.open_stream(await arrow.read()).read_all()
+        assert table.num_rows == 500 and table.column_names == ["Country (or dependency)", "Population 2025"]
+        assert source["fetches"] == 1
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_refreshes_and_survives_failures(source):
+    api, client = await _client(ttl=0.0)
+    try:
+        first = await client.get("/targets/static")
+        etag = first.headers["ETag"]
+
+        # refreshed on every request (ttl 0), same rows -> same ETag
+        assert (await client.get("/targets/static", headers={"If-None-Match": etag})).status == 304
+        source["rows"] = _rows(value=2)
+        changed = await client.get("/targets/static", headers={"If-None-Match": etag})
+        assert changed.status == 200 and changed.headers["ETag"] != etag
+
+        source["fail"] = True
+        stale = await client.get("/targets/static")
+        assert stale.status == 200 and (await stale.json())[2]["Population 2025"] == 4
+        assert (await client.get("/targets/other")).status == 502
+        assert (await client.get("/targets/missing")).status == 404
+        assert (await client.get("/targets/static.xml")).status == 400
+        assert source["fetches"] == 5
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_refresh_uses_the_http_cache_on_the_loop_thread_only(source, tmp_path):
+    import threading
+
+    loop_thread = threading.get_ident()
+    calls = []
+
+    class RecordingCache(pl.HttpCache):
+        def store_cleaned(self, *a, **kw):
+            calls.append(threading.get_ident())
+            return super().store_cleaned(*a, **kw)
+
+        def load_cleaned(self, *a, **kw):
+            calls.append(threading.get_ident())
+            return super().load_cleaned(*a, **kw)
+
+    runner = SimpleNamespace(cache=RecordingCache(directory=str(tmp_path)), resources=lambda: {})
+    cache = ra.SnapshotCache(TARGETS, runner, ttl=0.0)
+    await asyncio.gather(cache.get("static"), cache.get("other"))
+    await cache.get("static")
+
+    assert len(calls) == 3 and set(calls) == {loop_thread}
+
+
+@pytest.mark.asyncio
+async def test_not_modified_keeps_the_snapshot_dtypes_and_etag(monkeypatch, tmp_path):
+    rows = CleanedTable(pd.DataFrame({"Country": ["A", "B"], "Population 2025": pd.array([1, None], dtype="Int64")}))
+    cleaned = {"n": 0}
+    http_cache = pl.HttpCache(directory=str(tmp_path))
+
+    async def fake_fetch_static(url, cache=None, **kw):
+        not_modified = http_cache.load_body(url) is not None
+        if not not_modified:
+            http_cache.store(url, "<table/>", etag='"1"', last_modified=None)
+        return pl.scrape_web_data.StaticDocument(html="<table/>", not_modified=not_modified)
+
+    def fake_clean(html, **kw):
+        cleaned["n"] += 1
+        return rows
+
+    monkeypatch.setattr(pl.scrape_web_data, "fetch_static_document", fake_fetch_static)
+    monkeypatch.setattr(pl.clean_data, "clean_static_data", fake_clean)
+    cache = ra.SnapshotCache(TARGETS, SimpleNamespace(cache=http_cache, resources=lambda: {}), ttl=0.0)
+
+    first = await cache.get("static")
+    etag = first.etag("json")
+    again = await cache.get("static")
+
+    assert again is first and again.etag("json") == etag and cleaned["n"] == 1
+    assert ra.encode(again.table, "json") == b'[{"Country":"A","Population 2025":1},{"Country":"B","Population 2025":null}]'
+
+    # a restarted API has only the HTTP cache: the cached records come back with their dtypes and ETag
+    restarted = ra.SnapshotCache(TARGETS, SimpleNamespace(cache=http_cache, resources=lambda: {}), ttl=0.0)
+    fresh = await restarted.get("static")
+    assert fresh.etag("json") == etag and fresh.table.frame["Population 2025"].dtype == "Int64"
+    assert cleaned["n"] == 1
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+import scrape_data.runner as rn
+
+
+def test_run_shares_one_client_and_lazy_pool(monkeypatch):
+    seen = []
+
+    async def fake_fetch_static(url, client=None, **kw):
+        seen.append(client)
+        return f"<table>{url}</table>"
+
+    monkeypatch.setattr(rn.scrape_web_data, "fetch_static_data", fake_fetch_static)
+
+    async def main(runner):
+        pages = await asyncio.gather(runner.fetch("static", "http://a"), runner.fetch("static", "http://b"))
+        return pages, runner
+
+    pages, runner = rn.run(main)
+    assert pages == ["<table>http://a</table>", "<table>http://b</table>"]
+    assert seen[0] is seen[1] is runner.client
+    assert runner._pool is None  # static-only runs never create a browser pool
+    assert runner.client._session is None  # closed on exit
+
+
+def test_static_and_dynamic_overlap_on_one_loop(monkeypatch):
+    closed = []
+
+    async def slow_static(url, client=None, **kw):
+        await asyncio.sleep(0.05)
+        return "static"
+
+    async def slow_dynamic(url, pool=None, **kw):
+        await asyncio.sleep(0.05)
+        return {"pool": pool}
+
+    async def fake_close(self):
+        closed.append(self)
+
+    monkeypatch.setattr(rn.scrape_web_data, "fetch_static_data", slow_static)
+    monkeypatch.setattr(rn.scrape_web_data, "fetch_dynamic_table_content", slow_dynamic)
+    monkeypatch.setattr(rn.BrowserPool, "close", fake_close)
+
+    async def main(runner):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        static, dynamic = await asyncio.gather(runner.fetch("static"), runner.fetch("dynamic"))
+        return static, dynamic, loop.time() - start, runner.pool
+
+    static, dynamic, elapsed, pool = rn.run(main)
+    assert static == "static" and dynamic["pool"] is pool
+    assert elapsed < 0.09
+    assert closed == [pool]
+
+
+def test_run_refuses_a_running_loop():
+    async def outer():
+        with pytest.raises(RuntimeError):
+            rn.run(lambda runner: runner.fetch("static"))
+
+    asyncio.run(outer())
+
+
+def test_fetch_rejects_unknown_mode():
+    async def main(runner):
+        with pytest.raises(ValueError):
+            await runner.fetch("ftp")
+
+    rn.run(main)
@@ -1,7 +1,9 @@
 import json
+import pytest
 import pandas as pd
 import os
 import scrape_data.save_scraped_data as sd
+import scrape_data.scrape_web_data as swd
 import shutil
 
 def test_save_cleaned_data_to_file_json(tmp_path):
@@ -25,11 +27,11 @@ def test_save_cleaned_data_to_file_csv(tmp_path):
 
 
 def test_save_cleaned_data_static(monkeypatch, tmp_path):
-    async def fake_fetch_static():
+    async def fake_fetch_static(*a, **kw):
         return "<html>static</html>"
 
-    monkeypatch.setattr(sd.scrape_web_data, "fetch_static_data", fake_fetch_static)
-    monkeypatch.setattr(sd.clean_data, "clean_static_data", lambda html: [{"Country": "A"}])
+    monkeypatch.setattr(swd, "fetch_static_data", fake_fetch_static)
+    monkeypatch.setattr(sd.clean_data, "clean_static_data", lambda html, **kw: [{"Country": "A"}])
 
     out_file = tmp_path / "static.json"
     sd.save_cleaned_data("static", str(out_file.with_suffix("")), "json")
@@ -42,8 +44,8 @@ def test_save_cleaned_data_dynamic(monkeypatch, tmp_path):
     async def fake_fetch_dynamic(*a, **kw):
         return "<html>dyn</html>"
 
-    monkeypatch.setattr(sd.scrape_web_data, "fetch_dynamic_table_content", fake_fetch_dynamic)
-    monkeypatch.setattr(sd.clean_data, "clean_dynamic_data", lambda html: [{"Index": "X"}])
+    monkeypatch.setattr(swd, "fetch_dynamic_table_content", fake_fetch_dynamic)
+    monkeypatch.setattr(sd.clean_data, "clean_dynamic_data", lambda html, **kw: [{"Index": "X"}])
 
     out_file = tmp_path / "dynamic.csv"
     sd.save_cleaned_data("dynamic", str(out_file.with_suffix("")), "csv")
@@ -54,11 +56,11 @@ def test_save_cleaned_data_dynamic(monkeypatch, tmp_path):
 
 
 def test_main_creates_directory(monkeypatch, tmp_path):
-    async def fake_fetch_static():
+    async def fake_fetch_static(*a, **kw):
         return "<html>static</html>"
 
-    monkeypatch.setattr(sd.scrape_web_data, "fetch_static_data", fake_fetch_static)
-    monkeypatch.setattr(sd.clean_data, "clean_static_data", lambda html: [{"Country": "A"}])
+    monkeypatch.setattr(swd, "fetch_static_data", fake_fetch_static)
+    monkeypatch.setattr(sd.clean_data, "clean_static_data", lambda html, **kw: [{"Country": "A"}])
 
     sd.main("static", None, "json")
 
@@ -69,3 +71,56 @@ def test_main_creates_directory(monkeypatch, tmp_path):
     shutil.rmtree("data")
 
 
+
+
+def test_save_cleaned_table_json_matches_json_dump_layout(tmp_path):
+    from scrape_data.cleaned_table import CleanedTable
+
+    frame = pd.DataFrame({"Country": ["A", "É"], "Population": pd.array([100, None], dtype="Int64")})
+    out_file = tmp_path / "out.json"
+    sd.save_cleaned_data_to_file(CleanedTable(frame), str(out_file), "json")
+
+    expected = [{"Country": "A", "Population": 100}, {"Country": "É", "Population": None}]
+    assert out_file.read_text(encoding="utf-8") == json.dumps(expected, indent=4, ensure_ascii=False)
+
+    empty = tmp_path / "empty.json"
+    sd.save_cleaned_data_to_file([], str(empty), "json")
+    assert empty.read_text(encoding="utf-8") == "[]"
+
+
+def test_save_cleaned_table_csv_writes_frame(tmp_path):
+    from scrape_data.cleaned_table import CleanedTable
+
+    out_file = tmp_path / "out.csv"
+    sd.save_cleaned_data_to_file(CleanedTable(pd.DataFrame({"x": [1, 3], "y": [2, 4]})), str(out_file), "csv")
+    assert pd.read_csv(out_file).shape == (2, 2)
+
+
+@pytest.mark.parametrize("file_format,compression", [("parquet", "zstd"), ("parquet", "snappy"), ("feather", "lz4"), ("feather", "none")])
+def test_save_columnar_formats_round_trip(tmp_path, file_format, compression):
+    pytest.importorskip("pyarrow")
+    from scrape_data.cleaned_table import CleanedTable
+
+    frame = pd.DataFrame({"Country": ["A", "B"], "Population": pd.array([100, None], dtype="Int64")})
+    out_file = tmp_path / f"out.{file_format}"
+    sd.save_cleaned_data_to_file(CleanedTable(frame), str(out_file), file_format, compression)
+
+    loaded = pd.read_parquet(out_file) if file_format == "parquet" else pd.read_feather(out_file)
+    assert loaded["Country"].tolist() == ["A", "B"]
+    assert loaded["Population"].isna().tolist() == [False, True]
+
+
+def test_feather_rejects_snappy(tmp_path):
+    pytest.importorskip("pyarrow")
+    with pytest.raises(ValueError):
+        sd.save_cleaned_data_to_file([{"x": 1}], str(tmp_path / "out.feather"), "feather", "snappy")
+
+
+def test_save_records_jsonl_gzip_suffix(tmp_path):
+    import gzip
+
+    path = sd.save_records([{"x": 1}, {"x": 2}], str(tmp_path / "out"), "jsonl", "gzip")
+    assert path.endswith("out.jsonl.gz")
+    lines = gzip.decompress((tmp_path / "out.jsonl.gz").read_bytes()).decode().splitlines()
+    assert [json.loads(line)["x"] for line in lines] == [1, 2]
+    assert sd.save_records([{"x": 1}], str(tmp_path / "plain"), "jsonl").endswith("plain.jsonl")
@@ -0,0 +1,97 @@
+import asyncio
+import os
+import random
+import signal
+from types import SimpleNamespace
+
+import pytest
+
+import scrape_data.scheduler as sc
+from scrape_data.pipeline import PipelineArtifact
+from scrape_data.targets import Target
+
+RUNNER = SimpleNamespace(cache=None, resources=lambda: {"client": "shared-client", "pool": "shared-pool"})
+
+
+def _scheduler(targets, **kw):
+    kw.setdefault("jitter", 0.0)
+    return sc.Scheduler(targets, RUNNER, rng=random.Random(0), **kw)
+
+
+@pytest.mark.asyncio
+async def test_targets_run_on_their_own_interval_without_overlap(monkeypatch):
+    runs = {"fast": 0, "slow": 0}
+    active = {"fast": 0, "slow": 0}
+    overlap = []
+
+    async def fake_run_target(target, cache=None, **kw):
+        assert kw["client"] == "shared-client" and kw["pool"] == "shared-pool"
+        active[target.name] += 1
+        overlap.append(active[target.name] > 1)
+        # the slow target takes longer than its interval
+        await asyncio.sleep(0.06 if target.name == "slow" else 0.001)
+        active[target.name] -= 1
+        runs[target.name] += 1
+        return PipelineArtifact(mode="static", url=target.url, records=[{"a": 1}])
+
+    monkeypatch.setattr(sc, "run_target", fake_run_target)
+    targets = [Target(name="fast", url="u1", interval=0.02), Target(name="slow", url="u2", interval=0.03)]
+    scheduler = _scheduler(targets)
+
+    asyncio.get_running_loop().call_later(0.25, scheduler.stop)
+    await scheduler.serve()
+
+    assert not any(overlap)
+    assert runs["fast"] >= 5
+    assert 2 <= runs["slow"] <= 5
+    assert scheduler.last["fast"].status == "ok" and scheduler.last["fast"].rows == 1
+
+
+def test_next_delay_applies_jitter_and_subtracts_run_time():
+    scheduler = _scheduler([], interval=100.0, jitter=0.1)
+    delays = [scheduler.next_delay(Target(name="t", url="u")) for _ in range(200)]
+    assert all(90.0 <= d <= 110.0 for d in delays) and len(set(delays)) > 1
+    assert scheduler.next_delay(Target(name="t", url="u", interval=10.0), elapsed=4.0) <= 7.0
+    assert scheduler.next_delay(Target(name="t", url="u", interval=10.0), elapsed=30.0) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_run_once_skips_a_target_that_is_already_running(monkeypatch):
+    release = asyncio.Event()
+
+    async def fake_run_target(target, cache=None, **kw):
+        await release.wait()
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(sc, "run_target", fake_run_target)
+    target = Target(name="t", url="u")
+    scheduler = _scheduler([target])
+
+    first = asyncio.create_task(scheduler.run_once(target))
+    await asyncio.sleep(0)
+    assert await scheduler.run_once(target) is None
+    release.set()
+    result = await first
+    assert result.status == "failed" and result.error == "boom"
+
+
+@pytest.mark.asyncio
+async def test_sigterm_lets_in_flight_runs_finish(monkeypatch):
+    finished = []
+
+    async def fake_run_target(target, cache=None, **kw):
+        if target.name == "stuck":
+            await asyncio.sleep(60)
+        os.kill(os.getpid(), signal.SIGTERM)
+        await asyncio.sleep(0.05)
+        finished.append(target.name)
+        return PipelineArtifact(mode="static", url=target.url)
+
+    monkeypatch.setattr(sc, "run_target", fake_run_target)
+    scheduler = _scheduler([Target(name="t", url="u"), Target(name="stuck", url="u")], interval=0.01, grace=0.2)
+
+    await asyncio.wait_for(scheduler.serve(), timeout=5)
+
+    assert scheduler.stopping
+    assert finished == ["t"]
+    assert scheduler.last["t"].status == "empty" and "stuck" not in scheduler.last
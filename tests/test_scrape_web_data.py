@@ -1,32 +1,54 @@
 import pytest
 import scrape_data.scrape_web_data as swd
+from scrape_data.http_client import HttpResponse
 
-@pytest.mark.asyncio
-async def test_fetch_static_data_success(monkeypatch):
-    class DummyResponse:
-        status_code = 200
-        content = b"<html><body><h1>Hello</h1></body></html>"
-        def raise_for_status(self): return None
+class FakeClient:
+    """Stands in for http_client.HttpClient; returns canned responses in order."""
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+    async def get(self, url, headers=None):
+        self.calls += 1
+        resp = self.responses.pop(0)
+        if isinstance(resp, Exception):
+            raise resp
+        return resp
 
-    def fake_get(url, headers, timeout):
-        return DummyResponse()
 
-    monkeypatch.setattr("scrape_data.scrape_web_data.requests.get", fake_get)
+@pytest.mark.asyncio
+async def test_fetch_static_data_success():
+    client = FakeClient(HttpResponse(url="http://fake-url", status=200, body=b"<html><body><h1>Hello</h1></body></html>"))
 
-    html = await swd.fetch_static_data("http://fake-url")
+    html = await swd.fetch_static_data("http://fake-url", client=client)
     assert "<h1>Hello</h1>" in html
+    assert client.calls == 1
 
 
 @pytest.mark.asyncio
 async def test_fetch_static_data_failure(monkeypatch):
-    def fake_get(url, headers, timeout):
-        raise swd.requests.RequestException("network down")
-
-    monkeypatch.setattr("scrape_data.scrape_web_data.requests.get", fake_get)
+    async def no_sleep(*a, **kw): return None
+    monkeypatch.setattr("scrape_data.utils.decorators.asyncio.sleep", no_sleep)
+    errors = [swd.aiohttp.ClientConnectionError("network down") for _ in range(swd.settings.MAX_RETRIES + 1)]
+    client = FakeClient(*errors)
 
     # function will retry and eventually raise
-    with pytest.raises(swd.requests.RequestException):
-        await swd.fetch_static_data("http://fake-url")
+    with pytest.raises(swd.aiohttp.ClientError):
+        await swd.fetch_static_data("http://fake-url", client=client)
+    assert client.calls == swd.settings.MAX_RETRIES + 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_static_data_retries_forcelist_status(monkeypatch):
+    async def no_sleep(*a, **kw): return None
+    monkeypatch.setattr("scrape_data.utils.decorators.asyncio.sleep", no_sleep)
+    client = FakeClient(
+        HttpResponse(url="http://fake-url", status=503),
+        HttpResponse(url="http://fake-url", status=200, body=b"<table></table>"),
+    )
+
+    html = await swd.fetch_static_data("http://fake-url", client=client)
+    assert "<table>" in html
+    assert client.calls == 2
 
 
 @pytest.mark.asyncio
@@ -54,11 +76,13 @@ async def test_fetch_dynamic_table_content_success(monkeypatch):
 
     class DummyContext:
         async def add_init_script(self, *a, **kw): return None
+        async def route(self, *a, **kw): return None
         async def new_page(self): return DummyPage()
         async def close(self): return None
 
     class DummyBrowser:
         async def new_context(self, *a, **kw): return DummyContext()
+        def is_connected(self): return True
         async def close(self): return None
 
     class DummyChromium:
@@ -66,10 +90,10 @@ async def test_fetch_dynamic_table_content_success(monkeypatch):
 
     class DummyPlaywright:
         chromium = DummyChromium()
-        async def __aenter__(self): return self
-        async def __aexit__(self, *a): return None
+        async def start(self): return self
+        async def stop(self): return None
 
-    monkeypatch.setattr("scrape_data.scrape_web_data.async_playwright", lambda: DummyPlaywright())
+    monkeypatch.setattr("scrape_data.browser_pool.async_playwright", lambda: DummyPlaywright())
 
     html = await swd.fetch_dynamic_table_content("http://fake-url")
     assert "<table>" in html
@@ -77,7 +101,7 @@ async def test_fetch_dynamic_table_content_success(monkeypatch):
 
 
 def test_main_static(monkeypatch):
-    async def fake_fetch_static(url=None): return "<html><table></table></html>"
+    async def fake_fetch_static(url=None, **kw): return "<html><table></table></html>"
     monkeypatch.setattr(swd, "fetch_static_data", fake_fetch_static)
 
     # Should not raise, just log
@@ -89,3 +113,107 @@ def test_main_dynamic(monkeypatch):
     monkeypatch.setattr(swd, "fetch_dynamic_table_content", fake_fetch_dynamic)
 
     swd.main("dynamic")
+
+
+def _install_dummy_pool(monkeypatch, page):
+    class DummyContext:
+        async def add_init_script(self, *a, **kw): return None
+        async def route(self, *a, **kw): return None
+        async def new_page(self): return page
+        async def close(self): return None
+
+    class DummyBrowser:
+        async def new_context(self, *a, **kw): return DummyContext()
+        def is_connected(self): return True
+        async def close(self): return None
+
+    class DummyChromium:
+        async def launch(self, *a, **kw): return DummyBrowser()
+
+    class DummyPlaywright:
+        chromium = DummyChromium()
+        async def start(self): return self
+        async def stop(self): return None
+
+    async def fake_accept_cookies(page): return False
+    monkeypatch.setattr("scrape_data.scrape_web_data.accept_cookies", fake_accept_cookies)
+    monkeypatch.setattr("scrape_data.browser_pool.async_playwright", lambda: DummyPlaywright())
+
+
+@pytest.mark.asyncio
+async def test_fetch_dynamic_network_mode_returns_feed_records(monkeypatch):
+    payload = {"quoteResponse": {"result": [{"symbol": "^GSPC", "shortName": "S&P 500", "regularMarketPrice": 1.5}]}}
+
+    class DummyResponse:
+        url = "https://query1.example/v7/finance/quote?symbols=^GSPC"
+        async def json(self): return payload
+
+    class DummyPage:
+        def on(self, event, handler): self.handler = handler
+        async def goto(self, *a, **kw): await self.handler(DummyResponse())
+        async def wait_for_selector(self, *a, **kw):
+            raise AssertionError("DOM path should not be used when the feed was captured")
+        async def close(self): return None
+
+    _install_dummy_pool(monkeypatch, DummyPage())
+    out = await swd.fetch_dynamic_table_content("http://fake-url", extract="network")
+    assert out[0]["Symbol"] == "^GSPC"
+    assert out[0]["Last Price"] == 1.5
+
+
+@pytest.mark.asyncio
+async def test_fetch_dynamic_network_mode_falls_back_to_dom(monkeypatch):
+    monkeypatch.setattr(swd.settings, "DYNAMIC_FEED_TIMEOUT_MS", 10)
+
+    class DummyLocator:
+        first = None
+        async def inner_html(self): return "<tr><td>dom</td></tr>"
+    DummyLocator.first = DummyLocator()
+
+    class DummyPage:
+        def on(self, event, handler): return None
+        async def goto(self, *a, **kw): return None
+        async def wait_for_selector(self, *a, **kw): return None
+        def locator(self, *a, **kw): return DummyLocator()
+        async def close(self): return None
+
+    _install_dummy_pool(monkeypatch, DummyPage())
+    out = await swd.fetch_dynamic_table_content("http://fake-url", extract="network")
+    assert out == "<table><tr><td>dom</td></tr></table>"
+
+
+@pytest.mark.asyncio
+async def test_fetch_dynamic_rejects_unknown_extract_mode():
+    with pytest.raises(ValueError):
+        await swd.fetch_dynamic_table_content("http://fake-url", extract="bogus")
+
+
+@pytest.mark.asyncio
+async def test_fetch_dynamic_js_mode_returns_arrays(monkeypatch):
+    seen = {}
+
+    class DummyPage:
+        async def goto(self, *a, **kw): return None
+        async def wait_for_selector(self, *a, **kw): return None
+        async def evaluate(self, script, arg):
+            seen["arg"] = arg
+            return {"headers": ["Symbol", "Volume"], "rows": [["^ABC", "1.2M"]]}
+        async def close(self): return None
+
+    _install_dummy_pool(monkeypatch, DummyPage())
+    out = await swd.fetch_dynamic_table_content("http://fake-url", extract="js")
+    assert out == {"headers": ["Symbol", "Volume"], "rows": [["^ABC", "1.2M"]]}
+    assert seen["arg"] == swd.settings.TABLE_SELECTOR_DYNAMIC
+
+
+@pytest.mark.asyncio
+async def test_fetch_static_data_returns_raw_body_or_table_fragment():
+    body = b'<html><head><title>t</title></head><body><p>intro</p><table id="t"><tr><th>A</th></tr></table></body></html>'
+
+    client = FakeClient(HttpResponse(url="http://fake-url", status=200, body=body))
+    html = await swd.fetch_static_data("http://fake-url", client=client)
+    assert html == body.decode()
+
+    client = FakeClient(HttpResponse(url="http://fake-url", status=200, body=body))
+    frag = await swd.fetch_static_data("http://fake-url", client=client, table=swd.TableLocator(table_id="t"))
+    assert frag == '<table id="t"><tr><th>A</th></tr></table>'
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+import scrape_data.save_scraped_data as sd
+from scrape_data.cleaned_table import CleanedTable
+from scrape_data.snapshot_store import SnapshotStore, infer_mode
+
+T0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _indices(price, volume=1000):
+    return CleanedTable(pd.DataFrame({
+        "Symbol": ["^GSPC", "^DJI"],
+        "Name": ["S&P 500", "Dow 30"],
+        "Last Price": [price, price / 2],
+        "Change": [1.5, -2.0],
+        "% Change": ["+0.1%", "-0.2%"],
+        "Volume": pd.array([volume, None], dtype="Int64"),
+    }))
+
+
+def test_store_uses_wal_and_indexes(tmp_path):
+    with SnapshotStore(str(tmp_path / "h.sqlite")) as store:
+        assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        plan = store.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM dynamic_rows WHERE symbol = ? ORDER BY scraped_at", ("^GSPC",)
+        ).fetchall()
+        assert "dynamic_rows_symbol_time" in str(plan)
+        indexes = {r[0] for r in store.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert "static_rows_country_name_time" in indexes
+
+
+def test_append_keeps_history_and_latest_returns_newest(tmp_path):
+    with SnapshotStore(str(tmp_path / "h.sqlite")) as store:
+        first = store.append(_indices(100.0), "dynamic", scraped_at=T0)
+        second = store.append(_indices(110.0, volume=2000), "dynamic", scraped_at=T0 + timedelta(hours=1))
+        assert second > first
+
+        latest = store.latest("dynamic")
+        assert latest == _indices(110.0, volume=2000).to_records()
+        assert latest.frame["Volume"].dtype == "Int64"
+        assert list(store.snapshots("dynamic")["row_count"]) == [2, 2]
+        assert store.latest("static") is None
+
+
+def test_history_filters_by_symbol_and_time(tmp_path):
+    with SnapshotStore(str(tmp_path / "h.sqlite")) as store:
+        for hour in range(3):
+            store.append(_indices(100.0 + hour), "dynamic", scraped_at=T0 + timedelta(hours=hour))
+
+        series = store.history("^GSPC")
+        assert list(series["Last Price"]) == [100.0, 101.0, 102.0]
+        assert series["scraped_at"].is_monotonic_increasing
+
+        recent = store.history("^GSPC", since=T0 + timedelta(hours=1))
+        assert list(recent["Last Price"]) == [101.0, 102.0]
+        assert store.history("^NOPE").empty
+
+
+def test_append_infers_mode_and_rejects_unknown_tables(tmp_path):
+    assert infer_mode(["Country (or dependency)", "Population 2025"]) == "static"
+    with SnapshotStore(str(tmp_path / "h.sqlite")) as store:
+        store.append([{"Country (or dependency)": "A", "Population 2025": 5}])
+        assert store.latest("static").to_records() == [
+            {"Country (or dependency)": "A", "Population 2025": 5, "Yearly Change": None}
+        ]
+        with pytest.raises(ValueError):
+            store.append([{"x": 1}])
+        with pytest.raises(ValueError):
+            store.append([{"Pair": "EURUSD", "Rate": 1.1}], mode="static")
+        assert len(store.snapshots("static")) == 1
+
+
+def test_save_records_sqlite_appends_snapshots(tmp_path):
+    path = sd.save_records(_indices(1.0), str(tmp_path / "dyn"), "sqlite", mode="dynamic")
+    sd.save_records(_indices(2.0), str(tmp_path / "dyn"), "sqlite", mode="dynamic")
+
+    assert path.endswith("dyn.sqlite")
+    with SnapshotStore(path) as store:
+        assert len(store.snapshots("dynamic")) == 2
+        assert list(store.history("^DJI")["Last Price"]) == [0.5, 1.0]
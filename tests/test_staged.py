@@ -0,0 +1,137 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import scrape_data.pipeline as pl
+import scrape_data.staged as st
+
+DYNAMIC_HTML = """
+<table>
+  <thead><tr><th>Symbol</th><th>Last Price</th><th>Change</th><th>Volume</th></tr></thead>
+  <tbody><tr><td>^ABC</td><td>1,234.56</td><td>+3.21</td><td>1.2M</td></tr></tbody>
+</table>
+"""
+
+
+def _targets(tmp_path, n, mode="static"):
+    return [
+        pl.Target(name=f"t{i}", url=f"http://x/{i}", mode=mode, file_path=str(tmp_path / f"t{i}"))
+        for i in range(n)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_staged_bounds_work_between_fetch_and_clean(monkeypatch, tmp_path):
+    state = {"fetched": 0, "cleaned": 0, "peak": 0}
+
+    async def fake_fetch_static(url, cache=None, **kw):
+        await asyncio.sleep(0)
+        state["fetched"] += 1
+        state["peak"] = max(state["peak"], state["fetched"] - state["cleaned"])
+        if url.endswith("/3"):
+            raise RuntimeError("boom")
+        return pl.scrape_web_data.StaticDocument(html=f"<table>{url}</table>")
+
+    def fake_clean(html, **kw):
+        time.sleep(0.01)
+        state["cleaned"] += 1
+        return None if html.endswith("/5</table>") else [{"Country": html}]
+
+    monkeypatch.setattr(pl.scrape_web_data, "fetch_static_document", fake_fetch_static)
+    monkeypatch.setattr(pl.clean_data, "clean_static_data", fake_clean)
+
+    with ThreadPoolExecutor(1) as executor:
+        results = await st.run_staged(
+            _targets(tmp_path, 12), fetch_workers=2, workers=1, queue_size=1, executor=executor, dedup=False
+        )
+
+    # fetched but not yet cleaned: two fetchers waiting on put, one queued, one cleaning, one failing
+    assert state["peak"] <= 2 + 1 + 1 + 1
+    statuses = [r.status for r in results]
+    assert statuses[3] == "failed" and "boom" in results[3].error
+    assert statuses[5] == "empty"
+    assert statuses.count("ok") == 10
+    assert [r.name for r in results] == [f"t{i}" for i in range(12)]
+    assert json.loads((tmp_path / "t0.json").read_text()) == [{"Country": "<table>http://x/0</table>"}]
+
+
+@pytest.mark.asyncio
+async def test_run_staged_cleans_in_worker_processes_and_dedups(monkeypatch, tmp_path):
+    async def fake_fetch_dynamic(url, **kw):
+        return DYNAMIC_HTML
+
+    monkeypatch.setattr(pl.scrape_web_data, "fetch_dynamic_table_content", fake_fetch_dynamic)
+    targets = _targets(tmp_path, 2, mode="dynamic")
+
+    with st.clean_executor(1) as executor:
+        first = await st.run_staged(targets, executor=executor)
+        second = await st.run_staged(targets, executor=executor)
+
+    assert [r.status for r in first] == ["ok", "ok"]
+    assert json.loads((tmp_path / "t1.json").read_text())[0]["Volume"] == 1_200_000
+    assert [r.status for r in second] == ["unchanged", "unchanged"]
+    manifest = json.loads((tmp_path / ".scrape_manifest.json").read_text())
+    assert sorted(manifest) == [str(tmp_path / "t0.json"), str(tmp_path / "t1.json")]
+
+
+@pytest.mark.asyncio
+async def test_run_staged_uses_the_http_cache_on_the_loop_thread_only(monkeypatch, tmp_path):
+    import threading
+
+    loop_thread = threading.get_ident()
+    calls = []
+
+    class RecordingCache(pl.HttpCache):
+        def store_cleaned(self, *a, **kw):
+            calls.append(("store_cleaned", threading.get_ident()))
+            return super().store_cleaned(*a, **kw)
+
+        def load_cleaned(self, *a, **kw):
+            calls.append(("load_cleaned", threading.get_ident()))
+            return super().load_cleaned(*a, **kw)
+
+    cache = RecordingCache(directory=str(tmp_path / "cache"))
+
+    async def fake_fetch_static(url, cache=None, **kw):
+        cache.store(url, f"<table>{url}</table>", etag='"1"', last_modified=None)
+        return pl.scrape_web_data.StaticDocument(html=cache.load_body(url))
+
+    monkeypatch.setattr(pl.scrape_web_data, "fetch_static_document", fake_fetch_static)
+    monkeypatch.setattr(pl.clean_data, "clean_static_data", lambda html, **kw: [{"Country": html}])
+
+    with ThreadPoolExecutor(2) as executor:
+        results = await st.run_staged(_targets(tmp_path, 4), executor=executor, cache=cache, dedup=False)
+
+    assert [r.status for r in results] == ["ok"] * 4
+    assert [name for name, _ in calls] == ["store_cleaned"] * 4
+    assert {thread for _, thread in calls} == {loop_thread}
+    assert cache.load_cleaned("http://x/0") == [{"Country": "<table>http://x/0</table>"}]
+
+
+@pytest.mark.asyncio
+async def test_run_staged_hashes_fetched_tables_off_the_loop(monkeypatch, tmp_path):
+    import threading
+
+    loop_thread = threading.get_ident()
+    threads = []
+    fragment_unchanged = st.fragment_unchanged
+
+    def recording(artifact, output):
+        threads.append(threading.get_ident())
+        return fragment_unchanged(artifact, output)
+
+    async def fake_fetch_static(url, cache=None, **kw):
+        return pl.scrape_web_data.StaticDocument(html=f"<table><tr><td>{url}</td></tr></table>")
+
+    monkeypatch.setattr(pl.scrape_web_data, "fetch_static_document", fake_fetch_static)
+    monkeypatch.setattr(pl.clean_data, "clean_static_data", lambda html, **kw: [{"Country": html}])
+    monkeypatch.setattr(st, "fragment_unchanged", recording)
+
+    with ThreadPoolExecutor(2) as executor:
+        results = await st.run_staged(_targets(tmp_path, 3), executor=executor, dedup=True)
+
+    assert [r.status for r in results] == ["ok"] * 3
+    assert len(threads) == 3 and loop_thread not in threads
@@ -0,0 +1,62 @@
+import scrape_data.table_extractor as te
+
+DOC = """
+<html><body>
+  <table id="nav"><tr><td>menu</td></tr></table>
+  <table id="example2" class="table datatable">
+    <thead><tr><th>#</th><th>Country (or dependency)</th><th>Population 2025</th></tr></thead>
+    <tbody><tr><td>1</td><td>India</td><td>1,463,865,525</td></tr></tbody>
+  </table>
+  <table class="other"><tr><th>Country (or dependency)</th><th>Area</th></tr></table>
+</body></html>
+"""
+
+
+def test_header_texts_reads_thead_row():
+    import lxml.html
+    table = te.find_table(lxml.html.fromstring(DOC), te.TableLocator(table_id="example2"))
+    assert te.header_texts(table) == ["#", "Country (or dependency)", "Population 2025"]
+
+
+def test_extract_by_headers_skips_non_matching_tables():
+    frag = te.extract_table_fragment(DOC, te.TableLocator(headers=("Country (or dependency)", "Population 2025")))
+    assert frag.startswith('<table id="example2"')
+    assert "India" in frag
+    assert "menu" not in frag
+
+
+def test_extract_by_class_token_and_xpath():
+    frag = te.extract_table_fragment(DOC, te.TableLocator(attrs={"class": "datatable"}))
+    assert 'id="example2"' in frag
+    frag = te.extract_table_fragment(DOC, te.TableLocator(xpath="//table[@class='other']"))
+    assert "Area" in frag
+
+
+def test_extract_without_locator_returns_first_table_and_none_on_miss():
+    assert 'id="nav"' in te.extract_table_fragment(DOC)
+    assert te.extract_table_fragment(DOC, te.TableLocator(table_id="missing")) is None
+    assert te.extract_table_fragment("") is None
+
+
+def test_extract_table_frame_reads_only_requested_columns():
+    df = te.extract_table_frame(
+        DOC,
+        te.TableLocator(headers=("Country (or dependency)",), table_id="example2"),
+        columns=["Population 2025", "Country (or dependency)", "Not There"],
+    )
+    assert list(df.columns) == ["Country (or dependency)", "Population 2025"]
+    assert df.to_dict(orient="records") == [{"Country (or dependency)": "India", "Population 2025": "1,463,865,525"}]
+
+
+def test_extract_table_frame_skips_nested_rows_and_pads_short_rows():
+    html = """
+    <table><tr><th>A</th><th>B</th></tr>
+      <tr><td>1</td><td><table><tr><td>nested</td></tr></table></td></tr>
+      <tr><td> </td></tr>
+    </table>
+    """
+    df = te.extract_table_frame(html)
+    assert len(df) == 2
+    assert df.iloc[0]["A"] == "1"
+    assert df.iloc[1].isna().all()
+    assert te.extract_table_frame(html, te.TableLocator(table_id="nope")) is None
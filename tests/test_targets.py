@@ -0,0 +1,67 @@
+import pytest
+
+import scrape_data.targets as tg
+from scrape_data import dynamic_models, static_models
+from scrape_data.table_extractor import TableLocator
+
+TOML = """
+[[targets]]
+name = "gdp"
+url = "https://example.com/gdp"
+model = "static_models:CountryData"
+sink = "csv"
+locator = { table_id = "gdp", headers = ["Country (or dependency)"] }
+
+[[targets]]
+name = "dynamic"
+url = "https://example.com/indices"
+mode = "dynamic"
+table_selector = "table.quotes"
+"""
+
+
+def test_load_targets_merges_builtins_settings_and_toml(tmp_path):
+    path = tmp_path / "targets.toml"
+    path.write_text(TOML)
+    registry = tg.load_targets(str(path), entries=[{"name": "fx", "url": "https://example.com/fx", "sink": "jsonl"}])
+
+    assert list(registry) == ["static", "dynamic", "fx", "gdp"]
+    gdp = registry["gdp"]
+    assert gdp.model_class() is static_models.CountryData
+    assert gdp.locator == TableLocator(table_id="gdp", headers=("Country (or dependency)",))
+    assert gdp.base_file_path == "data/gdp"
+    # a TOML entry named like a built-in replaces it
+    assert registry["dynamic"].fetch_options() == {"table_selector": "table.quotes"}
+    assert registry["static"].base_file_path == "data/cleaned_static_data"
+
+
+@pytest.mark.parametrize("entry", [
+    {"name": "x"},
+    {"name": "x", "url": "u", "mode": "ftp"},
+    {"name": "x", "url": "u", "sink": "xml"},
+    {"name": "x", "url": "u", "colour": "red"},
+    {"name": "x", "url": "u", "model": "dynamic_models:NoSuchModel"},
+    {"name": "x", "url": "u", "locator": {"id": "t"}},
+    {"name": "x", "url": "u", "interval": 0},
+    {"name": "x", "url": "u", "sink": "sqlite", "model": "dynamic_models:IndexData"},
+])
+def test_invalid_entries_raise(entry):
+    with pytest.raises((ValueError, AttributeError)):
+        tg.target_from_dict(entry)
+
+
+def test_sqlite_sink_accepts_the_modes_own_model():
+    target = tg.target_from_dict({"name": "x", "url": "u", "sink": "sqlite", "model": "static_models:PopulationTable"})
+    assert target.sink == "sqlite"
+
+
+def test_resolve_model_accepts_absolute_modules():
+    assert tg.resolve_model("scrape_data.dynamic_models:IndexTable") is dynamic_models.IndexTable
+
+
+def test_select_targets():
+    registry = tg.load_targets("", entries=[])
+    assert [t.name for t in tg.select_targets(registry)] == ["static", "dynamic"]
+    assert [t.name for t in tg.select_targets(registry, ["dynamic"])] == ["dynamic"]
+    with pytest.raises(ValueError):
+        tg.select_targets(registry, ["nope"])
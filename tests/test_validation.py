@@ -0,0 +1,73 @@
+from typing import Optional
+
+import pandas as pd
+from pydantic import BaseModel, Field, StrictInt
+
+import scrape_data.validation as v
+from scrape_data.clean_data import _validate_with_model
+from scrape_data.static_models import CountryData, PopulationTable
+
+
+class Row(BaseModel):
+    name: str = Field(alias="Name", max_length=5)
+    count: StrictInt = Field(alias="Count")
+    price: Optional[float] = Field(alias="Price", ge=0)
+
+
+def _frame():
+    return pd.DataFrame({
+        "Name": ["a", "toolong", "c", None],
+        "Count": pd.array([1, 2, None, 4], dtype="Int64"),
+        "Price": [1.5, None, 2.0, -1.0],
+    })
+
+
+def test_validate_frame_reports_failures_per_column():
+    report = v.validate_frame(_frame(), Row)
+    assert report.valid.tolist() == [True, False, False, False]
+    assert report.failures == {"Name": [1, 3], "Count": [2], "Price": [3]}
+    assert report.invalid_rows == [1, 2, 3]
+    assert report.summary(limit=1)["Name"] == {"count": 2, "rows": [1]}
+
+
+def test_strict_int_rejects_floats_and_missing_required_column_fails_all():
+    report = v.validate_frame(pd.DataFrame({"Name": ["a"], "Count": [1.0]}), Row)
+    assert report.failures == {"Count": [0]}
+    report = v.validate_frame(pd.DataFrame({"Name": ["a"]}), Row)
+    assert "Count" in report.failures
+
+
+def test_materialize_uses_field_names_and_none_for_missing():
+    rows = v.materialize(_frame(), Row, mask=pd.Series([True, False, True, False]).to_numpy())
+    assert [r.name for r in rows] == ["a", "c"]
+    assert rows[1].count is None
+    assert rows[0].dict(by_alias=True) == {"Name": "a", "Count": 1, "Price": 1.5}
+
+
+def test_validate_with_model_drop_invalid_and_table_models():
+    df = pd.DataFrame({
+        "Country (or dependency)": ["A", "B"],
+        "Population 2025": pd.array([10, None], dtype="Int64"),
+        "Yearly Change": ["1%", "2%"],
+    })
+    assert _validate_with_model(df, PopulationTable) is None
+    table = _validate_with_model(df, PopulationTable, drop_invalid=True)
+    assert [c.country_name for c in table.countries] == ["A"]
+    rows = _validate_with_model(df.iloc[:1], CountryData)
+    assert rows[0].population_2025 == 10
+
+
+def test_materialize_casts_coercible_values_to_the_field_types():
+    class Coded(BaseModel):
+        code: str
+        n: int
+        share: float
+        tag: Optional[int]
+
+    df = pd.DataFrame({"code": [101, 7], "n": [3.0, None], "share": pd.array([1, 2], dtype="Int64"), "tag": ["4", None]})
+    report = v.validate_frame(df, Coded)
+    assert report.failures == {"n": [1]}
+    rows = v.materialize(df, Coded)
+    assert rows[0].dict() == Coded(code=101, n=3.0, share=1, tag="4").dict()
+    assert [type(getattr(rows[0], f)) for f in ("code", "n", "share", "tag")] == [str, int, float, int]
+    assert rows[1].tag is None
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 import scrape_data.utils.accept_cookies as ac
 
@@ -8,6 +9,7 @@ async def test_accept_cookies_clicks_first_selector(monkeypatch):
 
     class DummyLocator:
         def __init__(self): self.first = self
+        async def wait_for(self, **kw): return None
         async def click(self, timeout=None):
             clicked["sel"] = True
 
@@ -29,6 +31,7 @@ async def test_accept_cookies_tries_frames(monkeypatch):
 
     class DummyLocator:
         def __init__(self): self.first = self
+        async def wait_for(self, **kw): return None
         async def click(self, timeout=None):
             clicked["frame"] = True
 
@@ -54,6 +57,7 @@ async def test_accept_cookies_falls_back_to_get_by_role(monkeypatch):
 
     class DummyLocator:
         def __init__(self): self.first = self
+        async def wait_for(self, **kw): return None
         async def click(self, timeout=None):
             clicked["role"] = True
 
@@ -74,6 +78,7 @@ async def test_accept_cookies_falls_back_to_get_by_role(monkeypatch):
 async def test_accept_cookies_returns_false(monkeypatch):
     class DummyLocator:
         def __init__(self): self.first = self
+        async def wait_for(self, **kw): return None
         async def click(self, timeout=None): raise Exception("no click")
 
     class DummyPage:
@@ -85,3 +90,35 @@ async def test_accept_cookies_returns_false(monkeypatch):
     page = DummyPage()
     result = await ac.accept_cookies(page)
     assert result is False
+
+
+@pytest.mark.asyncio
+async def test_accept_cookies_races_selectors_and_clicks_only_one(monkeypatch):
+    clicked = []
+
+    class DummyLocator:
+        def __init__(self, sel, delay):
+            self.sel, self.delay, self.first = sel, delay, self
+        async def wait_for(self, **kw):
+            if self.delay is None:
+                raise Exception("never visible")
+            await asyncio.sleep(self.delay)
+        async def click(self, timeout=None):
+            clicked.append(self.sel)
+
+    delays = {"a": None, "b": 0.01, "c": 0.2}
+
+    class DummyPage:
+        frames = []
+        async def evaluate(self, script): return None
+        def locator(self, sel): return DummyLocator(sel, delays[sel])
+        def get_by_role(self, *a, **kw): return DummyLocator("role", None)
+
+    start = asyncio.get_running_loop().time()
+    result = await ac.accept_cookies(DummyPage(), selectors=["a", "b", "c"], timeout_ms=1000)
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert result is True
+    assert clicked == ["b"]
+    # the slower candidate is cancelled instead of being waited for
+    assert elapsed < 0.2
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+from scrape_data.utils import feed_capture as fc
+
+
+QUOTE_PAYLOAD = {
+    "quoteResponse": {
+        "result": [
+            {
+                "symbol": "^GSPC",
+                "shortName": "S&P 500",
+                "regularMarketPrice": {"raw": 4321.45, "fmt": "4,321.45"},
+                "regularMarketChange": {"raw": -15.2, "fmt": "-15.20"},
+                "regularMarketChangePercent": {"raw": -0.35, "fmt": "-0.35%"},
+                "regularMarketVolume": {"raw": 123456789, "fmt": "123.457M"},
+            },
+            {
+                "symbol": "^N225",
+                "longName": "Nikkei 225",
+                "regularMarketPrice": 38000.5,
+                "regularMarketChange": 120.0,
+                "regularMarketChangePercent": 0.5,
+            },
+        ],
+        "error": None,
+    }
+}
+
+
+def test_records_from_payload_maps_to_index_aliases():
+    records = fc.records_from_payload(QUOTE_PAYLOAD)
+    assert records[0] == {
+        "Symbol": "^GSPC",
+        "Name": "S&P 500",
+        "Last Price": 4321.45,
+        "Change": -15.2,
+        "% Change": "-0.35%",
+        "Volume": 123456789,
+    }
+    assert records[1]["Name"] == "Nikkei 225"
+    assert records[1]["% Change"] == "+0.50%"
+    assert records[1]["Volume"] is None
+
+
+def test_records_from_payload_without_quotes_is_empty():
+    assert fc.records_from_payload({"finance": {"result": [{"id": 1}]}}) == []
+    assert fc.records_from_payload([]) == []
+
+
+class DummyResponse:
+    def __init__(self, url, payload):
+        self.url = url
+        self._payload = payload
+    async def json(self):
+        if isinstance(self._payload, Exception):
+            raise self._payload
+        return self._payload
+
+
+@pytest.mark.asyncio
+async def test_feed_capture_collects_matching_responses():
+    handlers = {}
+
+    class DummyPage:
+        def on(self, event, handler): handlers[event] = handler
+
+    capture = fc.FeedCapture(url_patterns=["/v7/finance/quote"])
+    capture.attach(DummyPage())
+
+    await handlers["response"](DummyResponse("https://example.com/app.js", ValueError("not json")))
+    await handlers["response"](DummyResponse("https://q.example/v7/finance/quote?symbols=^GSPC", QUOTE_PAYLOAD))
+
+    records = await capture.wait_for_records(timeout_ms=100)
+    assert [r["Symbol"] for r in records] == ["^GSPC", "^N225"]
+
+
+@pytest.mark.asyncio
+async def test_feed_capture_times_out_without_feed():
+    capture = fc.FeedCapture(url_patterns=["/v7/finance/quote"])
+    assert await capture.wait_for_records(timeout_ms=10) is None
+
+
+@pytest.mark.asyncio
+async def test_feed_capture_settles_on_the_tables_feed_not_the_ticker_strip():
+    handlers = {}
+
+    class DummyPage:
+        def on(self, event, handler): handlers[event] = handler
+
+    capture = fc.FeedCapture(url_patterns=["/v7/finance/quote", "/v1/finance/screener"], settle_ms=50)
+    capture.attach(DummyPage())
+    ticker = {"quoteResponse": {"result": [{"symbol": "BTC-USD", "shortName": "Bitcoin"}]}}
+
+    async def responses():
+        await handlers["response"](DummyResponse("https://q.example/v7/finance/quote?symbols=BTC-USD", ticker))
+        await asyncio.sleep(0.02)
+        await handlers["response"](DummyResponse("https://q.example/v1/finance/screener", QUOTE_PAYLOAD))
+
+    feed = asyncio.create_task(responses())
+    records = await capture.wait_for_records(timeout_ms=1000)
+    await feed
+    assert [r["Symbol"] for r in records] == ["^GSPC", "^N225"]
@@ -0,0 +1,57 @@
+import pytest
+from scrape_data.utils.resource_blocker import ResourceBlocker
+
+
+class DummyRequest:
+    def __init__(self, resource_type, url):
+        self.resource_type = resource_type
+        self.url = url
+
+
+class DummyRoute:
+    def __init__(self, resource_type, url):
+        self.request = DummyRequest(resource_type, url)
+        self.action = None
+    async def abort(self): self.action = "abort"
+    async def continue_(self): self.action = "continue"
+
+
+def test_should_block_by_type_and_url_pattern():
+    blocker = ResourceBlocker(resource_types=["image", "font"], url_patterns=["doubleclick.net"])
+    assert blocker.should_block("image", "https://example.com/logo.png")
+    assert blocker.should_block("script", "https://ad.doubleclick.net/tag.js")
+    assert not blocker.should_block("document", "https://finance.yahoo.com/world-indices")
+    assert not blocker.should_block("xhr", "https://query1.finance.yahoo.com/v7/finance/quote")
+
+
+@pytest.mark.asyncio
+async def test_handle_aborts_or_continues_and_counts():
+    blocker = ResourceBlocker(resource_types=["image"], url_patterns=["tracker.example"])
+    routes = [
+        DummyRoute("image", "https://example.com/a.png"),
+        DummyRoute("script", "https://tracker.example/t.js"),
+        DummyRoute("document", "https://example.com/"),
+    ]
+    for r in routes:
+        await blocker.handle(r)
+
+    assert [r.action for r in routes] == ["abort", "abort", "continue"]
+    assert blocker.blocked == {"image": 1, "script": 1}
+    assert blocker.total_blocked == 2
+    assert blocker.allowed == 1
+    assert "blocked=2" in blocker.summary()
+
+
+@pytest.mark.asyncio
+async def test_attach_routes_all_requests():
+    routed = {}
+
+    class DummyContext:
+        async def route(self, pattern, handler):
+            routed["pattern"] = pattern
+            routed["handler"] = handler
+
+    blocker = ResourceBlocker(resource_types=[], url_patterns=[])
+    await blocker.attach(DummyContext())
+    assert routed["pattern"] == "**/*"
+    assert routed["handler"] == blocker.handle